@@ -1,10 +1,4079 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog, commondialog
 import os
 import json
+import platform
+import hashlib
+import heapq
+import http.client
+import threading
+import time
+import re
+import select
+import shlex
+import shutil
+import stat
+import tarfile
+import zipfile
+import zlib
+import argparse
+import asyncio
+import codecs
+import collections
+import copy
+import ctypes
+import itertools
+import queue
+import signal
+import socket
+import sqlite3
+import statistics
+import struct
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlsplit, urljoin, parse_qs
 from datetime import datetime
+import xml.etree.ElementTree as ET
 
-class AutobuildGUI:
+try:
+    import llsd
+except ImportError:
+    llsd = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+try:
+    import _winapi
+except ImportError:
+    _winapi = None  # Not Windows
+
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".autobuild_gui")
+
+class ConnectionPool:
+    # Keeps idle HTTP(S) connections per host so downloads reuse keep-alive sockets
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.idle = {}
+    
+    def acquire(self, scheme, netloc):
+        with self.lock:
+            conns = self.idle.get((scheme, netloc))
+            if conns:
+                return conns.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+    
+    def release(self, scheme, netloc, conn):
+        with self.lock:
+            self.idle.setdefault((scheme, netloc), []).append(conn)
+    
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+class DownloadManager:
+    # Bounded parallel downloader with per-host connection pooling, Range resume
+    # of partial files and hash verification while streaming
+    CHUNK_SIZE = 256 * 1024
+    MAX_REDIRECTS = 5
+    
+    def __init__(self, dest_dir, max_workers=4, tracer=None):
+        self.dest_dir = dest_dir
+        self.max_workers = max(1, int(max_workers))
+        self.tracer = tracer
+        self.pool = ConnectionPool()
+        self.lock = threading.Lock()
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.files_total = 0
+        self.started = None
+    
+    def download_all(self, items):
+        os.makedirs(self.dest_dir, exist_ok=True)
+        self.files_total = len(items)
+        self.started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self.traced_download, item) for item in items]
+                results = []
+                for item, future in zip(items, futures):
+                    try:
+                        results.append((item, future.result(), None))
+                    except Exception as e:
+                        results.append((item, None, e))
+                return results
+        finally:
+            self.pool.close()
+    
+    def stats(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started if self.started else 0
+            return {
+                'bytes_done': self.bytes_done,
+                'bytes_total': self.bytes_total,
+                'files_done': self.files_done,
+                'files_total': self.files_total,
+                'elapsed': elapsed
+            }
+    
+    def traced_download(self, item):
+        started = time.time()
+        try:
+            return self.download(item)
+        finally:
+            if self.tracer:
+                name = os.path.basename(urlsplit(item['url']).path) or item['url']
+                self.tracer.add(name, f"download {threading.current_thread().name}", started, time.time(),
+                                "download", {'url': item['url']})
+    
+    def download(self, item):
+        url = item['url']
+        target = os.path.join(self.dest_dir, os.path.basename(urlsplit(url).path) or "download")
+        hash_alg = item.get('hash_alg') or "md5"
+        expected = (item.get('hash') or "").lower()
+        
+        # Already downloaded and verified
+        if expected and os.path.exists(target) and self.file_digest(target, hash_alg) == expected:
+            self.finish_file()
+            return target
+        
+        part = target + ".part"
+        headers = self.auth_headers(item.get('creds'))
+        for attempt in range(2):
+            # A failed attempt may have written part of the body, so every
+            # attempt resumes from what is actually on disk
+            progress = [0, 0]
+            offset, hasher = self.resume_state(part, hash_alg)
+            self.advance(offset, offset, progress)
+            try:
+                offset, hasher = self.fetch(url, part, offset, hasher, headers, progress)
+                break
+            except (http.client.RemoteDisconnected, http.client.IncompleteRead, ConnectionResetError, BrokenPipeError):
+                # A pooled keep-alive socket went stale or the connection
+                # dropped mid-body; retry once on a fresh one
+                self.advance(-progress[0], -progress[1])
+                if attempt:
+                    raise
+        
+        digest = hasher.hexdigest()
+        if expected and digest != expected:
+            os.remove(part)
+            raise ValueError(f"Hash mismatch for {url}: expected {expected}, got {digest}")
+        os.replace(part, target)
+        self.finish_file()
+        return target
+    
+    def resume_state(self, part, hash_alg):
+        # (offset, hasher) for the bytes already in the partial file
+        hasher = hashlib.new(hash_alg)
+        offset = 0
+        if os.path.exists(part):
+            with open(part, 'rb') as f:
+                for block in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                    hasher.update(block)
+                    offset += len(block)
+        return offset, hasher
+    
+    def fetch(self, url, part, offset, hasher, headers, progress=None):
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            request_headers = dict(headers)
+            if offset:
+                request_headers['Range'] = f"bytes={offset}-"
+            
+            conn = self.pool.acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path, headers=request_headers)
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+            
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader('Location')
+                response.read()
+                self.reuse(parts, conn, response)
+                if not location:
+                    raise OSError(f"HTTP {response.status} {response.reason} without a Location for {url}")
+                new_url = urljoin(url, location)
+                if urlsplit(new_url).netloc != parts.netloc:
+                    # Never forward credentials to another host
+                    headers = {k: v for k, v in headers.items() if k not in ('Authorization', 'PRIVATE-TOKEN')}
+                url = new_url
+                continue
+            
+            if response.status == 416 and offset:
+                # Partial file already holds the whole resource
+                response.read()
+                self.reuse(parts, conn, response)
+                return offset, hasher
+            
+            if response.status == 200 and offset:
+                # Server ignored the Range request; start over
+                self.advance(-offset, -offset, progress)
+                offset = 0
+                hasher = hashlib.new(hasher.name)
+            elif response.status not in (200, 206):
+                response.read()
+                self.reuse(parts, conn, response)
+                raise OSError(f"HTTP {response.status} {response.reason} for {url}")
+            
+            length = response.getheader('Content-Length')
+            if length:
+                self.advance(0, int(length), progress)
+            
+            received = 0
+            try:
+                with open(part, 'ab' if offset else 'wb') as f:
+                    while True:
+                        block = response.read(self.CHUNK_SIZE)
+                        if not block:
+                            break
+                        f.write(block)
+                        hasher.update(block)
+                        offset += len(block)
+                        received += len(block)
+                        self.advance(len(block), 0, progress)
+                # read() ends quietly when the server closes early
+                if length and received < int(length):
+                    raise http.client.IncompleteRead(b"", int(length) - received)
+            except Exception:
+                conn.close()
+                raise
+            self.reuse(parts, conn, response)
+            return offset, hasher
+        raise OSError(f"Too many redirects for {url}")
+    
+    def reuse(self, parts, conn, response):
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.release(parts.scheme, parts.netloc, conn)
+    
+    def advance(self, done, total, progress=None):
+        # progress collects one attempt's share so a retry can take it back
+        with self.lock:
+            self.bytes_done += done
+            self.bytes_total += total
+        if progress is not None:
+            progress[0] += done
+            progress[1] += total
+    
+    def finish_file(self):
+        with self.lock:
+            self.files_done += 1
+    
+    def auth_headers(self, creds):
+        if creds == "github" and os.environ.get('AUTOBUILD_GITHUB_TOKEN'):
+            return {'Authorization': f"Bearer {os.environ['AUTOBUILD_GITHUB_TOKEN']}",
+                    'Accept': "application/octet-stream"}
+        if creds == "gitlab" and os.environ.get('AUTOBUILD_GITLAB_TOKEN'):
+            return {'PRIVATE-TOKEN': os.environ['AUTOBUILD_GITLAB_TOKEN']}
+        return {}
+    
+    @classmethod
+    def file_digest(cls, filename, hash_alg):
+        hasher = hashlib.new(hash_alg)
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(cls.CHUNK_SIZE), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+def extract_archive(archive, dest, read_only=False, fsync=False):
+    # Streams members from the compressed archive straight to disk. Runs in a
+    # worker process, so it must stay a module-level function.
+    started = time.perf_counter()
+    wall_started = time.time()
+    dest = os.path.abspath(dest)
+    made_dirs = set()
+    written = []
+    total_bytes = 0
+    
+    def inside(path, root):
+        return path == root or os.path.commonpath([root, path]) == root
+    
+    def target_path(name):
+        path = os.path.abspath(os.path.join(dest, name))
+        if path == dest:
+            # The "./" entry of archives made with tar -C dir .
+            return path
+        # Resolve the parent too, so a symlink extracted earlier cannot
+        # redirect later members outside dest
+        if not inside(path, dest) or not inside(os.path.realpath(os.path.dirname(path)), real_dest):
+            raise ValueError(f"Unsafe member path: {name}")
+        return path
+    
+    def check_link(name, path, linkname):
+        target = os.path.realpath(os.path.join(os.path.dirname(path), linkname))
+        if os.path.isabs(linkname) or os.path.splitdrive(linkname)[0] or not inside(target, real_dest):
+            raise ValueError(f"Unsafe symlink: {name} -> {linkname}")
+    
+    def ensure_dir(path):
+        # Remember created directories so each one costs a single makedirs()
+        if path in made_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        while path not in made_dirs and len(path) >= len(dest):
+            made_dirs.add(path)
+            path = os.path.dirname(path)
+    
+    def finish_file(path, mode, mtime):
+        if read_only:
+            mode &= ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+        os.chmod(path, mode)
+        if mtime:
+            os.utime(path, (mtime, mtime))
+        written.append(path)
+    
+    ensure_dir(dest)
+    real_dest = os.path.realpath(dest)
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                path = target_path(info.filename)
+                if info.is_dir():
+                    ensure_dir(path)
+                    continue
+                ensure_dir(os.path.dirname(path))
+                with zf.open(info) as src, open(path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, ParallelExtractor.COPY_BUFFER)
+                total_bytes += info.file_size
+                finish_file(path, (info.external_attr >> 16) & 0o777 or 0o644,
+                            time.mktime(info.date_time + (0, 0, -1)))
+    else:
+        # 'r|*' reads the compressed stream sequentially without seeking
+        with tarfile.open(archive, 'r|*') as tf:
+            for member in tf:
+                path = target_path(member.name)
+                if member.isdir():
+                    ensure_dir(path)
+                    continue
+                ensure_dir(os.path.dirname(path))
+                if os.path.lexists(path):
+                    os.unlink(path)
+                if member.issym():
+                    check_link(member.name, path, member.linkname)
+                    os.symlink(member.linkname, path)
+                elif member.islnk():
+                    os.link(target_path(member.linkname), path)
+                elif member.isfile():
+                    with tf.extractfile(member) as src, open(path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, ParallelExtractor.COPY_BUFFER)
+                    total_bytes += member.size
+                    finish_file(path, member.mode & 0o777, member.mtime)
+    
+    if fsync:
+        # Deferred: flush everything once at the end instead of per file
+        for path in written:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    
+    return {
+        'archive': archive,
+        'dest': dest,
+        'files': len(written),
+        'bytes': total_bytes,
+        'seconds': time.perf_counter() - started,
+        'started': wall_started,
+        'worker': os.getpid()
+    }
+
+class ParallelExtractor:
+    # Extracts several archives at once on separate cores
+    COPY_BUFFER = 1024 * 1024
+    
+    def __init__(self, max_workers=None):
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+    
+    def extract_all(self, jobs, read_only=False, fsync=False):
+        # Start the largest archives first so one big package does not finish last
+        jobs = sorted(jobs, key=lambda job: os.path.getsize(job[0]), reverse=True)
+        results = []
+        if self.max_workers == 1 or len(jobs) == 1:
+            for archive, dest in jobs:
+                results.append(self.run(archive, dest, read_only, fsync))
+            return results
+        
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            futures = {
+                executor.submit(extract_archive, archive, dest, read_only, fsync): (archive, dest)
+                for archive, dest in jobs
+            }
+            for future in as_completed(futures):
+                archive, dest = futures[future]
+                try:
+                    result = future.result()
+                    result['error'] = None
+                except Exception as e:
+                    result = self.failure(archive, dest, e)
+                results.append(result)
+        return results
+    
+    def run(self, archive, dest, read_only, fsync):
+        try:
+            result = extract_archive(archive, dest, read_only, fsync)
+            result['error'] = None
+        except Exception as e:
+            result = self.failure(archive, dest, e)
+        return result
+    
+    @staticmethod
+    def failure(archive, dest, error):
+        return {'archive': archive, 'dest': os.path.abspath(dest), 'files': 0,
+                'bytes': 0, 'seconds': 0.0, 'error': str(error)}
+    
+    @staticmethod
+    def format_timings(results):
+        lines = ["Extraction timings (slowest first):"]
+        for result in sorted(results, key=lambda r: r['seconds'], reverse=True):
+            status = f"FAILED: {result['error']}" if result['error'] else "{} files, {:.1f} MB".format(result['files'], result['bytes'] / 1e6)
+            lines.append("  {:8.2f}s  {}  ({})".format(result['seconds'], os.path.basename(result['archive']), status))
+        return "\n".join(lines) + "\n"
+
+class ArchiveStore:
+    # Content-addressed store: every unique archive is extracted once and install
+    # directories are populated with hardlinks, reflinks or copy_file_range
+    FICLONE = 0x40049409
+    
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, "objects")
+        self.keys_file = os.path.join(store_dir, "keys.json")
+        self.lock = threading.Lock()
+        self.link_methods = {}
+        self.keys = {}
+        if os.path.exists(self.keys_file):
+            with open(self.keys_file, 'r') as f:
+                self.keys = json.load(f)
+    
+    def archive_key(self, archive):
+        # Hash each archive once; later lookups only need a stat()
+        st = os.stat(archive)
+        stamp = f"{os.path.abspath(archive)}|{st.st_size}|{st.st_mtime_ns}"
+        with self.lock:
+            if stamp in self.keys:
+                return self.keys[stamp]
+        key = DownloadManager.file_digest(archive, "sha256")
+        with self.lock:
+            self.keys[stamp] = key
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(self.keys_file + ".tmp", 'w') as f:
+                json.dump(self.keys, f, indent=4)
+            os.replace(self.keys_file + ".tmp", self.keys_file)
+        return key
+    
+    def object_dir(self, archive):
+        return os.path.join(self.objects_dir, self.archive_key(archive))
+    
+    def ensure_extracted(self, archive):
+        self.prepare([archive], max_workers=1)
+        return self.object_dir(archive)
+    
+    def prepare(self, archives, max_workers=None, fsync=False):
+        # Extract every archive that is not in the store yet, several at a time
+        pending = {}
+        for archive in archives:
+            target = self.object_dir(archive)
+            if not os.path.isdir(target) and target not in pending:
+                pending[target] = archive
+        if not pending:
+            return []
+        
+        os.makedirs(self.objects_dir, exist_ok=True)
+        jobs = []
+        for target, archive in pending.items():
+            tmp = f"{target}.tmp-{os.getpid()}-{threading.get_ident()}"
+            shutil.rmtree(tmp, ignore_errors=True)
+            jobs.append((archive, tmp))
+        results = ParallelExtractor(max_workers).extract_all(jobs, read_only=True, fsync=fsync)
+        
+        errors = []
+        for result in results:
+            tmp = result['dest']
+            if result['error']:
+                errors.append(f"{os.path.basename(result['archive'])}: {result['error']}")
+                self.make_writable(tmp)
+                shutil.rmtree(tmp, ignore_errors=True)
+                continue
+            try:
+                os.rename(tmp, tmp.rsplit(".tmp-", 1)[0])
+            except OSError:
+                # Another worker finished the same archive first
+                self.make_writable(tmp)
+                shutil.rmtree(tmp, ignore_errors=True)
+        if errors:
+            raise OSError("Extraction failed for " + "; ".join(errors))
+        return results
+    
+    def make_writable(self, root):
+        for dirpath, dirnames, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if not os.path.islink(path):
+                    os.chmod(path, os.stat(path).st_mode | stat.S_IWUSR)
+    
+    def install(self, package, archive, install_dir):
+        source = self.ensure_extracted(archive)
+        installed = []
+        methods = {}
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel_dir = os.path.relpath(dirpath, source)
+            dest_dir = os.path.normpath(os.path.join(install_dir, rel_dir))
+            os.makedirs(dest_dir, exist_ok=True)
+            # Links to directories (framework Versions/Current) are listed
+            # with the directories; recreate them and do not descend
+            linked_dirs = [name for name in dirnames if os.path.islink(os.path.join(dirpath, name))]
+            dirnames[:] = [name for name in dirnames if name not in linked_dirs]
+            for name in linked_dirs + filenames:
+                src = os.path.join(dirpath, name)
+                dst = os.path.join(dest_dir, name)
+                if os.path.lexists(dst):
+                    self.remove_link(dst)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst, target_is_directory=name in linked_dirs)
+                    method = "symlink"
+                else:
+                    method = self.link_file(src, dst)
+                methods[method] = methods.get(method, 0) + 1
+                installed.append(os.path.normpath(os.path.join(rel_dir, name)))
+        
+        manifest_dir = os.path.join(install_dir, ".autobuild-store")
+        os.makedirs(manifest_dir, exist_ok=True)
+        with open(os.path.join(manifest_dir, package + ".json"), 'w') as f:
+            json.dump({'archive': os.path.basename(archive), 'key': os.path.basename(source), 'files': installed}, f, indent=4)
+        return methods
+    
+    @staticmethod
+    def uninstall(package, install_dir):
+        manifest = os.path.join(install_dir, ".autobuild-store", package + ".json")
+        with open(manifest, 'r') as f:
+            files = json.load(f)['files']
+        dirs = set()
+        for rel in files:
+            path = os.path.join(install_dir, rel)
+            if os.path.lexists(path):
+                ArchiveStore.remove_link(path)
+            dirs.add(os.path.dirname(path))
+        # Remove directories left empty, deepest first
+        for path in sorted(dirs, key=len, reverse=True):
+            while os.path.normpath(path) != os.path.normpath(install_dir):
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    break
+                path = os.path.dirname(path)
+        os.unlink(manifest)
+        return len(files)
+    
+    @staticmethod
+    def remove_link(path):
+        # Windows removes directory symlinks with rmdir
+        if os.name == 'nt' and os.path.islink(path) and os.path.isdir(path):
+            os.rmdir(path)
+        else:
+            os.unlink(path)
+    
+    def link_file(self, src, dst):
+        # Remember the first method that works between two devices
+        devices = (os.stat(src).st_dev, os.stat(os.path.dirname(dst)).st_dev)
+        methods = ["hardlink", "reflink", "copy_file_range", "copy"] if fcntl else ["hardlink", "copy_file_range", "copy"]
+        known = self.link_methods.get(devices)
+        if known:
+            methods = methods[methods.index(known):]
+        for method in methods:
+            try:
+                getattr(self, "link_" + method)(src, dst)
+            except (OSError, AttributeError):
+                if os.path.lexists(dst):
+                    os.unlink(dst)
+                continue
+            self.link_methods[devices] = method
+            return method
+        raise OSError(f"Unable to install {src} to {dst}")
+    
+    def link_hardlink(self, src, dst):
+        os.link(src, dst)
+    
+    def link_reflink(self, src, dst):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), self.FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+    
+    def link_copy_file_range(self, src, dst):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    
+    def link_copy(self, src, dst):
+        shutil.copy2(src, dst)
+    
+    @staticmethod
+    def find_archive(cache_dir, package):
+        # Cached archives are named <package>-<version>-<platform>...
+        pattern = re.compile(re.escape(package) + r"-\d.*\.(tar\.[a-z0-9]+|tgz|tbz2|zip)$")
+        matches = [name for name in os.listdir(cache_dir) if pattern.match(name)]
+        if not matches:
+            return None
+        return max((os.path.join(cache_dir, name) for name in matches), key=os.path.getmtime)
+
+class ArchiveIndex:
+    # Member index stored next to an archive as <archive>.index.json, built in
+    # one streaming pass. gzip/bzip2/xz streams cannot be entered at an offset
+    # with the standard library, so license texts are copied into the index;
+    # other members are read by offset from zip and uncompressed tar files.
+    VERSION = 1
+    LICENSE_PATTERN = re.compile(r"(^|/)(LICENSES?/[^/]+|(LICEN[CS]E|COPYING|NOTICE)[^/]*)$", re.IGNORECASE)
+    MAX_LICENSE_BYTES = 1024 * 1024
+    
+    def __init__(self, archive, data):
+        self.archive = archive
+        self.data = data
+    
+    @staticmethod
+    def sidecar(archive):
+        return archive + ".index.json"
+    
+    @staticmethod
+    def stamp(archive):
+        st = os.stat(archive)
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    
+    @classmethod
+    def load(cls, archive):
+        # Builds the index if it is missing or the archive changed since
+        stamp = cls.stamp(archive)
+        try:
+            with open(cls.sidecar(archive), 'r') as f:
+                data = json.load(f)
+            if data.get('version') == cls.VERSION and data.get('stamp') == stamp:
+                return cls(archive, data)
+        except (OSError, ValueError):
+            pass
+        return cls.build(archive, stamp)
+    
+    @classmethod
+    def build(cls, archive, stamp=None):
+        stamp = stamp or cls.stamp(archive)
+        members = []
+        licenses = {}
+        if zipfile.is_zipfile(archive):
+            kind = "zip"
+            with zipfile.ZipFile(archive) as zf:
+                for info in zf.infolist():
+                    members.append({'name': info.filename, 'size': info.file_size,
+                                    'offset': info.header_offset, 'type': "dir" if info.is_dir() else "file"})
+                    if not info.is_dir() and cls.is_license(info.filename, info.file_size):
+                        licenses[info.filename] = zf.read(info).decode('utf-8', 'replace')
+        else:
+            with open(archive, 'rb') as f:
+                magic = f.read(6)
+            compressed = magic[:2] == b"\x1f\x8b" or magic[:3] == b"BZh" or magic == b"\xfd7zXZ\x00"
+            kind = "tar.compressed" if compressed else "tar"
+            with tarfile.open(archive, 'r|*') as tf:
+                for member in tf:
+                    entry = {'name': member.name, 'size': member.size, 'offset': member.offset_data,
+                             'type': "dir" if member.isdir() else "file" if member.isfile() else "link"}
+                    if member.issym() or member.islnk():
+                        entry['target'] = member.linkname
+                    members.append(entry)
+                    if member.isfile() and cls.is_license(member.name, member.size):
+                        licenses[member.name] = tf.extractfile(member).read().decode('utf-8', 'replace')
+        data = {'version': cls.VERSION, 'archive': os.path.basename(archive), 'stamp': stamp,
+                'format': kind, 'members': members, 'licenses': licenses}
+        tmp = f"{cls.sidecar(archive)}.tmp-{os.getpid()}"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, cls.sidecar(archive))
+        except OSError:
+            # A read-only cache still gets a usable in-memory index
+            pass
+        return cls(archive, data)
+    
+    @classmethod
+    def is_license(cls, name, size):
+        return size <= cls.MAX_LICENSE_BYTES and cls.LICENSE_PATTERN.search(name.rstrip("/")) is not None
+    
+    def members(self):
+        return self.data['members']
+    
+    def licenses(self):
+        return self.data['licenses']
+    
+    def read(self, name):
+        if name in self.data['licenses']:
+            return self.data['licenses'][name].encode('utf-8')
+        member = next((m for m in self.data['members'] if m['name'] == name and m['type'] == "file"), None)
+        if member is None:
+            raise KeyError(name)
+        if self.data['format'] == "zip":
+            with zipfile.ZipFile(self.archive) as zf:
+                return zf.read(name)
+        if self.data['format'] == "tar":
+            with open(self.archive, 'rb') as f:
+                f.seek(member['offset'])
+                return f.read(member['size'])
+        with tarfile.open(self.archive, 'r:*') as tf:
+            return tf.extractfile(name).read()
+
+def llsd_value(element):
+    # Minimal LLSD XML reader for the subset autobuild writes
+    if element.tag == 'map':
+        children = list(element)
+        return {children[i].text or "": llsd_value(children[i + 1]) for i in range(0, len(children) - 1, 2)}
+    if element.tag == 'array':
+        return [llsd_value(child) for child in element]
+    text = element.text or ""
+    if element.tag == 'integer':
+        return int(text or 0)
+    if element.tag == 'real':
+        return float(text or 0)
+    if element.tag == 'boolean':
+        return text.strip().lower() in ("1", "true")
+    if element.tag == 'undef':
+        return None
+    return text
+
+def parse_llsd_xml(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if llsd is not None:
+        return llsd.parse_xml(data)
+    root = ET.fromstring(data)
+    return llsd_value(root[0]) if len(root) else None
+
+class InstallPlanner:
+    # Compares the installed-packages manifest with autobuild.xml and works out
+    # which packages must be added, upgraded (hash or version changed) or
+    # removed (installed but no longer declared). Autobuild keeps installed
+    # packages under 'dependencies', each with its archive and a
+    # package_description holding the version.
+    INSTALLED_FILE = "installed-packages.xml"
+    
+    def __init__(self, config_file, installed_file, platform):
+        self.config_file = config_file
+        self.installed_file = installed_file
+        self.platform = platform
+    
+    @classmethod
+    def installed_path(cls, install_cfg):
+        # The explicit manifest, else the one autobuild keeps in the install dir
+        if install_cfg.get('manifest_file'):
+            return install_cfg['manifest_file']
+        if install_cfg.get('install_dir'):
+            return os.path.join(install_cfg['install_dir'], cls.INSTALLED_FILE)
+        return ""
+    
+    @staticmethod
+    def platform_name(platform, address_size):
+        platform = platform or {'win32': "windows", 'darwin': "darwin"}.get(sys.platform, "linux")
+        return f"{platform}{address_size or 64}"
+    
+    def archive_info(self, package):
+        platforms = package.get('platforms') or {}
+        base = self.platform.rstrip("0123456789")
+        for name in (self.platform, base, "common"):
+            if name in platforms:
+                return platforms[name].get('archive') or {}
+        return None
+    
+    def plan(self, requested=None):
+        declared = (parse_llsd_xml(self.config_file) or {}).get('installables') or {}
+        installed = {}
+        if os.path.exists(self.installed_file):
+            installed = (parse_llsd_xml(self.installed_file) or {}).get('dependencies') or {}
+        wanted = requested or sorted(declared)
+        plan = {'add': [], 'upgrade': [], 'remove': [], 'unchanged': [], 'unknown': []}
+        for name in wanted:
+            if name not in declared:
+                plan['unknown'].append(name)
+                continue
+            archive = self.archive_info(declared[name])
+            if archive is None:
+                # Nothing to install for this platform
+                continue
+            current = installed.get(name)
+            if current is None:
+                plan['add'].append(name)
+            elif ((archive.get('hash') or "") != ((current.get('archive') or {}).get('hash') or "")
+                    or (declared[name].get('version') or "") != ((current.get('package_description') or {}).get('version') or "")):
+                plan['upgrade'].append(name)
+            else:
+                plan['unchanged'].append(name)
+        plan['remove'] = sorted(PackageSet.of(declared).diff(installed)[1])
+        return plan
+    
+    @staticmethod
+    def describe(plan):
+        lines = []
+        for key in ('add', 'upgrade', 'remove'):
+            if plan[key]:
+                lines.append(f"{key}: {' '.join(plan[key])}")
+        if plan['unknown']:
+            lines.append(f"not in autobuild.xml, skipped: {' '.join(plan['unknown'])}")
+        lines.append(f"unchanged: {len(plan['unchanged'])} packages")
+        return lines
+
+class JsonStreamParser:
+    # Incremental JSON parser. Containers shallower than stream_depth are reported
+    # member by member as soon as each member is complete; deeper values are
+    # decoded whole with the C decoder.
+    WHITESPACE = " \t\n\r"
+    
+    def __init__(self, stream_depth=2):
+        self.stream_depth = stream_depth
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.stack = []
+        self.started = False
+        self.done = False
+    
+    def feed(self, text):
+        self.buf += text
+        events = []
+        self.parse(events)
+        # Drop consumed text so the buffer does not hold the whole document
+        if self.pos > 1024 * 1024:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        return events
+    
+    def finish(self):
+        if not self.done:
+            raise ValueError("Incomplete or invalid JSON document")
+    
+    def skip_whitespace(self, pos):
+        buf = self.buf
+        while pos < len(buf) and buf[pos] in self.WHITESPACE:
+            pos += 1
+        return pos
+    
+    def open_container(self, events, path, char, pos):
+        kind = 'object' if char == '{' else 'array'
+        self.stack.append({'type': kind, 'path': path, 'count': 0})
+        self.pos = pos
+        events.append(('open', path, kind))
+    
+    def parse(self, events):
+        buf = self.buf
+        if not self.started:
+            # Skip anything a command printed before the document
+            starts = [i for i in (buf.find('{', self.pos), buf.find('[', self.pos)) if i >= 0]
+            if not starts:
+                self.pos = len(buf)
+                return
+            start = min(starts)
+            self.open_container(events, (), buf[start], start + 1)
+            self.started = True
+        
+        while self.stack:
+            frame = self.stack[-1]
+            pos = self.skip_whitespace(self.pos)
+            if pos >= len(buf):
+                return
+            if buf[pos] == ('}' if frame['type'] == 'object' else ']'):
+                self.stack.pop()
+                self.pos = pos + 1
+                events.append(('close', frame['path'], frame['count']))
+                continue
+            if frame['count']:
+                if buf[pos] != ',':
+                    raise ValueError(f"Expected ',' at offset {pos}")
+                pos = self.skip_whitespace(pos + 1)
+                if pos >= len(buf):
+                    return
+            
+            if frame['type'] == 'object':
+                if buf[pos] != '"':
+                    raise ValueError(f"Expected a key at offset {pos}")
+                try:
+                    key, pos = self.decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    return
+                pos = self.skip_whitespace(pos)
+                if pos >= len(buf):
+                    return
+                if buf[pos] != ':':
+                    raise ValueError(f"Expected ':' at offset {pos}")
+                pos = self.skip_whitespace(pos + 1)
+                if pos >= len(buf):
+                    return
+            else:
+                key = frame['count']
+            
+            path = frame['path'] + (key,)
+            if buf[pos] in '{[' and len(path) < self.stream_depth:
+                frame['count'] += 1
+                self.open_container(events, path, buf[pos], pos + 1)
+                continue
+            try:
+                value, end = self.decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Incomplete value; wait for more input
+                return
+            if self.skip_whitespace(end) >= len(buf):
+                # A trailing number might still be growing
+                return
+            frame['count'] += 1
+            self.pos = end
+            events.append(('value', path, value))
+        self.done = True
+
+class JsonSearchIndex:
+    # Inverted index from words in keys and scalar values to node paths
+    WORD = re.compile(r"[\w.\-]+")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.words = {}
+    
+    def add(self, path, value=None, key_only=False):
+        with self.lock:
+            if key_only:
+                self.add_text(path, str(path[-1]))
+            else:
+                self.add_node(path, value)
+    
+    def add_node(self, path, value):
+        if path:
+            self.add_text(path, str(path[-1]))
+        if isinstance(value, dict):
+            for key, child in value.items():
+                self.add_node(path + (key,), child)
+        elif isinstance(value, list):
+            for idx, child in enumerate(value):
+                self.add_node(path + (idx,), child)
+        elif value is not None:
+            self.add_text(path, value if isinstance(value, str) else json.dumps(value))
+    
+    def add_text(self, path, text):
+        for word in self.WORD.findall(text.lower()):
+            paths = self.words.setdefault(word, [])
+            if not paths or paths[-1] != path:
+                paths.append(path)
+    
+    def search(self, query):
+        # Every query term must match (as a substring) some word of the same node
+        results = None
+        with self.lock:
+            for term in self.WORD.findall(query.lower()):
+                matches = set()
+                for word, paths in self.words.items():
+                    if term in word:
+                        matches.update(paths)
+                results = matches if results is None else results & matches
+        return sorted(results or [], key=lambda path: (len(path), [str(part) for part in path]))
+
+class JsonInspector:
+    # Treeview over a JSON document that only creates child nodes on expand
+    BATCH = 500
+    
+    def __init__(self, parent):
+        self.tree = ttk.Treeview(parent, columns=("value",))
+        self.tree.heading("#0", text="Key")
+        self.tree.heading("value", text="Value")
+        self.tree.column("#0", width=300)
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+        self.clear()
+    
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self.nodes = {(): ""}
+        self.streamed = {}
+        self.pending = {}
+        self.more = {}
+        self.index = JsonSearchIndex()
+    
+    def summarize(self, value):
+        if isinstance(value, dict):
+            return f"{{{len(value)}}}"
+        if isinstance(value, list):
+            return f"[{len(value)}]"
+        text = json.dumps(value)
+        return text if len(text) <= 200 else text[:200] + "..."
+    
+    def add_event(self, kind, path, value):
+        if kind == 'open':
+            if path:
+                self.nodes[path] = self.tree.insert(self.nodes[path[:-1]], tk.END, text=str(path[-1]), values=("loading...",))
+                self.streamed[path] = value
+        elif kind == 'close':
+            if path:
+                text = f"{{{value}}}" if self.streamed[path] == 'object' else f"[{value}]"
+                self.tree.item(self.nodes[path], values=(text,))
+        else:
+            self.insert_value(self.nodes[path[:-1]], path, value)
+    
+    def insert_value(self, parent, path, value):
+        item = self.tree.insert(parent, tk.END, text=str(path[-1]), values=(self.summarize(value),))
+        self.nodes[path] = item
+        if isinstance(value, (dict, list)) and value:
+            # Placeholder child so the node shows an expander
+            self.pending[item] = (path, value, 0)
+            self.tree.insert(item, tk.END, text="...")
+        return item
+    
+    def on_open(self, event=None):
+        item = self.tree.focus()
+        if item in self.pending:
+            self.materialize(item)
+        elif item in self.more:
+            self.load_more(item)
+    
+    def materialize(self, item):
+        path, value, start = self.pending.pop(item)
+        self.tree.delete(*self.tree.get_children(item))
+        self.insert_batch(item, path, value, start)
+    
+    def load_more(self, more_item):
+        item, path, value, start = self.more.pop(more_item)
+        self.tree.delete(more_item)
+        self.insert_batch(item, path, value, start)
+    
+    def insert_batch(self, item, path, value, start):
+        children = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, child in itertools.islice(children, start, start + self.BATCH):
+            self.insert_value(item, path + (key,), child)
+        remaining = len(value) - start - self.BATCH
+        if remaining > 0:
+            more_item = self.tree.insert(item, tk.END, text=f"... {remaining} more")
+            self.tree.insert(more_item, tk.END, text="...")
+            self.more[more_item] = (item, path, value, start + self.BATCH)
+    
+    def reveal(self, path):
+        # Create the nodes along path, expanding lazily built parents as needed
+        for depth in range(1, len(path) + 1):
+            sub = path[:depth]
+            parent = self.nodes.get(sub[:-1])
+            if parent is None:
+                return False
+            if parent in self.pending:
+                self.materialize(parent)
+            while sub not in self.nodes:
+                more_items = [m for m, (owner, _, _, _) in self.more.items() if owner == parent]
+                if not more_items:
+                    return False
+                self.load_more(more_items[0])
+            if parent:
+                self.tree.item(parent, open=True)
+        item = self.nodes[path]
+        self.tree.see(item)
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+        return True
+
+class PackageSet(tuple):
+    # Ordered, deduplicated, immutable list of package names or file
+    # patterns, stored as a tuple: one fixed array of references to interned
+    # strings. Recently built sets are shared, so configs that repeat the
+    # same list hold one copy; copy/deepcopy return the set itself.
+    # Membership is O(1), diff() compares two versions of a list and it
+    # serializes to JSON as a list.
+    KEYS = ('packages', 'patterns')
+    SHARED_SETS = 4096
+    interned = collections.OrderedDict()
+    lock = threading.Lock()
+    
+    @classmethod
+    def of(cls, items=()):
+        if isinstance(items, cls):
+            return items
+        items = tuple(dict.fromkeys(sys.intern(str(item)) for item in items))
+        with cls.lock:
+            shared = cls.interned.get(items)
+            if shared is None:
+                shared = cls.interned[items] = tuple.__new__(cls, items)
+                if len(cls.interned) > cls.SHARED_SETS:
+                    cls.interned.popitem(last=False)
+            else:
+                cls.interned.move_to_end(items)
+            return shared
+    
+    def __contains__(self, item):
+        lookup = self.__dict__.get('lookup')
+        if lookup is None:
+            lookup = self.__dict__['lookup'] = frozenset(self)
+        return item in lookup
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, (list, tuple)):
+            return tuple.__eq__(self, tuple(other))
+        return NotImplemented
+    
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    __hash__ = tuple.__hash__
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return (PackageSet.of, (tuple(self),))
+    
+    def __repr__(self):
+        return f"PackageSet({list(self)!r})"
+    
+    def diff(self, other):
+        # (added, removed) going from other to self; identical lists are
+        # usually the same shared set, which costs nothing to compare
+        other = PackageSet.of(other)
+        if self is other:
+            return PackageSet.of(), PackageSet.of()
+        return (PackageSet.of(item for item in self if item not in other),
+                PackageSet.of(item for item in other if item not in self))
+    
+    @classmethod
+    def json_hook(cls, obj):
+        # object_hook for json.load: package and pattern lists become sets
+        for key in cls.KEYS:
+            if isinstance(obj.get(key), list) and all(isinstance(item, str) for item in obj[key]):
+                obj[key] = cls.of(obj[key])
+        return obj
+
+class AutobuildCommands:
+    # Renders autobuild command lines from a configuration dict
+    STEPS = [
+        'build', 'configure', 'edit', 'install', 'installables', 'manifest',
+        'package', 'print', 'source_environment', 'uninstall', 'upload'
+    ]
+    
+    def __init__(self, config):
+        self.config = config
+    
+    def render_batch(self):
+        batch_content = "@echo off\n"
+        batch_content += ":: Autobuild Batch File - Generated on {}\n".format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        batch_content += ":: Second Life Viewer Build Configuration\n\n"
+        
+        # Add environment variables if needed
+        if self.config['installables'].get('creds'):
+            batch_content += ":: Set credentials for private packages\n"
+            if self.config['installables']['creds'] == "github":
+                batch_content += "set AUTOBUILD_GITHUB_TOKEN=your_github_token_here\n"
+            elif self.config['installables']['creds'] == "gitlab":
+                batch_content += "set AUTOBUILD_GITLAB_TOKEN=your_gitlab_token_here\n"
+            batch_content += "\n"
+        
+        # Calibrated parallelism for this host
+        cpu_count = self.cpu_count()
+        if cpu_count:
+            batch_content += f":: Calibrated for {socket.gethostname()}\n"
+            batch_content += f"set AUTOBUILD_CPU_COUNT={cpu_count}\n\n"
+        
+        # Compiler cache launcher settings
+        cache_env = self.compiler_cache_env()
+        if cache_env:
+            batch_content += ":: Compiler cache\n"
+            for name, value in cache_env.items():
+                batch_content += f"set {name}={value}\n"
+            batch_content += "\n"
+        
+        # Generate commands based on configuration
+        for step in self.STEPS:
+            batch_content += self.generate_command(step)
+        
+        # Add pause at the end to keep window open
+        batch_content += "\npause"
+        return batch_content
+    
+    def script_env(self):
+        # Variables render_batch sets, for the POSIX renderers
+        env = {}
+        cpu_count = self.cpu_count()
+        if cpu_count:
+            env['AUTOBUILD_CPU_COUNT'] = str(cpu_count)
+        env.update(self.compiler_cache_env())
+        return env
+    
+    def render_shell(self):
+        script = "#!/bin/sh\n"
+        script += "# Autobuild shell script - Generated on {}\n".format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        script += "# Second Life Viewer Build Configuration\n"
+        script += "set -e\n\n"
+        creds = self.config['installables'].get('creds')
+        if creds in ("github", "gitlab"):
+            script += f"# Set AUTOBUILD_{creds.upper()}_TOKEN for private packages\n"
+        for name, value in self.script_env().items():
+            script += f"export {name}={shlex.quote(value)}\n"
+        for step, command in self.pipeline_steps():
+            script += f"\n# {step}\n{command}\n"
+        return script
+    
+    def render_ninja(self):
+        # One edge per step, each ordered after the previous one
+        def escape(text):
+            return text.replace("$", "$$").replace("\n", " ")
+        
+        env = "".join(f"{name}={shlex.quote(value)} " for name, value in self.script_env().items())
+        ninja = "# Autobuild ninja file - Generated on {}\n".format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        ninja += "ninja_required_version = 1.5\n\n"
+        ninja += "rule autobuild\n"
+        ninja += f"  command = {escape(env)}$cmd\n"
+        ninja += "  description = autobuild $step\n"
+        ninja += "  pool = console\n"
+        previous = None
+        for step, command in self.pipeline_steps():
+            ninja += f"\nbuild {step}: autobuild" + (f" || {previous}" if previous else "") + "\n"
+            ninja += f"  cmd = {escape(command)}\n"
+            ninja += f"  step = {step}\n"
+            previous = step
+        if previous:
+            ninja += f"\ndefault {previous}\n"
+        return ninja
+    
+    def compiler_cache(self, history=None):
+        build_cfg = self.config['build']
+        if build_cfg.get('compiler_cache') not in ("ccache", "sccache"):
+            return None
+        label = "{} {}-bit".format(build_cfg.get('configuration') or "default", build_cfg.get('address_size') or "64")
+        return CompilerCache(build_cfg['compiler_cache'], build_cfg.get('cache_dir', ''), build_cfg.get('cache_size', ''), history, label)
+    
+    def cpu_count(self, host=None):
+        # AUTOBUILD_CPU_COUNT found by calibration on this host, if any
+        calibrated = self.config.get('pipeline', {}).get('cpu_counts', {}).get(host or socket.gethostname())
+        return calibrated['cpu_count'] if calibrated else None
+    
+    def compiler_cache_env(self):
+        cache = self.compiler_cache()
+        return cache.env() if cache else {}
+    
+    def generate_command(self, step):
+        return getattr(self, f"generate_{step}_command")()
+    
+    def pipeline_steps(self, steps=None):
+        # (step, command line) pairs in the order generate_batch writes them
+        result = []
+        for step in self.STEPS:
+            if steps is not None and step not in steps:
+                continue
+            lines = [line for line in self.generate_command(step).splitlines() if line and not line.startswith("::")]
+            if lines:
+                result.append((step, " ".join(lines)))
+        return result
+    
+    def generate_build_command(self):
+        cmd = ":: Build command\n"
+        cmd += "autobuild build"
+        
+        # Add standard options
+        if self.config['build']['debug']:
+            cmd += " --debug"
+        if self.config['build']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['build']['verbose']:
+            cmd += " --verbose"
+        if self.config['build']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['build']['all_configs']:
+            cmd += " --all"
+        if self.config['build']['configuration']:
+            cmd += f" --configuration {self.config['build']['configuration']}"
+        if self.config['build']['no_configure']:
+            cmd += " --no-configure"
+        if self.config['build']['build_id']:
+            cmd += f" --id {self.config['build']['build_id']}"
+        if self.config['build']['address_size']:
+            cmd += f" --address-size {self.config['build']['address_size']}"
+        if self.config['build']['additional_options']:
+            cmd += f" -- {self.config['build']['additional_options']}"
+        
+        return cmd + "\n\n"
+    
+    def generate_configure_command(self):
+        cmd = ":: Configure command\n"
+        cmd += "autobuild configure"
+        
+        # Add standard options
+        if self.config['configure']['debug']:
+            cmd += " --debug"
+        if self.config['configure']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['configure']['verbose']:
+            cmd += " --verbose"
+        if self.config['configure']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['configure']['all_configs']:
+            cmd += " --all"
+        if self.config['configure']['configuration']:
+            cmd += f" --configuration {self.config['configure']['configuration']}"
+        if self.config['configure']['address_size']:
+            cmd += f" --address-size {self.config['configure']['address_size']}"
+        if self.config['configure']['additional_options']:
+            cmd += f" -- {self.config['configure']['additional_options']}"
+        
+        return cmd + "\n\n"
+    
+    def generate_edit_command(self):
+        cmd = ":: Edit command\n"
+        cmd += f"autobuild edit {self.config['edit']['subcommand']}"
+        
+        # Add standard options
+        if self.config['edit']['debug']:
+            cmd += " --debug"
+        if self.config['edit']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['edit']['verbose']:
+            cmd += " --verbose"
+        if self.config['edit']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['edit']['config_file']:
+            cmd += f" --config-file {self.config['edit']['config_file']}"
+        if self.config['edit']['delete']:
+            cmd += " --delete"
+        
+        # Add subcommand-specific options
+        if self.config['edit']['subcommand'] == "build" and self.config['edit']['build_command']:
+            cmd += f" {self.config['edit']['build_command']}"
+        elif self.config['edit']['subcommand'] == "configure" and self.config['edit']['configure_command']:
+            cmd += f" {self.config['edit']['configure_command']}"
+        elif self.config['edit']['subcommand'] == "package" and self.config['edit']['package_name']:
+            cmd += f" {self.config['edit']['package_name']}"
+        elif self.config['edit']['subcommand'] == "platform" and self.config['edit']['platform_name']:
+            cmd += f" {self.config['edit']['platform_name']}"
+        
+        return cmd + "\n\n"
+    
+    def install_planner(self):
+        install_cfg = self.config['install']
+        workdir = self.config.get('pipeline', {}).get('workdir', '')
+        config_file = install_cfg['config_file'] or os.environ.get('AUTOBUILD_CONFIG_FILE') or "autobuild.xml"
+        installed_file = InstallPlanner.installed_path(install_cfg)
+        if not installed_file:
+            raise ValueError("Set an install directory or installed manifest to plan delta installs")
+        platform = InstallPlanner.platform_name(install_cfg['platform'], self.config['build'].get('address_size'))
+        return InstallPlanner(os.path.join(workdir, config_file), os.path.join(workdir, installed_file), platform)
+    
+    def install_plan(self):
+        return self.install_planner().plan(self.config['install']['packages'])
+    
+    def generate_install_command(self):
+        install_cfg = self.config['install']
+        listing = (install_cfg['export_manifest'] or install_cfg['list'] or install_cfg['list_installed']
+                   or install_cfg['list_licenses'])
+        plan = None
+        # Listing and exporting never install, so there is nothing to plan
+        if install_cfg.get('delta') and not listing:
+            try:
+                plan = self.install_plan()
+            except Exception as e:
+                plan = e
+        if isinstance(plan, dict):
+            return self.generate_delta_install_command(plan)
+        
+        cmd = ":: Install command\n"
+        if isinstance(plan, Exception):
+            cmd += f":: Delta install unavailable ({plan}); installing everything\n"
+        cmd += "autobuild install"
+        
+        # Add standard options
+        if self.config['install']['debug']:
+            cmd += " --debug"
+        if self.config['install']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['install']['verbose']:
+            cmd += " --verbose"
+        if self.config['install']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['install']['config_file']:
+            cmd += f" --config-file {self.config['install']['config_file']}"
+        if self.config['install']['install_dir']:
+            cmd += f" --install-dir {self.config['install']['install_dir']}"
+        if self.config['install']['manifest_file']:
+            cmd += f" --installed-manifest {self.config['install']['manifest_file']}"
+        if self.config['install']['export_manifest']:
+            cmd += " --export-manifest"
+        if self.config['install']['list']:
+            cmd += " --list"
+        if self.config['install']['list_installed']:
+            cmd += " --list-installed"
+        if self.config['install']['list_licenses']:
+            cmd += " --list-licenses"
+        if self.config['install']['platform']:
+            cmd += f" --platform {self.config['install']['platform']}"
+        
+        # Add packages
+        if self.config['install']['packages']:
+            cmd += " " + " ".join(self.config['install']['packages'])
+        
+        return cmd + "\n\n"
+    
+    def generate_delta_install_command(self, plan):
+        # Only the packages whose hash or version changed, planned when the
+        # script is generated
+        cmd = ":: Install command (delta)\n"
+        for line in InstallPlanner.describe(plan):
+            cmd += f":: {line}\n"
+        install_cfg = self.config['install']
+        options = ""
+        if install_cfg['debug']:
+            options += " --debug"
+        if install_cfg['dry_run']:
+            options += " --dry-run"
+        if install_cfg['verbose']:
+            options += " --verbose"
+        if install_cfg['quiet']:
+            options += " --quiet"
+        if install_cfg['config_file']:
+            options += f" --config-file {install_cfg['config_file']}"
+        if install_cfg['install_dir']:
+            options += f" --install-dir {install_cfg['install_dir']}"
+        if install_cfg['manifest_file']:
+            options += f" --installed-manifest {install_cfg['manifest_file']}"
+        
+        commands = []
+        if plan['remove']:
+            commands.append("autobuild uninstall" + options + " " + " ".join(plan['remove']))
+        # Packages autobuild.xml does not declare are only reported above
+        changed = plan['add'] + plan['upgrade']
+        if changed:
+            platform = f" --platform {install_cfg['platform']}" if install_cfg['platform'] else ""
+            commands.append("autobuild install" + options + platform + " " + " ".join(changed))
+        if not commands:
+            return cmd + ":: Everything is up to date\n\n"
+        return cmd + " && ".join(commands) + "\n\n"
+    
+    def generate_installables_command(self):
+        cmd = ":: Installables command\n"
+        cmd += f"autobuild installables {self.config['installables']['command']}"
+        
+        # Add standard options
+        if self.config['installables']['debug']:
+            cmd += " --debug"
+        if self.config['installables']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['installables']['verbose']:
+            cmd += " --verbose"
+        if self.config['installables']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['installables']['config_file']:
+            cmd += f" --config-file {self.config['installables']['config_file']}"
+        if self.config['installables']['archive']:
+            cmd += f" --archive {self.config['installables']['archive']}"
+        
+        # Add package name and attributes
+        if self.config['installables']['pkg_name']:
+            cmd += f" {self.config['installables']['pkg_name']}"
+            attrs = []
+            if self.config['installables']['creds']:
+                attrs.append(f"creds={self.config['installables']['creds']}")
+            if self.config['installables']['url']:
+                attrs.append(f"url={self.config['installables']['url']}")
+            if self.config['installables']['hash']:
+                attrs.append(f"hash={self.config['installables']['hash']}")
+            if self.config['installables']['hash_alg']:
+                attrs.append(f"hash_algorithm={self.config['installables']['hash_alg']}")
+            
+            if attrs:
+                cmd += " " + " ".join(attrs)
+        
+        return cmd + "\n\n"
+    
+    def generate_manifest_command(self):
+        cmd = ":: Manifest command\n"
+        cmd += f"autobuild manifest {self.config['manifest']['command']}"
+        
+        # Add standard options
+        if self.config['manifest']['debug']:
+            cmd += " --debug"
+        if self.config['manifest']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['manifest']['verbose']:
+            cmd += " --verbose"
+        if self.config['manifest']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['manifest']['config_file']:
+            cmd += f" --config-file {self.config['manifest']['config_file']}"
+        if self.config['manifest']['platform']:
+            cmd += f" --platform {self.config['manifest']['platform']}"
+        
+        # Add patterns for add command
+        if self.config['manifest']['command'] == "add" and self.config['manifest']['patterns']:
+            cmd += " " + " ".join(self.config['manifest']['patterns'])
+        
+        return cmd + "\n\n"
+    
+    def generate_package_command(self):
+        cmd = ":: Package command\n"
+        cmd += "autobuild package"
+        
+        # Add standard options
+        if self.config['package']['debug']:
+            cmd += " --debug"
+        if self.config['package']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['package']['verbose']:
+            cmd += " --verbose"
+        if self.config['package']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['package']['config_file']:
+            cmd += f" --config-file {self.config['package']['config_file']}"
+        if self.config['package']['archive_name']:
+            cmd += f" --archive-name {self.config['package']['archive_name']}"
+        if self.config['package']['platform']:
+            cmd += f" --platform {self.config['package']['platform']}"
+        
+        return cmd + "\n\n"
+    
+    def generate_print_command(self):
+        cmd = ":: Print command\n"
+        cmd += "autobuild print"
+        
+        # Add standard options
+        if self.config['print']['debug']:
+            cmd += " --debug"
+        if self.config['print']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['print']['verbose']:
+            cmd += " --verbose"
+        if self.config['print']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['print']['config_file']:
+            cmd += f" --config-file {self.config['print']['config_file']}"
+        if self.config['print']['json']:
+            cmd += " --json"
+        
+        return cmd + "\n\n"
+    
+    def generate_source_environment_command(self):
+        cmd = ":: Source Environment command\n"
+        cmd += "autobuild source_environment"
+        
+        # Add standard options
+        if self.config['source_environment']['debug']:
+            cmd += " --debug"
+        if self.config['source_environment']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['source_environment']['verbose']:
+            cmd += " --verbose"
+        if self.config['source_environment']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['source_environment']['vars_file']:
+            cmd += f" {self.config['source_environment']['vars_file']}"
+        
+        return cmd + "\n\n"
+    
+    def generate_uninstall_command(self):
+        cmd = ":: Uninstall command\n"
+        cmd += "autobuild uninstall"
+        
+        # Add standard options
+        if self.config['uninstall']['debug']:
+            cmd += " --debug"
+        if self.config['uninstall']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['uninstall']['verbose']:
+            cmd += " --verbose"
+        if self.config['uninstall']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['uninstall']['config_file']:
+            cmd += f" --config-file {self.config['uninstall']['config_file']}"
+        if self.config['uninstall']['install_dir']:
+            cmd += f" --install-dir {self.config['uninstall']['install_dir']}"
+        if self.config['uninstall']['manifest_file']:
+            cmd += f" --installed-manifest {self.config['uninstall']['manifest_file']}"
+        
+        # Add packages
+        if self.config['uninstall']['packages']:
+            cmd += " " + " ".join(self.config['uninstall']['packages'])
+        
+        return cmd + "\n\n"
+    
+    def generate_upload_command(self):
+        cmd = ":: Upload command\n"
+        cmd += f"autobuild upload {self.config['upload']['archive']}"
+        
+        # Add standard options
+        if self.config['upload']['debug']:
+            cmd += " --debug"
+        if self.config['upload']['dry_run']:
+            cmd += " --dry-run"
+        if self.config['upload']['verbose']:
+            cmd += " --verbose"
+        if self.config['upload']['quiet']:
+            cmd += " --quiet"
+        
+        # Add command-specific options
+        if self.config['upload']['to_s3']:
+            cmd += " --upload-to-s3"
+        if self.config['upload']['credentials']:
+            cmd += f" --credentials {self.config['upload']['credentials']}"
+        
+        return cmd + "\n\n"
+
+def config_fingerprint(section):
+    return hashlib.sha1(json.dumps(section, sort_keys=True).encode('utf-8')).hexdigest()
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return "{}h {:02d}m {:02d}s".format(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+    if seconds >= 60:
+        return "{}m {:02d}s".format(seconds // 60, seconds % 60)
+    return f"{seconds}s"
+
+class BuildHistory:
+    # SQLite record of every executed step, used for ETAs and trend charts
+    def __init__(self, path=None):
+        self.path = path or os.path.join(STATE_DIR, "history.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "id INTEGER PRIMARY KEY, step TEXT, fingerprint TEXT, host TEXT, "
+                "started REAL, duration REAL, exit_status INTEGER, command TEXT)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS runs_step ON runs (step, host, fingerprint)")
+            columns = [row[1] for row in self.db.execute("PRAGMA table_info(runs)")]
+            if 'peak_rss' not in columns:
+                self.db.execute("ALTER TABLE runs ADD COLUMN peak_rss INTEGER")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                "run_id INTEGER, tool TEXT, label TEXT, hits INTEGER, misses INTEGER)"
+            )
+    
+    def record(self, step, fingerprint, host, started, duration, exit_status, command="", peak_rss=None):
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (step, fingerprint, host, started, duration, exit_status, command, peak_rss) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (step, fingerprint, host, started, duration, exit_status, command, peak_rss)
+            )
+            return cursor.lastrowid
+    
+    def estimate_memory(self, step, fingerprint, host):
+        # Largest peak RSS of recent runs with the same configuration
+        with self.lock:
+            row = self.db.execute(
+                "SELECT MAX(peak_rss) FROM (SELECT peak_rss FROM runs WHERE step = ? AND host = ? "
+                "AND fingerprint = ? AND peak_rss IS NOT NULL ORDER BY started DESC LIMIT 5)",
+                (step, host, fingerprint)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def estimate(self, step, fingerprint, host):
+        # Median of recent successful runs, from the most to the least specific match
+        queries = [
+            ("step = ? AND host = ? AND fingerprint = ?", (step, host, fingerprint)),
+            ("step = ? AND host = ?", (step, host)),
+            ("step = ?", (step,))
+        ]
+        with self.lock:
+            for where, args in queries:
+                rows = self.db.execute(
+                    f"SELECT duration FROM runs WHERE {where} AND exit_status = 0 ORDER BY started DESC LIMIT 10",
+                    args
+                ).fetchall()
+                if rows:
+                    return statistics.median(row[0] for row in rows)
+        return None
+    
+    def record_cache_stats(self, run_id, tool, label, hits, misses):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT INTO cache_stats (run_id, tool, label, hits, misses) VALUES (?, ?, ?, ?, ?)",
+                (run_id, tool, label, hits, misses)
+            )
+    
+    def cold_cache_baseline(self, step, tool, label):
+        # Median duration of successful runs where under 10% of compilations hit the cache
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT runs.duration FROM cache_stats JOIN runs ON runs.id = cache_stats.run_id "
+                "WHERE runs.step = ? AND tool = ? AND label = ? AND runs.exit_status = 0 "
+                "AND hits * 10 < hits + misses ORDER BY runs.started DESC LIMIT 10",
+                (step, tool, label)
+            ).fetchall()
+        return statistics.median(row[0] for row in rows) if rows else None
+    
+    def cache_report(self):
+        with self.lock:
+            return self.db.execute(
+                "SELECT runs.step, label, tool, COUNT(*), SUM(hits), SUM(misses), AVG(runs.duration) "
+                "FROM cache_stats JOIN runs ON runs.id = cache_stats.run_id WHERE runs.exit_status = 0 "
+                "GROUP BY runs.step, label, tool ORDER BY label, runs.step"
+            ).fetchall()
+    
+    def runs(self, step=None, limit=100):
+        with self.lock:
+            if step:
+                cursor = self.db.execute(
+                    "SELECT step, fingerprint, host, started, duration, exit_status FROM runs "
+                    "WHERE step = ? ORDER BY started DESC LIMIT ?", (step, limit))
+            else:
+                cursor = self.db.execute(
+                    "SELECT step, fingerprint, host, started, duration, exit_status FROM runs "
+                    "ORDER BY started DESC LIMIT ?", (limit,))
+            return cursor.fetchall()
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(count) < 1024 or unit == "GB":
+            break
+        count /= 1024.0
+    return f"{count:.1f} {unit}" if unit != "B" else f"{int(count)} B"
+
+class ResourceGovernor:
+    # Keeps concurrent jobs under a memory ceiling. Jobs are admitted or deferred
+    # up front, and whole process trees are paused with SIGSTOP/SIGCONT when the
+    # RSS measured through /proc runs over the ceiling.
+    def __init__(self, ceiling_bytes, reserve_bytes=0, interval=1.0):
+        self.ceiling = ceiling_bytes
+        self.reserve = reserve_bytes
+        self.interval = interval
+        self.supported = os.path.exists("/proc/meminfo") and hasattr(signal, 'SIGSTOP')
+        self.page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self.condition = threading.Condition()
+        self.jobs = {}
+        self.next_id = 1
+        self.decisions = collections.deque(maxlen=200)
+        self.decision_count = 0
+        self.monitor = None
+        if not self.supported:
+            self.log("Memory governor needs /proc and SIGSTOP; admitting every job")
+    
+    def log(self, message):
+        self.decisions.append((time.time(), message))
+        self.decision_count += 1
+    
+    def set_limits(self, ceiling_bytes, reserve_bytes):
+        with self.condition:
+            self.ceiling = ceiling_bytes
+            self.reserve = reserve_bytes
+            self.condition.notify_all()
+    
+    def admit(self, name, estimate=0, cancelled=None):
+        # Blocks until the job fits; returns None if cancelled while waiting
+        with self.condition:
+            job_id = self.next_id
+            self.next_id += 1
+            job = {'name': name, 'pid': None, 'state': 'waiting', 'estimate': estimate or 0,
+                   'rss': 0, 'peak': 0, 'tree': [], 'started': time.monotonic()}
+            self.jobs[job_id] = job
+            deferred = False
+            while not self.fits(job):
+                if cancelled and cancelled():
+                    del self.jobs[job_id]
+                    self.log(f"Dropped {name} while deferred")
+                    return None
+                if not deferred:
+                    self.log(f"Deferred {name}: needs about {format_bytes(job['estimate'])}, "
+                             f"{format_bytes(self.used())} in use of {format_bytes(self.ceiling)}")
+                    deferred = True
+                self.condition.wait(self.interval)
+            job['state'] = 'running'
+            self.log(f"Admitted {name}" + (f" (expects {format_bytes(job['estimate'])})" if job['estimate'] else ""))
+            if self.supported and self.monitor is None:
+                self.monitor = threading.Thread(target=self.run_monitor, daemon=True)
+                self.monitor.start()
+            return job_id
+    
+    def attach(self, job_id, pid):
+        with self.condition:
+            self.jobs[job_id]['pid'] = pid
+    
+    def release(self, job_id):
+        with self.condition:
+            job = self.jobs.pop(job_id, None)
+            self.condition.notify_all()
+        return job['peak'] if job and job['peak'] else None
+    
+    def used(self):
+        # Running jobs are charged at least their expected peak until they reach it
+        return sum(max(job['rss'], job['estimate']) for job in self.jobs.values() if job['state'] != 'waiting')
+    
+    def fits(self, job):
+        if not self.supported:
+            return True
+        if not any(other['state'] != 'waiting' for other in self.jobs.values()):
+            return True
+        if self.used() + job['estimate'] > self.ceiling:
+            return False
+        return self.memory_available() - job['estimate'] >= self.reserve
+    
+    def memory_available(self):
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+    
+    def process_trees(self, roots):
+        # One /proc scan per tick: map every root pid to itself plus its descendants
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", 'r') as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        trees = {}
+        for root in roots:
+            tree, stack = [], [root]
+            while stack:
+                pid = stack.pop()
+                tree.append(pid)
+                stack.extend(children.get(pid, []))
+            trees[root] = tree
+        return trees
+    
+    def tree_rss(self, tree):
+        total = 0
+        for pid in tree:
+            try:
+                with open(f"/proc/{pid}/statm", 'r') as f:
+                    total += int(f.read().split()[1]) * self.page_size
+            except OSError:
+                pass
+        return total
+    
+    def signal_tree(self, job, sig):
+        for pid in job['tree']:
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+    
+    def run_monitor(self):
+        while True:
+            time.sleep(self.interval)
+            with self.condition:
+                if not self.jobs:
+                    self.monitor = None
+                    return
+                roots = [job['pid'] for job in self.jobs.values() if job['pid']]
+            trees = self.process_trees(roots)
+            sizes = {pid: (tree, self.tree_rss(tree)) for pid, tree in trees.items()}
+            with self.condition:
+                for job in self.jobs.values():
+                    if job['pid'] in sizes:
+                        job['tree'], job['rss'] = sizes[job['pid']]
+                        job['peak'] = max(job['peak'], job['rss'])
+                self.balance()
+                self.condition.notify_all()
+    
+    def balance(self):
+        running = sorted((job for job in self.jobs.values() if job['state'] == 'running' and job['pid']), key=lambda job: job['started'])
+        paused = sorted((job for job in self.jobs.values() if job['state'] == 'paused'), key=lambda job: job['started'])
+        total = sum(job['rss'] for job in running + paused)
+        available = self.memory_available()
+        if total > self.ceiling or available < self.reserve:
+            if len(running) > 1:
+                # Stop the newest job so the older ones can finish and free memory
+                victim = running[-1]
+                self.signal_tree(victim, signal.SIGSTOP)
+                victim['state'] = 'paused'
+                self.log(f"Paused {victim['name']}: jobs use {format_bytes(total)} of {format_bytes(self.ceiling)}, "
+                         f"{format_bytes(available)} available")
+        elif paused and total < self.ceiling * 0.9 and available > self.reserve * 1.1:
+            job = paused[0]
+            self.signal_tree(job, signal.SIGCONT)
+            job['state'] = 'running'
+            self.log(f"Resumed {job['name']}: jobs use {format_bytes(total)}, {format_bytes(available)} available")
+    
+    def snapshot(self):
+        with self.condition:
+            return [(job['name'], job['state'], job['rss']) for job in self.jobs.values()]
+
+class JobScheduler:
+    # Runs background work in priority classes. Queued jobs start in
+    # (priority, submission) order on at most `slots` threads; a higher class
+    # that finds every slot busy preempts the newest running background job.
+    # Preemption is cooperative: the job blocks in its next checkpoint() call
+    # until it is resumed. Background jobs run on threads with lowered CPU and
+    # I/O priority.
+    INTERACTIVE, NORMAL, BACKGROUND = 0, 1, 2
+    PRIORITIES = {'interactive': INTERACTIVE, 'normal': NORMAL, 'background': BACKGROUND}
+    IOPRIO_SET = {'x86_64': 251, 'aarch64': 30, 'i686': 289, 'armv7l': 314}
+    
+    def __init__(self, slots=2):
+        self.slots = slots
+        self.condition = threading.Condition()
+        self.queued = []
+        self.jobs = []
+        self.sequence = itertools.count()
+        self.local = threading.local()
+    
+    def submit(self, name, work, priority='normal'):
+        job = {'name': name, 'work': work, 'priority': self.PRIORITIES.get(priority, priority),
+               'seq': next(self.sequence), 'state': 'queued', 'result': None, 'error': None,
+               'resume': threading.Event(), 'done': threading.Event()}
+        job['resume'].set()
+        with self.condition:
+            heapq.heappush(self.queued, (job['priority'], job['seq'], id(job), job))
+            self.jobs.append(job)
+            self.dispatch()
+        return job
+    
+    def dispatch(self):
+        # Called with the condition held
+        while True:
+            running = [job for job in self.jobs if job['state'] == 'running']
+            paused = [job for job in self.jobs if job['state'] == 'paused']
+            candidates = [(job['priority'], job['seq'], job) for job in paused]
+            if self.queued:
+                candidates.append(self.queued[0][:2] + (self.queued[0][3],))
+            if not candidates:
+                return
+            priority, _, job = min(candidates, key=lambda c: c[:2])
+            if len(running) >= self.slots:
+                victims = [j for j in running if j['priority'] == self.BACKGROUND and j['priority'] > priority]
+                if not victims:
+                    return
+                self.pause(max(victims, key=lambda j: j['seq']))
+            if job['state'] == 'paused':
+                self.resume(job)
+            else:
+                heapq.heappop(self.queued)
+                job['state'] = 'running'
+                threading.Thread(target=self.run, args=(job,), daemon=True).start()
+    
+    def pause(self, job):
+        job['state'] = 'paused'
+        job['resume'].clear()
+    
+    def resume(self, job):
+        job['state'] = 'running'
+        job['resume'].set()
+    
+    def lower_priority(self):
+        # Lowers the calling thread only, so interactive jobs are unaffected
+        try:
+            if sys.platform.startswith('linux'):
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+                number = self.IOPRIO_SET.get(os.uname().machine)
+                if number:
+                    # ioprio_set(IOPRIO_WHO_PROCESS, tid, IOPRIO_CLASS_IDLE)
+                    ctypes.CDLL(None, use_errno=True).syscall(number, 1, threading.get_native_id(), 3 << 13)
+            elif os.name == 'nt':
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 0x00010000)  # THREAD_MODE_BACKGROUND_BEGIN
+        except (OSError, AttributeError):
+            pass
+    
+    def run(self, job):
+        self.local.job = job
+        if job['priority'] == self.BACKGROUND:
+            self.lower_priority()
+        try:
+            job['result'] = job['work']()
+        except Exception as e:
+            job['error'] = e
+        with self.condition:
+            job['state'] = 'done'
+            self.jobs.remove(job)
+            self.dispatch()
+        job['done'].set()
+    
+    def checkpoint(self):
+        # Preemptible work calls this between units of work
+        job = getattr(self.local, 'job', None)
+        if job is not None:
+            job['resume'].wait()
+    
+    def snapshot(self):
+        with self.condition:
+            return [(job['name'], job['state'], job['priority']) for job in self.jobs]
+
+class InstallSnapshots:
+    # One install tree per platform/configuration/address size, kept next to
+    # install_dir in "<install_dir>.snapshots". install_dir itself becomes a
+    # symlink to the active tree and is switched by atomically replacing the link.
+    # On Windows it is a junction instead, which needs no Developer Mode.
+    # New snapshots start empty: autobuild extracts over existing files in place,
+    # so trees sharing hardlinks with another snapshot would be corrupted.
+    IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003  # Junction
+    
+    def __init__(self, install_dir):
+        self.install_dir = os.path.abspath(install_dir.rstrip("/\\"))
+        self.root = self.install_dir + ".snapshots"
+    
+    @staticmethod
+    def label(platform, configuration, address_size):
+        platform = platform or {'win32': "windows", 'darwin': "darwin"}.get(sys.platform, "linux")
+        label = f"{platform}-{configuration or 'default'}-{address_size or 64}"
+        return re.sub(r'[^A-Za-z0-9._-]', "_", label)
+    
+    def snapshots(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+    
+    @staticmethod
+    def is_link(path):
+        # os.path.islink does not report junctions
+        if os.path.islink(path):
+            return True
+        try:
+            return getattr(os.lstat(path), 'st_reparse_tag', 0) == InstallSnapshots.IO_REPARSE_TAG_MOUNT_POINT
+        except OSError:
+            return False
+    
+    def active(self):
+        if not self.is_link(self.install_dir):
+            return None
+        return os.path.basename(os.path.normpath(os.readlink(self.install_dir)))
+    
+    def switch(self, label):
+        # Returns (created, adopted): whether the snapshot is new, and where a
+        # pre-existing real install directory was moved to
+        target = os.path.join(self.root, label)
+        created = not os.path.isdir(target)
+        os.makedirs(target, exist_ok=True)
+        adopted = None
+        if os.path.lexists(self.install_dir) and not self.is_link(self.install_dir):
+            # Its configuration is unknown, so keep it aside rather than guess
+            adopted = os.path.join(self.root, "adopted-" + datetime.now().strftime("%Y%m%d-%H%M%S"))
+            os.rename(self.install_dir, adopted)
+        if _winapi:
+            self.switch_junction(target, adopted)
+            return created, adopted
+        tmp = f"{self.install_dir}.link-{os.getpid()}"
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        try:
+            os.symlink(os.path.relpath(target, os.path.dirname(self.install_dir)), tmp, target_is_directory=True)
+        except OSError as e:
+            if adopted:
+                os.rename(adopted, self.install_dir)
+            raise OSError(f"Cannot create symlinks here ({e})") from e
+        os.replace(tmp, self.install_dir)
+        return created, adopted
+    
+    def switch_junction(self, target, adopted):
+        # Windows cannot rename over a directory link, so the old link is
+        # removed first; the switch is not atomic there
+        if os.path.lexists(self.install_dir):
+            os.rmdir(self.install_dir)  # Removes the link, not the snapshot
+        try:
+            _winapi.CreateJunction(target, self.install_dir)
+        except OSError as e:
+            if adopted:
+                os.rename(adopted, self.install_dir)
+            raise OSError(f"Cannot create a junction at {self.install_dir} ({e})") from e
+    
+    def remove(self, label):
+        if label == self.active():
+            raise ValueError(f"Snapshot {label} is active")
+        shutil.rmtree(os.path.join(self.root, label))
+
+class LocalBlobStore:
+    # Key/value blob store in a local or network-mounted directory
+    def __init__(self, root):
+        self.root = root
+    
+    def path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+    
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+    
+    def get_file(self, key, dest):
+        src = self.path(key)
+        if not os.path.isfile(src):
+            return False
+        tmp = f"{dest}.tmp-{os.getpid()}"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        return True
+    
+    def put_file(self, key, src):
+        dest = self.path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.tmp-{os.getpid()}"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    
+    def get_bytes(self, key):
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def put_bytes(self, key, data):
+        dest = self.path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, dest)
+
+class HttpBlobStore:
+    # Key/value blob store over plain HTTP: HEAD, GET and PUT on <base_url>/<key>
+    def __init__(self, base_url):
+        self.base = urlsplit(base_url.rstrip("/") + "/")
+        self.pool = ConnectionPool()
+    
+    def request(self, method, key, body=None, headers=None):
+        for attempt in range(2):
+            conn = self.pool.acquire(self.base.scheme, self.base.netloc)
+            try:
+                conn.request(method, self.base.path + key, body=body, headers=headers or {})
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Stale keep-alive socket; retry once on a fresh one
+                conn.close()
+                if attempt:
+                    raise
+                if hasattr(body, 'seek'):
+                    body.seek(0)
+            except Exception:
+                conn.close()
+                raise
+    
+    def finish(self, conn, response):
+        response.read()
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.release(self.base.scheme, self.base.netloc, conn)
+    
+    def exists(self, key):
+        conn, response = self.request("HEAD", key)
+        self.finish(conn, response)
+        return response.status == 200
+    
+    def get_file(self, key, dest):
+        conn, response = self.request("GET", key)
+        if response.status != 200:
+            self.finish(conn, response)
+            if response.status == 404:
+                return False
+            raise OSError(f"HTTP {response.status} {response.reason} for {key}")
+        tmp = f"{dest}.tmp-{os.getpid()}"
+        try:
+            with open(tmp, 'wb') as f:
+                shutil.copyfileobj(response, f, DownloadManager.CHUNK_SIZE)
+        except Exception:
+            conn.close()
+            raise
+        self.finish(conn, response)
+        os.replace(tmp, dest)
+        return True
+    
+    def put_file(self, key, src):
+        with open(src, 'rb') as f:
+            conn, response = self.request("PUT", key, body=f, headers={'Content-Length': str(os.path.getsize(src))})
+        self.finish(conn, response)
+        if response.status not in (200, 201, 204):
+            raise OSError(f"HTTP {response.status} {response.reason} storing {key}")
+    
+    def get_bytes(self, key):
+        conn, response = self.request("GET", key)
+        data = response.read()
+        self.finish(conn, response)
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise OSError(f"HTTP {response.status} {response.reason} for {key}")
+        return data
+    
+    def put_bytes(self, key, data):
+        conn, response = self.request("PUT", key, body=data, headers={'Content-Length': str(len(data))})
+        self.finish(conn, response)
+        if response.status not in (200, 201, 204):
+            raise OSError(f"HTTP {response.status} {response.reason} storing {key}")
+
+def make_blob_store(kind, location):
+    if kind == "http":
+        return HttpBlobStore(location)
+    return LocalBlobStore(location)
+
+class ChunkedUploader:
+    # Content-defined chunking with a local index of chunks the remote store
+    # already holds; an upload sends only missing chunks plus a manifest.
+    # A boundary is a position whose preceding WINDOW bytes hash to a multiple
+    # of the divisor. Hashing every position in pure Python would run at a few
+    # MB/s, so only positions right after an ANCHOR byte (found with bytes.find)
+    # are hashed; the decision still depends only on local content, so an
+    # insertion shifts at most the neighbouring boundaries.
+    MIN_SIZE = 256 * 1024
+    AVG_SIZE = 1024 * 1024
+    MAX_SIZE = 4 * 1024 * 1024
+    WINDOW = 64
+    ANCHOR = b"\xa5"
+    DIVISOR = AVG_SIZE // 256
+    
+    def __init__(self, store, location, index_path=None, max_workers=8):
+        self.store = store
+        self.location = location
+        self.index_path = index_path or os.path.join(STATE_DIR, "chunks.sqlite3")
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        self.db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS chunks (store TEXT, chunk TEXT, size INTEGER, PRIMARY KEY (store, chunk))")
+        self.db.commit()
+    
+    @classmethod
+    def boundary(cls, data, start, end):
+        # First cut point in data[start:end] at or after MIN_SIZE, else None
+        pos = start + cls.MIN_SIZE
+        limit = min(end, start + cls.MAX_SIZE)
+        while True:
+            pos = data.find(cls.ANCHOR, pos, limit)
+            if pos < 0:
+                return None
+            pos += 1
+            if zlib.crc32(data[pos - cls.WINDOW:pos]) % cls.DIVISOR == 0:
+                return pos
+    
+    @classmethod
+    def chunks(cls, f, buffer_size=16 * 1024 * 1024):
+        # Yields chunk bytes read from f
+        data = b""
+        eof = False
+        while not eof or data:
+            if not eof and len(data) < cls.MAX_SIZE:
+                block = f.read(buffer_size)
+                eof = not block
+                data += block
+                continue
+            start = 0
+            while len(data) - start >= cls.MAX_SIZE or (eof and start < len(data)):
+                cut = cls.boundary(data, start, len(data))
+                if cut is None:
+                    cut = min(start + cls.MAX_SIZE, len(data))
+                yield data[start:cut]
+                start = cut
+            data = data[start:]
+    
+    def known(self, chunk):
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM chunks WHERE store = ? AND chunk = ?",
+                                   (self.location, chunk)).fetchone() is not None
+    
+    def remember(self, chunk, size):
+        with self.lock:
+            self.db.execute("INSERT OR IGNORE INTO chunks VALUES (?, ?, ?)", (self.location, chunk, size))
+            self.db.commit()
+    
+    def send(self, chunk, data):
+        # Returns bytes sent
+        if self.known(chunk):
+            return 0
+        sent = 0
+        if not self.store.exists("chunks/" + chunk):
+            self.store.put_bytes("chunks/" + chunk, data)
+            sent = len(data)
+        self.remember(chunk, len(data))
+        return sent
+    
+    def upload(self, archive, name=None, checkpoint=None):
+        # checkpoint() is called between chunks so the upload can be paused
+        name = name or os.path.basename(archive)
+        whole = hashlib.sha256()
+        manifest = []
+        stats = {'chunks': 0, 'new_chunks': 0, 'bytes': 0, 'bytes_sent': 0}
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool, open(archive, 'rb') as f:
+            for data in self.chunks(f):
+                if checkpoint:
+                    checkpoint()
+                whole.update(data)
+                chunk = hashlib.sha256(data).hexdigest()
+                manifest.append([chunk, len(data)])
+                stats['chunks'] += 1
+                stats['bytes'] += len(data)
+                pending.append(pool.submit(self.send, chunk, data))
+                # Bound the chunks held in memory
+                while len(pending) > self.max_workers * 2:
+                    self.count_sent(stats, pending.popleft().result())
+            while pending:
+                self.count_sent(stats, pending.popleft().result())
+        document = {'name': name, 'size': stats['bytes'], 'sha256': whole.hexdigest(), 'chunks': manifest}
+        self.store.put_bytes(f"manifests/{name}.json", json.dumps(document).encode('utf-8'))
+        return stats
+    
+    @staticmethod
+    def count_sent(stats, sent):
+        if sent:
+            stats['new_chunks'] += 1
+            stats['bytes_sent'] += sent
+    
+    def restore(self, name, dest):
+        document = self.store.get_bytes(f"manifests/{name}.json")
+        if document is None:
+            raise FileNotFoundError(f"No manifest for {name}")
+        document = json.loads(document)
+        whole = hashlib.sha256()
+        tmp = f"{dest}.tmp-{os.getpid()}"
+        with open(tmp, 'wb') as f:
+            for chunk, size in document['chunks']:
+                data = self.store.get_bytes("chunks/" + chunk)
+                if data is None or len(data) != size or hashlib.sha256(data).hexdigest() != chunk:
+                    os.remove(tmp)
+                    raise ValueError(f"Chunk {chunk} of {name} is missing or corrupt")
+                whole.update(data)
+                f.write(data)
+        if whole.hexdigest() != document['sha256']:
+            os.remove(tmp)
+            raise ValueError(f"Reassembled {name} does not match its manifest")
+        os.replace(tmp, dest)
+        return document['size']
+
+class StagePackager:
+    # Packages a stage directory as a .tar.gz whose single deflate stream is a
+    # run of independently compressed segments, one per entry, each ending on
+    # a full flush. The next package copies the segments of unchanged files
+    # out of the previous archive and combines their CRCs instead of
+    # recompressing them. A per-file index (size, mtime, sha256, segment)
+    # means only files whose size or mtime changed are read again. A delta
+    # package holds only the changed entries plus a reference to its base.
+    DELTA_MANIFEST = "autobuild-delta.json"
+    SUFFIXES = ('.tar.gz', '.tgz')
+    GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+    COPY_BUFFER = 1024 * 1024
+    crc_powers = []
+    
+    def __init__(self, stage_dir, index_path=None, level=6):
+        self.stage_dir = os.path.abspath(stage_dir)
+        key = hashlib.sha1(self.stage_dir.encode('utf-8')).hexdigest()[:16]
+        self.index_path = index_path or os.path.join(STATE_DIR, "packages", f"{key}.json")
+        self.level = level
+    
+    @staticmethod
+    def gf2_times(matrix, vector):
+        total = 0
+        row = 0
+        while vector:
+            if vector & 1:
+                total ^= matrix[row]
+            vector >>= 1
+            row += 1
+        return total
+    
+    @classmethod
+    def crc32_combine(cls, crc1, crc2, length):
+        # CRC-32 of A+B from crc32(A), crc32(B) and len(B), as zlib's
+        # crc32_combine; the operators for 2**k zero bytes are built once
+        if not cls.crc_powers:
+            operator = [0xedb88320] + [1 << n for n in range(31)]  # one zero bit
+            for power in range(3 + 64):
+                operator = [cls.gf2_times(operator, operator[n]) for n in range(32)]
+                if power >= 2:
+                    cls.crc_powers.append(operator)
+        power = 0
+        while length:
+            if length & 1:
+                crc1 = cls.gf2_times(cls.crc_powers[power], crc1)
+            length >>= 1
+            power += 1
+        return crc1 ^ crc2
+    
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'files': {}}
+    
+    def save_index(self, index):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        with open(self.index_path + ".tmp", 'w') as f:
+            json.dump(index, f)
+        os.replace(self.index_path + ".tmp", self.index_path)
+    
+    def scan(self):
+        # (relative path, path, lstat) for every entry, parents first
+        entries = []
+        for root, dirs, files in os.walk(self.stage_dir):
+            dirs.sort()
+            for name in dirs + sorted(files):
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.stage_dir).replace(os.sep, "/")
+                entries.append((rel, path, os.lstat(path)))
+        return entries
+    
+    def write_segment(self, out, chunks):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        segment = {'offset': out.tell(), 'crc': 0, 'raw': 0}
+        for chunk in chunks:
+            segment['crc'] = zlib.crc32(chunk, segment['crc'])
+            segment['raw'] += len(chunk)
+            out.write(compressor.compress(chunk))
+        out.write(compressor.flush(zlib.Z_FULL_FLUSH))
+        segment['length'] = out.tell() - segment['offset']
+        return segment
+    
+    @staticmethod
+    def tar_header(rel, st, kind=tarfile.REGTYPE, linkname="", size=0):
+        info = tarfile.TarInfo(rel)
+        info.type = kind
+        info.mode = stat.S_IMODE(st.st_mode) if st else 0o644
+        info.mtime = int(st.st_mtime) if st else int(time.time())
+        info.size = size
+        info.linkname = linkname
+        return info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+    
+    def file_chunks(self, rel, path, st, digest):
+        yield self.tar_header(rel, st, size=st.st_size)
+        remaining = st.st_size
+        with open(path, 'rb') as f:
+            while remaining:
+                block = f.read(min(self.COPY_BUFFER, remaining))
+                if not block:
+                    raise OSError(f"{rel} shrank while it was being packaged")
+                digest.update(block)
+                remaining -= len(block)
+                yield block
+        if st.st_size % tarfile.BLOCKSIZE:
+            yield tarfile.NUL * (tarfile.BLOCKSIZE - st.st_size % tarfile.BLOCKSIZE)
+    
+    @staticmethod
+    def unchanged(entry, st):
+        return (entry is not None and 'sha256' in entry and entry['size'] == st.st_size
+                and entry['mtime_ns'] == st.st_mtime_ns and entry['mode'] == stat.S_IMODE(st.st_mode))
+    
+    def package(self, archive, delta=False):
+        if not archive.endswith(self.SUFFIXES):
+            raise ValueError("Stage packaging writes .tar.gz archives")
+        index = self.load_index()
+        previous = index.get('files', {})
+        base = index.get('archive')
+        if delta and not base:
+            raise ValueError("No full package of this stage directory to base a delta on")
+        source = None
+        if not delta and base and os.path.exists(base['path']):
+            st = os.stat(base['path'])
+            if st.st_size == base['size'] and st.st_mtime_ns == base['mtime_ns']:
+                source = open(base['path'], 'rb')
+        stats = {'files': 0, 'rehashed': 0, 'compressed': 0, 'reused': 0, 'bytes': 0, 'reused_bytes': 0}
+        files = {}
+        seen = set()
+        crc = size = 0
+        tmp = f"{archive}.tmp-{os.getpid()}"
+        try:
+            with open(tmp, 'wb') as out:
+                out.write(self.GZIP_HEADER)
+                for rel, path, st in self.scan():
+                    seen.add(rel)
+                    old = previous.get(rel)
+                    segment = None
+                    if stat.S_ISREG(st.st_mode):
+                        stats['files'] += 1
+                        stats['bytes'] += st.st_size
+                        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'mode': stat.S_IMODE(st.st_mode)}
+                        if self.unchanged(old, st):
+                            files[rel] = old
+                            if delta:
+                                continue
+                            if source:
+                                # Copy the compressed segment as is
+                                new_offset = out.tell()
+                                source.seek(old['offset'])
+                                remaining = old['length']
+                                while remaining:
+                                    block = source.read(min(self.COPY_BUFFER, remaining))
+                                    if not block:
+                                        raise OSError(f"{base['path']} is shorter than its index")
+                                    out.write(block)
+                                    remaining -= len(block)
+                                files[rel] = dict(old, offset=new_offset)
+                                crc = self.crc32_combine(crc, old['crc'], old['raw'])
+                                size += old['raw']
+                                stats['reused'] += 1
+                                stats['reused_bytes'] += st.st_size
+                                continue
+                        digest = hashlib.sha256()
+                        segment = self.write_segment(out, self.file_chunks(rel, path, st, digest))
+                        entry['sha256'] = digest.hexdigest()
+                        stats['rehashed'] += 1
+                        if delta and old and old.get('sha256') == entry['sha256'] and old['mode'] == entry['mode']:
+                            # Touched but not changed
+                            out.seek(segment['offset'])
+                            out.truncate()
+                            continue
+                        stats['compressed'] += 1
+                        files[rel] = dict(entry, **segment)
+                    elif stat.S_ISLNK(st.st_mode):
+                        target = os.readlink(path)
+                        files[rel] = {'link': target}
+                        if delta and old == files[rel]:
+                            continue
+                        segment = self.write_segment(out, [self.tar_header(rel, st, tarfile.SYMTYPE, target)])
+                    elif stat.S_ISDIR(st.st_mode):
+                        files[rel] = {'dir': True}
+                        if delta and old == files[rel]:
+                            continue
+                        segment = self.write_segment(out, [self.tar_header(rel, st, tarfile.DIRTYPE)])
+                    else:
+                        continue  # Sockets, FIFOs and devices are not packaged
+                    crc = self.crc32_combine(crc, segment['crc'], segment['raw'])
+                    size += segment['raw']
+                
+                removed = sorted(rel for rel in previous if rel not in seen)
+                if delta:
+                    manifest = json.dumps({'base': os.path.basename(base['path']), 'base_sha256': base['sha256'],
+                                           'removed': removed}, indent=4).encode('utf-8')
+                    chunks = [self.tar_header(self.DELTA_MANIFEST, None, size=len(manifest)), manifest,
+                              tarfile.NUL * (-len(manifest) % tarfile.BLOCKSIZE)]
+                    segment = self.write_segment(out, chunks)
+                    crc = self.crc32_combine(crc, segment['crc'], segment['raw'])
+                    size += segment['raw']
+                # End-of-archive blocks, the final empty deflate block and the gzip trailer
+                segment = self.write_segment(out, [tarfile.NUL * (2 * tarfile.BLOCKSIZE)])
+                crc = self.crc32_combine(crc, segment['crc'], segment['raw'])
+                size += segment['raw']
+                out.write(b"\x03\x00" + struct.pack("<II", crc, size & 0xffffffff))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        finally:
+            if source:
+                source.close()
+        sha256, md5 = hashlib.sha256(), hashlib.md5()
+        with open(tmp, 'rb') as f:
+            for block in iter(lambda: f.read(self.COPY_BUFFER), b""):
+                sha256.update(block)
+                md5.update(block)
+        os.replace(tmp, archive)
+        stats.update(archive=archive, removed=removed, sha256=sha256.hexdigest(), md5=md5.hexdigest(),
+                     size=os.path.getsize(archive))
+        if not delta:
+            # A delta is always taken against the last full package
+            st = os.stat(archive)
+            self.save_index({'archive': {'path': os.path.abspath(archive), 'size': st.st_size,
+                                         'mtime_ns': st.st_mtime_ns, 'sha256': stats['sha256']},
+                             'files': files})
+        return stats
+    
+    @classmethod
+    def apply_delta(cls, base, delta, dest):
+        # Rebuilds the packaged tree: base contents, then the delta's
+        with tarfile.open(delta, 'r:gz') as tf:
+            manifest = json.load(tf.extractfile(cls.DELTA_MANIFEST))
+        digest = hashlib.sha256()
+        with open(base, 'rb') as f:
+            for block in iter(lambda: f.read(cls.COPY_BUFFER), b""):
+                digest.update(block)
+        if digest.hexdigest() != manifest['base_sha256']:
+            raise ValueError(f"{os.path.basename(base)} is not the base of this delta ({manifest['base']})")
+        extract_archive(base, dest)
+        extract_archive(delta, dest)
+        dest = os.path.abspath(dest)
+        os.remove(os.path.join(dest, cls.DELTA_MANIFEST))
+        for rel in sorted(manifest['removed'], reverse=True):
+            path = os.path.abspath(os.path.join(dest, rel))
+            if os.path.commonpath([dest, path]) != dest:
+                raise ValueError(f"Unsafe member path: {rel}")
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.lexists(path):
+                os.remove(path)
+        return manifest
+
+class ArtifactCache:
+    # Restores the packaged archive of an identical earlier build instead of
+    # running build/configure/package. The key covers the options that change
+    # the packaged output, autobuild.xml, the installed manifest and the git
+    # revision; paths and cache backends local to one machine are left out so
+    # agents share keys.
+    CACHED_STEPS = ('build', 'configure', 'package')
+    OUTPUT_OPTIONS = {
+        'build': ('configuration', 'all_configs', 'build_id', 'address_size', 'additional_options'),
+        'configure': ('configuration', 'all_configs', 'address_size', 'additional_options'),
+        'package': ('platform',)
+    }
+    PLATFORM_ENV = ('AUTOBUILD_PLATFORM', 'AUTOBUILD_ADDRSIZE', 'AUTOBUILD_CONFIGURATION')
+    
+    def __init__(self, store, config, workdir=""):
+        self.store = store
+        self.config = config
+        self.workdir = workdir or os.getcwd()
+        self.checked = False
+        self.key = None
+        self.hit = False
+    
+    def resolve(self, path):
+        return os.path.join(self.workdir, path)
+    
+    def archive_path(self):
+        name = self.config['package'].get('archive_name')
+        return self.resolve(name) if name else None
+    
+    def source_revision(self):
+        # Only checkouts without edits to tracked files are cacheable; untracked
+        # build output (archives, build directories) does not count as an edit
+        try:
+            head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.workdir,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+            dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=self.workdir,
+                                   capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return None if dirty else head
+    
+    def compute_key(self):
+        revision = self.source_revision()
+        if revision is None:
+            return None
+        hasher = hashlib.sha256(revision.encode('utf-8'))
+        for section, options in self.OUTPUT_OPTIONS.items():
+            section_cfg = self.config.get(section, {})
+            relevant = {option: section_cfg.get(option) for option in options}
+            hasher.update(json.dumps({section: relevant}, sort_keys=True).encode('utf-8'))
+        # package.platform is usually empty and autobuild falls back to the
+        # host and these variables, so a shared store must tell hosts apart
+        host = {'system': sys.platform, 'machine': platform.machine(),
+                'platform': InstallPlanner.platform_name(None, self.config['build'].get('address_size')),
+                'env': {name: os.environ.get(name) for name in self.PLATFORM_ENV}}
+        hasher.update(json.dumps({'host': host}, sort_keys=True).encode('utf-8'))
+        config_file = self.config['package'].get('config_file') or os.environ.get('AUTOBUILD_CONFIG_FILE') or "autobuild.xml"
+        for path in (config_file, InstallPlanner.installed_path(self.config['install'])):
+            if path and os.path.isfile(self.resolve(path)):
+                hasher.update(DownloadManager.file_digest(self.resolve(path), "sha256").encode('utf-8'))
+            else:
+                hasher.update(f"missing:{path}".encode('utf-8'))
+        return hasher.hexdigest()
+    
+    def before_step(self, runner, step):
+        if step not in self.CACHED_STEPS:
+            return False
+        if not self.checked:
+            self.checked = True
+            archive = self.archive_path()
+            if archive is None:
+                runner.output.put("Artifact cache: set an archive name on the Package tab to enable caching\n")
+                return False
+            if self.config['build'].get('dry_run') or self.config['package'].get('dry_run'):
+                return False
+            self.key = self.compute_key()
+            if self.key is None:
+                runner.output.put("Artifact cache: source tree is dirty or not a git checkout; not caching\n")
+                return False
+            try:
+                self.hit = self.store.get_file("artifacts/" + self.key, archive)
+            except OSError as e:
+                runner.output.put(f"Artifact cache lookup failed: {e}\n")
+            if self.hit:
+                runner.output.put(f"Artifact cache hit {self.key[:12]}: restored {archive}\n")
+            else:
+                runner.output.put(f"Artifact cache miss {self.key[:12]}\n")
+        return self.hit
+    
+    def after_step(self, runner, step, status, duration, run_id):
+        if step != 'package' or status != 0 or not self.key or self.hit:
+            return
+        archive = self.archive_path()
+        if not os.path.isfile(archive):
+            runner.output.put(f"Artifact cache: {archive} was not produced; nothing stored\n")
+            return
+        try:
+            self.store.put_file("artifacts/" + self.key, archive)
+            runner.output.put(f"Artifact cache: stored {os.path.basename(archive)} as {self.key[:12]}\n")
+        except OSError as e:
+            runner.output.put(f"Artifact cache upload failed: {e}\n")
+
+class CompilerCache:
+    # ccache/sccache integration: launcher environment, cache directory and size
+    # limit, and per-build hit statistics recorded in the build history
+    LAUNCHER_STEPS = ('build', 'configure')
+    
+    def __init__(self, tool, cache_dir="", max_size="", history=None, label=""):
+        self.tool = tool
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.history = history
+        self.label = label
+        self.before = None
+        # Hits and misses over every step of this run
+        self.totals = [0, 0]
+    
+    def env(self):
+        env = {
+            'CMAKE_C_COMPILER_LAUNCHER': self.tool,
+            'CMAKE_CXX_COMPILER_LAUNCHER': self.tool
+        }
+        if self.tool == "ccache":
+            if self.cache_dir:
+                env['CCACHE_DIR'] = self.cache_dir
+            if self.max_size:
+                env['CCACHE_MAXSIZE'] = self.max_size
+        else:
+            if self.cache_dir:
+                env['SCCACHE_DIR'] = self.cache_dir
+            if self.max_size:
+                env['SCCACHE_CACHE_SIZE'] = self.max_size
+        return env
+    
+    def run_tool(self, *args):
+        env = dict(os.environ, **self.env())
+        return subprocess.run([self.tool] + list(args), env=env, capture_output=True, text=True, timeout=60)
+    
+    def prepare(self):
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        if shutil.which(self.tool) is None:
+            raise FileNotFoundError(f"{self.tool} was not found on PATH")
+        if self.tool == "ccache" and self.max_size:
+            self.run_tool("--max-size", self.max_size)
+        elif self.tool == "sccache":
+            # The server picks up SCCACHE_DIR and SCCACHE_CACHE_SIZE when it starts
+            self.run_tool("--start-server")
+    
+    def stats(self):
+        # Returns (hits, misses) counted since the cache was created, or None
+        try:
+            if self.tool == "sccache":
+                result = self.run_tool("--show-stats", "--stats-format=json")
+                data = json.loads(result.stdout)['stats']
+                return (sum(data['cache_hits']['counts'].values()),
+                        sum(data['cache_misses']['counts'].values()))
+            result = self.run_tool("--print-stats")
+            if result.returncode == 0:
+                counters = dict(line.split("\t", 1) for line in result.stdout.splitlines() if "\t" in line)
+                hits = int(counters.get('direct_cache_hit', 0)) + int(counters.get('preprocessed_cache_hit', 0))
+                return hits, int(counters.get('cache_miss', 0))
+            # ccache 3.x only has the human readable summary
+            result = self.run_tool("--show-stats")
+            hits = sum(int(n) for n in re.findall(r"cache hit \((?:direct|preprocessed)\)\s+(\d+)", result.stdout))
+            misses = re.search(r"cache miss\s+(\d+)", result.stdout)
+            return hits, int(misses.group(1)) if misses else 0
+        except (OSError, ValueError, KeyError, subprocess.SubprocessError):
+            return None
+    
+    def before_step(self, runner, step):
+        self.before = self.stats() if step in self.LAUNCHER_STEPS else None
+    
+    def after_step(self, runner, step, status, duration, run_id):
+        if self.before is None:
+            return
+        after = self.stats()
+        if after is None:
+            return
+        hits, misses = after[0] - self.before[0], after[1] - self.before[1]
+        self.totals[0] += hits
+        self.totals[1] += misses
+        if hits + misses == 0:
+            runner.output.put(f"{self.tool}: no compilations went through the cache\n")
+            return
+        summary = f"{self.tool}: {hits} hits, {misses} misses ({100.0 * hits / (hits + misses):.1f}% hit rate)"
+        if self.history:
+            baseline = self.history.cold_cache_baseline(step, self.tool, self.label)
+            self.history.record_cache_stats(run_id, self.tool, self.label, hits, misses)
+            if baseline and status == 0:
+                summary += f", about {format_duration(max(0, baseline - duration))} saved against a cold cache"
+        runner.output.put(summary + "\n")
+
+# Runs inside the warm worker process: imports autobuild and all of its tools
+# once, then executes one JSON request per stdin line. Markers carrying the
+# session token tell the GUI where each command starts and ends.
+WARM_WORKER_SOURCE = r"""
+import importlib, json, os, pkgutil, sys, traceback
+import autobuild
+from autobuild import autobuild_main, common
+for module in pkgutil.iter_modules(autobuild.__path__):
+    if module.name.startswith("autobuild_tool_"):
+        try:
+            importlib.import_module("autobuild." + module.name)
+        except Exception:
+            pass
+token = sys.argv[1]
+
+def mark(*fields):
+    sys.stdout.write("\0%s %s\n" % (token, " ".join(str(f) for f in fields)))
+    sys.stdout.flush()
+
+def run(request):
+    sys.argv = ["autobuild"] + request["argv"]
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    try:
+        return autobuild_main.Autobuild().main(request["argv"]) or 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        sys.stderr.write("%s\n" % e.code)
+        return 1
+    except common.AutobuildError as e:
+        sys.stderr.write("ERROR: %s\n" % e)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+mark("ready")
+for line in sys.stdin:
+    request = json.loads(line)
+    if hasattr(os, "fork"):
+        pid = os.fork()
+        if pid == 0:
+            os.setsid()
+            os._exit(run(request))
+        mark("pid", pid)
+        code = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+    else:
+        saved = (list(sys.argv), os.getcwd(), dict(os.environ))
+        mark("pid", os.getpid())
+        code = run(request)
+        sys.argv = saved[0]
+        os.chdir(saved[1])
+        os.environ.clear()
+        os.environ.update(saved[2])
+    mark("exit", code)
+"""
+
+class WarmAutobuild:
+    # One long-lived Python process that pays interpreter startup and the
+    # autobuild imports once. On POSIX every command runs in a forked child
+    # with its own argv, cwd and environment; on Windows it runs in-process
+    # and the worker restores that state afterwards. Runs one command at a time.
+    SHELL_SYNTAX = ('|', '&', ';', '<', '>', '$', '%', '`')
+    
+    def __init__(self, python=""):
+        self.python = python or sys.executable
+        self.token = os.urandom(8).hex()
+        self.process = None
+    
+    @classmethod
+    def argv(cls, command):
+        # Arguments for an `autobuild ...` line, or None when it needs a shell
+        if any(ch in command for ch in cls.SHELL_SYNTAX):
+            return None
+        try:
+            args = shlex.split(command, posix=True)
+        except ValueError:
+            return None
+        if not args or args[0] != "autobuild":
+            return None
+        return args[1:]
+    
+    def start(self):
+        if self.process and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [self.python, "-u", "-c", WARM_WORKER_SOURCE, self.token],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors='replace', bufsize=1
+        )
+        output = []
+        while True:
+            text, fields = self.read()
+            if text:
+                output.append(text)
+            if fields == ['ready']:
+                return
+            if text is None:
+                raise OSError("autobuild worker failed to start:\n" + "".join(output))
+    
+    def read(self):
+        # Returns (output text, marker fields); (None, None) once the worker exits
+        line = self.process.stdout.readline()
+        if not line:
+            return None, None
+        text, found, fields = line.partition(f"\0{self.token} ")
+        return text, fields.split() if found else None
+    
+    def spawn(self, argv, cwd=None, env=None):
+        self.start()
+        request = {'argv': argv, 'cwd': cwd or os.getcwd(), 'env': dict(os.environ if env is None else env)}
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+        return WarmJob(self)
+    
+    def close(self):
+        if self.process and self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+class WarmJob:
+    # Popen-like handle for one command running in the warm worker
+    def __init__(self, worker):
+        self.worker = worker
+        self.pid = None
+        self.returncode = None
+        self.pending = []
+        # Wait for the pid so the command can be signalled right away
+        while self.pid is None and self.returncode is None:
+            self.advance()
+    
+    def advance(self):
+        text, fields = self.worker.read()
+        if text:
+            self.pending.append(text)
+        if text is None:
+            self.returncode = -1
+        elif fields and fields[0] == 'pid':
+            self.pid = int(fields[1])
+        elif fields and fields[0] == 'exit':
+            self.returncode = int(fields[1])
+    
+    @property
+    def stdout(self):
+        while True:
+            while self.pending:
+                yield self.pending.pop(0)
+            if self.returncode is not None:
+                return
+            self.advance()
+    
+    def wait(self):
+        for _ in self.stdout:
+            pass
+        return self.returncode
+    
+    def poll(self):
+        return self.returncode
+    
+    def terminate(self):
+        # In-process commands can only be stopped with their worker
+        self.worker.process.kill()
+
+class CpuCalibrator:
+    # Runs a probe command at several AUTOBUILD_CPU_COUNT levels, measuring wall
+    # time and peak RSS of the process tree, and picks the lowest level within
+    # 5% of the fastest run that stayed under the memory limit
+    TOLERANCE = 1.05
+    
+    def __init__(self, command, levels=None, cwd=None, env=None, memory_limit=None):
+        self.command = command
+        cpus = os.cpu_count() or 1
+        self.levels = sorted(set(levels or [max(1, round(cpus * f)) for f in (0.25, 0.5, 0.75, 1.0, 1.25)]))
+        self.cwd = cwd or None
+        self.env = env
+        self.memory_limit = memory_limit
+        # A governor with no ceiling only measures
+        self.meter = ResourceGovernor(float('inf'), interval=0.25)
+        self.output = queue.Queue()
+        self.results = []
+        self.best = None
+        self.process = None
+        self.cancelled = False
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+    
+    def run(self):
+        if self.memory_limit is None and self.meter.supported:
+            self.memory_limit = self.meter.memory_available()
+        # The first run warms file and compiler caches and is not measured
+        self.output.put(f"Warm-up run at {self.levels[-1]} CPUs\n")
+        self.probe(self.levels[-1])
+        for level in self.levels:
+            if self.cancelled:
+                return
+            status, seconds, peak = self.probe(level)
+            self.results.append({'cpu_count': level, 'seconds': seconds, 'peak_rss': peak, 'status': status})
+            self.output.put(f"{level:4d} CPUs: {format_duration(seconds)}, peak "
+                            f"{format_bytes(peak) if peak else 'unknown'}, exit status {status}\n")
+        self.best = self.choose()
+        if self.best:
+            self.output.put(f"Best setting: AUTOBUILD_CPU_COUNT={self.best}\n")
+        else:
+            self.output.put("No level finished successfully within the memory limit\n")
+    
+    def probe(self, level):
+        env = dict(self.env if self.env is not None else os.environ, AUTOBUILD_CPU_COUNT=str(level))
+        job = self.meter.admit(f"probe at {level} CPUs")
+        started = time.monotonic()
+        try:
+            self.process = subprocess.Popen(
+                self.command, shell=True, cwd=self.cwd, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=os.name != 'nt'
+            )
+            self.meter.attach(job, self.process.pid)
+            status = self.process.wait()
+        except OSError as e:
+            self.output.put(f"{e}\n")
+            status = -1
+        finally:
+            peak = self.meter.release(job)
+        return status, time.monotonic() - started, peak
+    
+    def choose(self):
+        usable = [r for r in self.results if r['status'] == 0
+                  and not (self.memory_limit and r['peak_rss'] and r['peak_rss'] > self.memory_limit)]
+        if not usable:
+            return None
+        fastest = min(r['seconds'] for r in usable)
+        return min(r['cpu_count'] for r in usable if r['seconds'] <= fastest * self.TOLERANCE)
+    
+    def cancel(self):
+        self.cancelled = True
+        process = self.process
+        if process and process.poll() is None:
+            if os.name == 'nt':
+                process.terminate()
+                return
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+class Preflight:
+    # Checks every path and option the selected steps will use before anything
+    # runs. Checks run concurrently so slow network mounts do not add up.
+    # Findings are (level, step, message) with level 'error' or 'warning'.
+    CONFIG_FILE_STEPS = ('edit', 'install', 'installables', 'manifest', 'package', 'print', 'uninstall')
+    MIN_FREE_BYTES = 2 * 1024 ** 3
+    
+    def __init__(self, config, steps, workdir="", digest_file=None, max_workers=8):
+        self.config = config
+        self.steps = list(steps)
+        self.workdir = workdir or os.getcwd()
+        self.digest_file = digest_file or os.path.join(STATE_DIR, "digests.json")
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.digests = None
+        self.check_count = 0
+    
+    def resolve(self, path):
+        return os.path.join(self.workdir, os.path.expanduser(path))
+    
+    def checks(self):
+        # (step, callable) pairs; each callable returns a list of findings
+        checks = [(None, self.check_workdir)]
+        default_config = os.environ.get('AUTOBUILD_CONFIG_FILE') or "autobuild.xml"
+        needs_default = False
+        for step in self.steps:
+            cfg = self.config[step]
+            checks.append((step, lambda step=step: self.check_flags(step)))
+            if step in self.CONFIG_FILE_STEPS and cfg.get('config_file'):
+                checks.append((step, lambda step=step, path=cfg['config_file']: self.check_readable(step, path, "config file")))
+            elif step not in ('source_environment', 'upload'):
+                needs_default = True
+            if step in ('install', 'uninstall') and cfg.get('install_dir'):
+                checks.append((step, lambda step=step, path=cfg['install_dir']: self.check_install_dir(step, path)))
+            if step == 'install' and cfg.get('manifest_file'):
+                checks.append((step, lambda path=cfg['manifest_file']: self.check_writable('install', path, "installed manifest")))
+            if step == 'uninstall' and cfg.get('manifest_file'):
+                checks.append((step, lambda path=cfg['manifest_file']: self.check_readable('uninstall', path, "installed manifest")))
+            if step == 'installables' and cfg.get('archive'):
+                checks.append((step, self.check_installable_archive))
+            if step == 'package' and cfg.get('archive_name'):
+                checks.append((step, lambda path=cfg['archive_name']: self.check_writable('package', path, "archive")))
+            if step == 'source_environment' and cfg.get('vars_file'):
+                checks.append((step, lambda path=cfg['vars_file']: self.check_readable('source_environment', path, "variables file")))
+            if step == 'upload':
+                checks.append((step, self.check_upload))
+        if needs_default:
+            checks.append((None, lambda: self.check_readable(None, default_config, "config file")))
+        return checks
+    
+    def run(self):
+        checks = self.checks()
+        self.check_count = len(checks)
+        findings = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(check): step for step, check in checks}
+            for future in as_completed(futures):
+                try:
+                    findings.extend(future.result())
+                except Exception as e:
+                    findings.append(('error', futures[future], f"Check failed: {e}"))
+        self.save_digests()
+        order = {step: idx for idx, step in enumerate(self.steps)}
+        findings.sort(key=lambda f: (f[0] != 'error', order.get(f[1], -1)))
+        return findings
+    
+    def check_workdir(self):
+        if not os.path.isdir(self.workdir):
+            return [('error', None, f"Working directory {self.workdir} does not exist")]
+        return []
+    
+    def check_flags(self, step):
+        cfg = self.config[step]
+        findings = []
+        if cfg.get('quiet') and cfg.get('verbose'):
+            findings.append(('warning', step, "--quiet and --verbose are both set"))
+        if cfg.get('quiet') and cfg.get('debug'):
+            findings.append(('warning', step, "--quiet and --debug are both set"))
+        if cfg.get('all_configs') and cfg.get('configuration'):
+            findings.append(('error', step, "--all and --configuration are both set"))
+        if step == 'upload' and cfg.get('to_s3') and not cfg.get('credentials'):
+            findings.append(('error', step, "Uploading to S3 needs a credentials file"))
+        if step == 'installables' and cfg.get('hash_alg') and cfg['hash_alg'] not in hashlib.algorithms_available:
+            findings.append(('error', step, f"Unknown hash algorithm {cfg['hash_alg']}"))
+        return findings
+    
+    def check_readable(self, step, path, what):
+        full = self.resolve(path)
+        if not os.path.isfile(full):
+            return [('error', step, f"{what.capitalize()} {full} does not exist")]
+        if not os.access(full, os.R_OK):
+            return [('error', step, f"{what.capitalize()} {full} is not readable")]
+        return []
+    
+    def check_writable(self, step, path, what):
+        full = self.resolve(path)
+        if os.path.exists(full):
+            target = full
+        else:
+            target = os.path.dirname(full) or self.workdir
+            if not os.path.isdir(target):
+                return [('error', step, f"Directory for {what} {full} does not exist")]
+        if not os.access(target, os.W_OK):
+            return [('error', step, f"{what.capitalize()} {full} is not writable")]
+        return []
+    
+    def check_install_dir(self, step, path):
+        full = self.resolve(path)
+        existing = full
+        while not os.path.isdir(existing):
+            parent = os.path.dirname(existing)
+            if parent == existing:
+                return [('error', step, f"Install directory {full} has no existing parent")]
+            existing = parent
+        if not os.access(existing, os.W_OK):
+            return [('error', step, f"Install directory {full} is not writable")]
+        free = shutil.disk_usage(existing).free
+        if step == 'install' and free < self.MIN_FREE_BYTES:
+            return [('warning', step, f"Only {format_bytes(free)} free for install directory {full}")]
+        return []
+    
+    def check_installable_archive(self):
+        cfg = self.config['installables']
+        findings = self.check_readable('installables', cfg['archive'], "archive")
+        if findings or not cfg.get('hash'):
+            return findings
+        hash_alg = cfg.get('hash_alg') or "md5"
+        if hash_alg not in hashlib.algorithms_available:
+            return findings
+        digest = self.cached_digest(self.resolve(cfg['archive']), hash_alg)
+        if digest != cfg['hash'].lower():
+            findings.append(('error', 'installables', f"Archive {cfg['archive']} has {hash_alg} {digest}, expected {cfg['hash']}"))
+        return findings
+    
+    def check_upload(self):
+        cfg = self.config['upload']
+        findings = []
+        if cfg.get('archive'):
+            if 'package' in self.steps and not os.path.exists(self.resolve(cfg['archive'])):
+                # The package step may still produce it
+                findings.append(('warning', 'upload', f"Archive {cfg['archive']} does not exist yet"))
+            else:
+                findings.extend(self.check_readable('upload', cfg['archive'], "archive"))
+        if cfg.get('credentials'):
+            findings.extend(self.check_readable('upload', cfg['credentials'], "credentials file"))
+        return findings
+    
+    def cached_digest(self, path, hash_alg):
+        # Digests are remembered per path, size and mtime, so unchanged archives
+        # are only hashed once
+        st = os.stat(path)
+        stamp = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{hash_alg}"
+        with self.lock:
+            if self.digests is None:
+                self.digests = {}
+                if os.path.exists(self.digest_file):
+                    with open(self.digest_file, 'r') as f:
+                        self.digests = json.load(f)
+            if stamp in self.digests:
+                return self.digests[stamp]
+        digest = DownloadManager.file_digest(path, hash_alg)
+        with self.lock:
+            self.digests[stamp] = digest
+        return digest
+    
+    def save_digests(self):
+        if not self.digests:
+            return
+        os.makedirs(os.path.dirname(self.digest_file), exist_ok=True)
+        with open(self.digest_file + ".tmp", 'w') as f:
+            json.dump(self.digests, f, indent=4)
+        os.replace(self.digest_file + ".tmp", self.digest_file)
+
+class Checkpoint:
+    # Persistent record of the pipeline steps that ran, in order, with the
+    # config fingerprint and command each one ran with. A resumed run starts
+    # at the first step that failed, never ran or no longer matches.
+    def __init__(self, workdir, path=None):
+        key = hashlib.sha1(os.path.abspath(workdir or os.getcwd()).encode('utf-8')).hexdigest()[:16]
+        self.path = path or os.path.join(STATE_DIR, "checkpoints", f"{key}.json")
+        self.lock = threading.Lock()
+        self.records = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.records = json.load(f).get('steps', [])
+    
+    def resume_index(self, steps, fingerprints):
+        for idx, (step, command) in enumerate(steps):
+            if idx >= len(self.records):
+                return idx
+            record = self.records[idx]
+            if (record['step'] != step or record['fingerprint'] != fingerprints.get(step)
+                    or record['command'] != command or record['status'] != 0):
+                return idx
+        return len(steps)
+    
+    def truncate(self, count):
+        # Forget everything from the step the next run starts at
+        with self.lock:
+            self.records = self.records[:count]
+            self.save()
+    
+    def record(self, step, fingerprint, command, status):
+        with self.lock:
+            self.records.append({'step': step, 'fingerprint': fingerprint, 'command': command,
+                                 'status': status, 'finished': time.time()})
+            self.save()
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", 'w') as f:
+            json.dump({'steps': self.records}, f, indent=4)
+        os.replace(self.path + ".tmp", self.path)
+
+class ProfileResolver:
+    # Resolves layered profiles. A profile names its parent layers in
+    # "inherits" (paths relative to the profile, merged in order) and holds
+    # only the values it overrides, section by section. Resolved views are
+    # memoized per file; when a layer changes on disk only the profiles that
+    # inherit from it, directly or not, are resolved again.
+    def __init__(self):
+        self.layers = {}  # path -> (stamp, raw profile)
+        self.resolved = {}
+        self.children = collections.defaultdict(set)
+        self.lock = threading.RLock()
+    
+    @staticmethod
+    def stamp(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    
+    @staticmethod
+    def parents(path, raw):
+        inherits = raw.get('inherits', [])
+        if isinstance(inherits, str):
+            inherits = [inherits]
+        return [os.path.abspath(os.path.join(os.path.dirname(path), parent)) for parent in inherits]
+    
+    @staticmethod
+    def merge(base, overlay):
+        merged = dict(base)
+        for section, values in overlay.items():
+            if section == 'inherits':
+                continue
+            if isinstance(values, dict) and isinstance(merged.get(section), dict):
+                merged[section] = dict(merged[section], **values)
+            else:
+                merged[section] = values
+        return merged
+    
+    def layer(self, path):
+        stamp = self.stamp(path)
+        cached = self.layers.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        with open(path, 'r') as f:
+            raw = json.load(f, object_hook=PackageSet.json_hook)
+        if cached:
+            for parent in self.parents(path, cached[1]):
+                self.children[parent].discard(path)
+        for parent in self.parents(path, raw):
+            self.children[parent].add(path)
+        self.layers[path] = (stamp, raw)
+        self.invalidate(path)
+        return raw
+    
+    def invalidate(self, path):
+        # Drops the resolved views of path and everything layered on it
+        pending = [os.path.abspath(path)]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            self.resolved.pop(current, None)
+            pending.extend(self.children.get(current, ()))
+    
+    def base(self, parents):
+        # Merged view of a list of parent layers
+        merged = {}
+        for parent in parents:
+            merged = self.merge(merged, self.resolve_cached(parent, ()))
+        return merged
+    
+    def resolve_cached(self, path, stack):
+        if path in stack:
+            raise ValueError("Profile inheritance cycle: " + " -> ".join(stack + (path,)))
+        raw = self.layer(path)
+        # Walk the ancestors first so a changed layer invalidates this view
+        parents = self.parents(path, raw)
+        bases = [self.resolve_cached(parent, stack + (path,)) for parent in parents]
+        if path not in self.resolved:
+            merged = {}
+            for base in bases:
+                merged = self.merge(merged, base)
+            self.resolved[path] = self.merge(merged, raw)
+        return self.resolved[path]
+    
+    def resolve(self, path):
+        # Returns a copy the caller may modify
+        with self.lock:
+            return copy.deepcopy(self.resolve_cached(os.path.abspath(path), ()))
+    
+    def inherits(self, path):
+        with self.lock:
+            path = os.path.abspath(path)
+            return self.parents(path, self.layer(path))
+    
+    def overlay(self, parents, config, path):
+        # Minimal profile for path that inherits parents and resolves to config
+        with self.lock:
+            base = self.base(parents)
+        profile = {}
+        if parents:
+            directory = os.path.dirname(os.path.abspath(path))
+            relative = []
+            for parent in parents:
+                try:
+                    relative.append(os.path.relpath(parent, directory).replace(os.sep, "/"))
+                except ValueError:
+                    relative.append(parent)  # Different drive
+            profile['inherits'] = relative
+        for section, values in config.items():
+            inherited = base.get(section)
+            if isinstance(values, dict) and isinstance(inherited, dict):
+                changed = {key: value for key, value in values.items() if inherited.get(key) != value}
+                if changed:
+                    profile[section] = changed
+            elif inherited != values:
+                profile[section] = values
+        return profile
+
+class Workspace:
+    # Registry of git worktrees built side by side, each with an optional
+    # profile (a saved configuration) layered over the GUI's configuration
+    def __init__(self, path=None):
+        self.path = path or os.path.join(STATE_DIR, "workspaces.json")
+        self.worktrees = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.worktrees = json.load(f).get('worktrees', [])
+    
+    def add(self, path, profile=""):
+        path = os.path.abspath(path)
+        if any(w['path'] == path for w in self.worktrees):
+            raise ValueError(f"{path} is already registered")
+        names = {w['name'] for w in self.worktrees}
+        name = base = os.path.basename(path) or path
+        suffix = 2
+        while name in names:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        worktree = {'name': name, 'path': path, 'profile': profile}
+        self.worktrees.append(worktree)
+        self.save()
+        return worktree
+    
+    def remove(self, name):
+        self.worktrees = [w for w in self.worktrees if w['name'] != name]
+        self.save()
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", 'w') as f:
+            json.dump({'worktrees': self.worktrees}, f, indent=4)
+        os.replace(self.path + ".tmp", self.path)
+    
+    @staticmethod
+    def branch(path):
+        try:
+            return subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=path,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    
+    @staticmethod
+    def profile_config(worktree, base, resolver=None):
+        # Profile sections override the matching sections of the base config
+        profile = {}
+        if worktree.get('profile'):
+            profile = (resolver or ProfileResolver()).resolve(worktree['profile'])
+        return {section: dict(values, **profile.get(section, {})) for section, values in base.items()}
+
+class SourceWatcher:
+    # Watches a source tree and puts one set of changed paths on `changes` per
+    # burst of edits, after `debounce` seconds without further events. Uses
+    # inotify on Linux and falls back to polling mtimes elsewhere.
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+    
+    def __init__(self, root, ignore=(), debounce=0.5, interval=1.0):
+        self.root = os.path.abspath(root)
+        self.ignore = {os.path.abspath(path) for path in ignore if path}
+        self.debounce = debounce
+        self.interval = interval
+        self.changes = queue.Queue()
+        self.stopped = False
+        self.mode = None
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stopped = True
+    
+    def ignored_dir(self, path):
+        name = os.path.basename(path)
+        return (name.startswith(".") or name.startswith("build-") or name == "__pycache__"
+                or path in self.ignore or os.path.islink(path))
+    
+    @staticmethod
+    def ignored_file(name):
+        # Editor swap and backup files
+        return name.startswith(".#") or name.endswith("~") or name.endswith(".swp")
+    
+    def run(self):
+        # ctypes.CDLL(None) raises TypeError on Windows, so only try inotify
+        # where it exists
+        if sys.platform.startswith('linux'):
+            try:
+                self.run_inotify()
+                return
+            except (OSError, AttributeError):
+                pass
+        self.run_polling()
+    
+    def settle(self, pending, deadline):
+        # Publish a finished burst; returns the new (pending, deadline)
+        if pending and time.monotonic() >= deadline:
+            self.changes.put(pending)
+            return set(), None
+        return pending, deadline
+    
+    def run_inotify(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(self.IN_NONBLOCK)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.mode = "inotify"
+        watches = {}
+        
+        def watch_tree(top):
+            for dirpath, dirnames, _ in os.walk(top):
+                dirnames[:] = [d for d in dirnames if not self.ignored_dir(os.path.join(dirpath, d))]
+                wd = libc.inotify_add_watch(fd, os.fsencode(dirpath), self.WATCH_MASK)
+                if wd >= 0:
+                    watches[wd] = dirpath
+        
+        try:
+            watch_tree(self.root)
+            pending, deadline = set(), None
+            while not self.stopped:
+                timeout = max(0.0, deadline - time.monotonic()) if deadline else 0.5
+                ready, _, _ = select.select([fd], [], [], min(timeout, 0.5))
+                if ready:
+                    try:
+                        data = os.read(fd, 65536)
+                    except BlockingIOError:
+                        data = b""
+                    offset = 0
+                    while offset < len(data):
+                        wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                        offset += self.EVENT.size
+                        name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                        offset += length
+                        if mask & self.IN_IGNORED:
+                            watches.pop(wd, None)
+                            continue
+                        if mask & self.IN_Q_OVERFLOW:
+                            pending.add(self.root)
+                        elif wd in watches:
+                            path = os.path.join(watches[wd], name)
+                            if mask & self.IN_ISDIR:
+                                if self.ignored_dir(path):
+                                    continue
+                                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                                    watch_tree(path)
+                            elif self.ignored_file(name):
+                                continue
+                            pending.add(path)
+                        deadline = time.monotonic() + self.debounce
+                pending, deadline = self.settle(pending, deadline)
+        finally:
+            os.close(fd)
+    
+    def snapshot(self):
+        state = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not self.ignored_dir(os.path.join(dirpath, d))]
+            for name in filenames:
+                if self.ignored_file(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+    
+    def run_polling(self):
+        self.mode = "polling"
+        previous = self.snapshot()
+        pending, deadline = set(), None
+        while not self.stopped:
+            time.sleep(min(self.interval, self.debounce))
+            current = self.snapshot()
+            changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+            previous = current
+            if changed:
+                pending |= changed
+                deadline = time.monotonic() + self.debounce
+            pending, deadline = self.settle(pending, deadline)
+
+class TraceRecorder:
+    # Collects spans on named lanes for a Chrome trace (chrome://tracing,
+    # Perfetto) and gauges for an OpenMetrics text file that a node exporter
+    # textfile collector can scrape. One recorder covers one operation.
+    METRICS = {
+        'autobuild_run_duration_seconds': "Wall time of the whole operation",
+        'autobuild_last_run_timestamp_seconds': "When the operation finished",
+        'autobuild_step_duration_seconds': "Wall time of each pipeline step",
+        'autobuild_step_exit_status': "Exit status of each pipeline step",
+        'autobuild_downloaded_bytes': "Bytes transferred by downloads",
+        'autobuild_downloaded_files': "Files downloaded",
+        'autobuild_download_failures': "Downloads that failed",
+        'autobuild_extracted_bytes': "Bytes written while extracting archives",
+        'autobuild_extracted_files': "Files written while extracting archives",
+        'autobuild_compiler_cache_hits': "Compiler cache hits",
+        'autobuild_compiler_cache_misses': "Compiler cache misses",
+        'autobuild_compiler_cache_hit_ratio': "Compiler cache hits per lookup",
+        'autobuild_artifact_cache_hit': "1 when the packaged archive came from the artifact cache",
+    }
+    KEEP_TRACES = 50
+    
+    def __init__(self, operation):
+        self.operation = operation
+        self.origin = time.time()
+        self.lock = threading.Lock()
+        self.events = []
+        self.lanes = {}
+        self.values = {}
+    
+    def lane(self, name):
+        # Lanes become threads of one process in the trace viewer
+        with self.lock:
+            if name not in self.lanes:
+                self.lanes[name] = len(self.lanes) + 1
+                self.events.append({'name': "thread_name", 'ph': "M", 'pid': 1, 'tid': self.lanes[name],
+                                    'args': {'name': name}})
+            return self.lanes[name]
+    
+    def add(self, name, lane, start, end, category, args=None):
+        tid = self.lane(lane)
+        with self.lock:
+            self.events.append({'name': name, 'cat': category, 'ph': "X", 'pid': 1, 'tid': tid,
+                                'ts': int((start - self.origin) * 1e6), 'dur': int(max(0, end - start) * 1e6),
+                                'args': args or {}})
+    
+    def set(self, metric, value, **labels):
+        with self.lock:
+            self.values[(metric, tuple(sorted(labels.items())))] = value
+    
+    def collect_runner(self, runner, lane):
+        for step, status, duration in runner.results:
+            self.set('autobuild_step_duration_seconds', duration, lane=lane, step=step)
+            self.set('autobuild_step_exit_status', status, lane=lane, step=step)
+        for hook in runner.hooks:
+            if isinstance(hook, CompilerCache):
+                hits, misses = hook.totals
+                self.set('autobuild_compiler_cache_hits', hits, lane=lane, tool=hook.tool)
+                self.set('autobuild_compiler_cache_misses', misses, lane=lane, tool=hook.tool)
+                if hits + misses:
+                    self.set('autobuild_compiler_cache_hit_ratio', hits / (hits + misses), lane=lane, tool=hook.tool)
+            elif isinstance(hook, ArtifactCache) and hook.key:
+                self.set('autobuild_artifact_cache_hit', int(hook.hit), lane=lane)
+    
+    @staticmethod
+    def label_value(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    
+    def openmetrics(self):
+        lines = []
+        by_metric = collections.defaultdict(list)
+        for (metric, labels), value in sorted(self.values.items()):
+            by_metric[metric].append((labels, value))
+        for metric, samples in by_metric.items():
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"# HELP {metric} {self.METRICS.get(metric, metric)}")
+            for labels, value in samples:
+                pairs = [('operation', self.operation)] + list(labels)
+                rendered = ",".join(f'{key}="{self.label_value(val)}"' for key, val in pairs)
+                lines.append(f"{metric}{{{rendered}}} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, trace_dir, metrics_dir):
+        # Returns (trace file, metrics file)
+        finished = time.time()
+        self.set('autobuild_run_duration_seconds', finished - self.origin)
+        self.set('autobuild_last_run_timestamp_seconds', finished)
+        os.makedirs(trace_dir, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.origin).strftime("%Y%m%d-%H%M%S")
+        trace_file = os.path.join(trace_dir, f"{self.operation}-{stamp}.json")
+        with self.lock:
+            trace = {'traceEvents': list(self.events), 'displayTimeUnit': "ms",
+                     'otherData': {'operation': self.operation, 'host': socket.gethostname(),
+                                   'started': datetime.fromtimestamp(self.origin).isoformat()}}
+        with open(trace_file, 'w') as f:
+            json.dump(trace, f)
+        traces = sorted((os.path.join(trace_dir, name) for name in os.listdir(trace_dir) if name.endswith(".json")),
+                        key=os.path.getmtime)
+        for path in traces[:-self.KEEP_TRACES]:
+            os.remove(path)
+        
+        # Collectors read whole files, so replace atomically
+        os.makedirs(metrics_dir, exist_ok=True)
+        metrics_file = os.path.join(metrics_dir, f"autobuild_{self.operation}.prom")
+        with open(metrics_file + ".tmp", 'w') as f:
+            f.write(self.openmetrics())
+        os.replace(metrics_file + ".tmp", metrics_file)
+        return trace_file, metrics_file
+
+class StepTracer:
+    # Runner hook that puts every executed step on its own lane of a trace
+    def __init__(self, recorder, lane):
+        self.recorder = recorder
+        self.lane = lane
+        self.started = None
+    
+    def before_step(self, runner, step):
+        self.started = time.time()
+    
+    def after_step(self, runner, step, status, duration, run_id):
+        self.recorder.add(step, self.lane, self.started, time.time(), "step",
+                          {'status': status, 'command': runner.steps[runner.current][1]})
+
+class PipelineRunner:
+    # Runs (step, command) pairs in order on a worker thread, streams their output
+    # and records every step in the build history
+    def __init__(self, steps, fingerprints, history, cwd=None, env=None, governor=None, hooks=None, warm=None,
+                 preflight=None, checkpoint=None):
+        self.steps = steps
+        self.fingerprints = fingerprints
+        self.history = history
+        self.cwd = cwd or None
+        self.env = env
+        self.governor = governor
+        # Objects with before_step(runner, step) and
+        # after_step(runner, step, status, duration, run_id) methods;
+        # a true result from before_step skips the step
+        self.hooks = hooks or []
+        self.warm = warm
+        self.preflight = preflight
+        self.preflight_errors = []
+        self.checkpoint = checkpoint
+        self.host = socket.gethostname()
+        self.estimates = [history.estimate(step, fingerprints.get(step), self.host) for step, _ in steps]
+        self.waiting = False
+        self.output = queue.Queue()
+        self.results = []
+        self.current = None
+        self.step_started = None
+        self.process = None
+        self.cancelled = False
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+    
+    def run(self):
+        if self.preflight and not self.run_preflight():
+            return
+        for idx, (step, command) in enumerate(self.steps):
+            if self.cancelled:
+                break
+            self.current = idx
+            status = self.run_step(step, command)
+            if self.checkpoint:
+                self.checkpoint.record(step, self.fingerprints.get(step), command, status)
+            if status != 0:
+                break
+        self.current = None
+    
+    def run_preflight(self):
+        self.output.put("Preflight...\n")
+        try:
+            findings = self.preflight.run()
+        except Exception as e:
+            findings = [('error', None, f"Preflight failed: {e}")]
+        for level, step, message in findings:
+            self.output.put(f"{level.upper()}: {step or 'general'}: {message}\n")
+        self.preflight_errors = [f for f in findings if f[0] == 'error']
+        if self.preflight_errors:
+            self.output.put(f"Preflight found {len(self.preflight_errors)} errors; nothing was run\n")
+            return False
+        return True
+    
+    def run_step(self, step, command):
+        # Hooks run before admission so a skipped step never holds a governor job
+        if any([hook.before_step(self, step) for hook in self.hooks]):
+            # A hook already produced this step's result (e.g. from a cache)
+            self.results.append((step, 0, 0.0))
+            self.output.put(f"= {step} skipped\n")
+            return 0
+        
+        job = None
+        if self.governor:
+            self.waiting = True
+            estimate = self.history.estimate_memory(step, self.fingerprints.get(step), self.host)
+            job = self.governor.admit(step, estimate, cancelled=lambda: self.cancelled)
+            self.waiting = False
+            if job is None:
+                return -1
+        started = time.time()
+        self.step_started = time.monotonic()
+        self.output.put(f"> {command}\n")
+        peak_rss = None
+        try:
+            self.process = self.launch(command)
+            if job:
+                self.governor.attach(job, self.process.pid)
+            for line in self.process.stdout:
+                self.output.put(line)
+            status = self.process.wait()
+        except OSError as e:
+            self.output.put(f"{e}\n")
+            status = -1
+        finally:
+            if job:
+                peak_rss = self.governor.release(job)
+        duration = time.monotonic() - self.step_started
+        run_id = self.history.record(step, self.fingerprints.get(step), self.host, started, duration, status, command, peak_rss)
+        self.results.append((step, status, duration))
+        self.output.put(f"< {step} exited with status {status} after {format_duration(duration)}\n")
+        for hook in self.hooks:
+            hook.after_step(self, step, status, duration, run_id)
+        return status
+    
+    def launch(self, command):
+        argv = WarmAutobuild.argv(command) if self.warm else None
+        if argv is not None:
+            return self.warm.spawn(argv, self.cwd, self.env)
+        # A new session lets cancel() signal the whole process tree
+        return subprocess.Popen(
+            command, shell=True, cwd=self.cwd, env=self.env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace',
+            start_new_session=os.name != 'nt'
+        )
+    
+    def cancel(self):
+        self.cancelled = True
+        process = self.process
+        if process and process.poll() is None:
+            if os.name == 'nt':
+                process.terminate()
+                return
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+                # Wake the group in case the governor paused it
+                os.killpg(process.pid, signal.SIGCONT)
+            except OSError:
+                pass
+    
+    def progress(self):
+        # Returns (fraction done, seconds remaining); the ETA is None until
+        # every step has history
+        if not self.steps:
+            return 1.0, 0
+        done = len(self.results)
+        if done >= len(self.steps) or None in self.estimates[done:]:
+            return done / len(self.steps), None
+        elapsed = time.monotonic() - self.step_started if self.current is not None else 0
+        current = self.estimates[done]
+        total = sum(self.estimates)
+        spent = sum(e for e in self.estimates[:done] if e) + min(elapsed, current)
+        remaining = max(0, current - elapsed) + sum(self.estimates[done + 1:])
+        return (spent / total if total else 0), remaining
+
+class ScriptServer:
+    # Long-running service that renders scripts for other tools. Speaks
+    # HTTP/1.1 with keep-alive on localhost or a Unix socket:
+    #   POST /render {"format": "sh", "config": {...}} or {"profile": "name"}
+    #   GET /render?profile=name&format=ninja
+    #   GET /stats
+    # Rendered scripts are cached by the hash of the resolved configuration
+    # plus, for delta installs, the size and mtime of autobuild.xml and the
+    # installed manifest the plan is read from. A cached script keeps the
+    # "Generated on" time of its first render.
+    FORMATS = {'bat': 'render_batch', 'sh': 'render_shell', 'ninja': 'render_ninja'}
+    
+    def __init__(self, profile_dir, cache_size=1024):
+        self.profile_dir = os.path.abspath(profile_dir)
+        self.profiles = ProfileResolver()
+        self.cache = collections.OrderedDict()
+        self.cache_size = cache_size
+        self.inflight = {}
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'errors': 0}
+    
+    @staticmethod
+    def complete(config):
+        # Sections and options the client left out read as empty
+        sections = collections.defaultdict(lambda: collections.defaultdict(str))
+        for section, values in config.items():
+            sections[section] = collections.defaultdict(str, values) if isinstance(values, dict) else values
+        return sections
+    
+    @staticmethod
+    def inputs(commands):
+        # Files on disk that the rendered script depends on
+        if not commands.config['install'].get('delta'):
+            return []
+        try:
+            planner = commands.install_planner()
+        except ValueError:
+            return []
+        state = []
+        for path in (planner.config_file, planner.installed_file):
+            try:
+                st = os.stat(path)
+                state.append([path, st.st_size, st.st_mtime_ns])
+            except OSError:
+                state.append([path, None, None])
+        return state
+    
+    def profile_path(self, name):
+        if not re.match(r'^[\w.-]+$', name) or name.startswith("."):
+            raise ValueError(f"Invalid profile name {name!r}")
+        return os.path.join(self.profile_dir, name if name.endswith(".json") else name + ".json")
+    
+    async def render(self, request):
+        kind = request.get('format', 'bat')
+        if kind not in self.FORMATS:
+            raise ValueError(f"Unknown format {kind!r}; expected one of {', '.join(self.FORMATS)}")
+        config = request.get('config')
+        if config is None:
+            if not request.get('profile'):
+                raise ValueError("Pass a config or a profile")
+            config = await asyncio.to_thread(self.profiles.resolve, self.profile_path(request['profile']))
+        if not isinstance(config, dict):
+            raise ValueError("config must be an object")
+        commands = AutobuildCommands(self.complete(config))
+        inputs = await asyncio.to_thread(self.inputs, commands)
+        digest = hashlib.sha256(json.dumps([config, inputs], sort_keys=True).encode('utf-8')).hexdigest()
+        key = (digest, kind)
+        if key in self.cache:
+            self.stats['hits'] += 1
+            self.cache.move_to_end(key)
+            return digest, self.cache[key]
+        # Concurrent requests for the same script share one render
+        if key not in self.inflight:
+            self.stats['misses'] += 1
+            self.inflight[key] = asyncio.ensure_future(asyncio.to_thread(getattr(commands, self.FORMATS[kind])))
+        else:
+            self.stats['hits'] += 1
+        future = self.inflight[key]
+        try:
+            script = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.inflight.pop(key, None)
+        self.cache[key] = script
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return digest, script
+    
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, content_type, payload, extra = await self.respond(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != "close" and version.strip() == "HTTP/1.1"
+                head = [f"HTTP/1.1 {status}", f"Content-Type: {content_type}", f"Content-Length: {len(payload)}",
+                        "Connection: " + ("keep-alive" if keep_alive else "close")]
+                head.extend(f"{name}: {value}" for name, value in extra.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def respond(self, method, target, body):
+        self.stats['requests'] += 1
+        url = urlsplit(target)
+        if url.path == "/stats" and method == "GET":
+            stats = dict(self.stats, cached=len(self.cache))
+            return "200 OK", "application/json", json.dumps(stats).encode('utf-8'), {}
+        if url.path != "/render" or method not in ("GET", "POST"):
+            return "404 Not Found", "text/plain", b"Not found\n", {}
+        try:
+            if method == "POST":
+                request = json.loads(body or b"{}", object_hook=PackageSet.json_hook)
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+            else:
+                request = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            digest, script = await self.render(request)
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+            self.stats['errors'] += 1
+            return "400 Bad Request", "text/plain", f"{e}\n".encode('utf-8'), {}
+        return "200 OK", "text/plain; charset=utf-8", script.encode('utf-8'), {'X-Config-Hash': digest}
+    
+    async def serve(self, host="127.0.0.1", port=8765, socket_path=None):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+class LagMonitor:
+    # Times every Tcl-to-Python callback (commands, bindings, after() timers)
+    # by replacing tkinter.CallWrapper, and logs any that blocks the event
+    # loop for longer than the threshold. Time spent in nested event loops
+    # (modal dialogs, wait_window/wait_variable, callbacks run by update())
+    # is not charged to the callback that entered them.
+    MODAL_CALLS = ((commondialog.Dialog, 'show'), (tk.Misc, 'wait_window'),
+                   (tk.Misc, 'wait_variable'), (tk.Misc, 'wait_visibility'), (tk.Misc, 'update'))
+    
+    def __init__(self, threshold=0.05):
+        self.threshold = threshold
+        self.events = collections.deque(maxlen=200)
+        # Seconds spent in nested loops, one entry per active callback or modal call
+        self.nested = []
+    
+    @classmethod
+    def install(cls, threshold=0.05):
+        # Affects callbacks registered after this call
+        if isinstance(tk.CallWrapper, type) and issubclass(tk.CallWrapper, LagMonitor.Wrapper):
+            return tk.CallWrapper.monitor
+        monitor = cls(threshold)
+        tk.CallWrapper = type("CallWrapper", (cls.Wrapper,), {'monitor': monitor})
+        for owner, name in cls.MODAL_CALLS:
+            setattr(owner, name, monitor.modal(getattr(owner, name)))
+        return monitor
+    
+    def timed(self, call, func=None):
+        # Runs call(); logs its own time when func is given
+        self.nested.append(0.0)
+        started = time.perf_counter()
+        try:
+            return call()
+        finally:
+            elapsed = time.perf_counter() - started
+            own = elapsed - self.nested.pop()
+            if self.nested:
+                self.nested[-1] += elapsed
+            if func is not None and own > self.threshold:
+                self.log(func, own)
+    
+    def modal(self, method):
+        def wrapper(*args, **kwargs):
+            return self.timed(lambda: method(*args, **kwargs))
+        wrapper.__wrapped__ = method
+        return wrapper
+    
+    class Wrapper(tk.CallWrapper):
+        monitor = None
+        
+        def __call__(self, *args):
+            return self.monitor.timed(lambda: super(LagMonitor.Wrapper, self).__call__(*args), self.func)
+    
+    def log(self, func, elapsed):
+        # after() wraps its callback in a local callit(); report the callback
+        if getattr(func, '__name__', None) == "callit" and func.__closure__:
+            func = next((cell.cell_contents for cell in func.__closure__ if callable(cell.cell_contents)), func)
+        name = getattr(func, '__qualname__', None) or repr(func)
+        self.events.append((time.time(), name, elapsed))
+        sys.stderr.write(f"UI blocked for {elapsed * 1000:.0f} ms in {name}\n")
+
+class AutobuildGUI(AutobuildCommands):
+    DEFAULT_PIPELINE_STEPS = ['build', 'configure', 'install', 'package', 'upload']
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Autobuild Configuration Tool for Second Life Viewer")
@@ -14,8 +4083,30 @@ class AutobuildGUI:
         self.config = {
             'build': {}, 'configure': {}, 'edit': {}, 'install': {}, 
             'installables': {}, 'manifest': {}, 'package': {}, 
-            'print': {}, 'source_environment': {}, 'uninstall': {}, 'upload': {}
+            'print': {}, 'source_environment': {}, 'uninstall': {}, 'upload': {},
+            'pipeline': {}
         }
+        self.history = None
+        self.pipeline_runner = None
+        self.pipeline_poll = None
+        self.governor = None
+        self.governor_seen = 0
+        self.scheduler = JobScheduler()
+        self.io_jobs = JobScheduler(slots=4)
+        self.lag_monitor = LagMonitor.install()
+        self.warm_autobuild = None
+        self.workspace = None
+        self.profiles = ProfileResolver()
+        self.profile_parents = []
+        self.worktree_runners = {}
+        self.worktree_window = None
+        self.calibrator = None
+        self.cpu_counts = {}
+        self.watcher = None
+        self.watch_runner = None
+        self.pipeline_trace = None
+        self.worktree_trace = None
+        self.watch_pending = None
         
         # Create main container
         self.main_container = ttk.Frame(root)
@@ -37,6 +4128,7 @@ class AutobuildGUI:
         self.create_source_environment_tab()
         self.create_uninstall_tab()
         self.create_upload_tab()
+        self.create_pipeline_tab()
         
         # Create bottom panel for batch generation
         self.create_bottom_panel()
@@ -107,6 +4199,49 @@ class AutobuildGUI:
         ttk.Label(cmd_frame, text="Additional Options:").grid(row=5, column=0, sticky=tk.W, padx=5)
         self.build_additional_options = ttk.Entry(cmd_frame, width=40)
         self.build_additional_options.grid(row=5, column=1, sticky=tk.W, padx=5)
+        
+        # Compiler cache
+        cache_frame = ttk.LabelFrame(tab, text="Compiler Cache")
+        cache_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(cache_frame, text="Cache Tool:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.build_compiler_cache = ttk.Combobox(cache_frame, values=["", "ccache", "sccache"])
+        self.build_compiler_cache.grid(row=0, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(cache_frame, text="Cache Directory:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.build_cache_dir = ttk.Entry(cache_frame, width=40)
+        self.build_cache_dir.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cache_frame, text="Browse...", command=lambda: self.browse_directory(self.build_cache_dir)).grid(row=1, column=2, padx=5)
+        
+        ttk.Label(cache_frame, text="Max Size (e.g. 20G):").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.build_cache_size = ttk.Entry(cache_frame, width=10)
+        self.build_cache_size.grid(row=2, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Button(cache_frame, text="Cache Report...", command=self.show_cache_report).grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+    
+    def show_cache_report(self):
+        try:
+            rows = self.build_history().cache_report()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read cache statistics: {str(e)}")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Compiler Cache Report")
+        columns = ("configuration", "step", "tool", "builds", "hits", "misses", "hit_rate", "average", "saved")
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column.replace('_', ' ').title())
+            tree.column(column, width=90)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        for step, label, tool, builds, hits, misses, average in rows:
+            total = hits + misses
+            baseline = self.history.cold_cache_baseline(step, tool, label)
+            saved = format_duration(max(0, baseline - average) * builds) if baseline else "n/a"
+            tree.insert("", tk.END, values=(
+                label, step, tool, builds, hits, misses,
+                f"{100.0 * hits / total:.1f}%" if total else "-", format_duration(average), saved))
     
     def create_configure_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -299,6 +4434,10 @@ class AutobuildGUI:
         self.install_platform = ttk.Combobox(cmd_frame, values=["windows", "linux", "darwin"])
         self.install_platform.grid(row=7, column=1, sticky=tk.W, padx=5)
         
+        self.install_delta = tk.BooleanVar()
+        ttk.Checkbutton(cmd_frame, text="Delta install (only packages changed since the last install)", variable=self.install_delta).grid(row=8, column=0, columnspan=2, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Show Plan", command=self.show_install_plan).grid(row=8, column=2, padx=5)
+        
         # Packages to install
         pkg_frame = ttk.LabelFrame(tab, text="Packages to Install")
         pkg_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -324,10 +4463,246 @@ class AutobuildGUI:
         
         ttk.Button(btn_frame, text="Add", command=self.add_package).pack(fill=tk.X, pady=2)
         ttk.Button(btn_frame, text="Remove", command=self.remove_package).pack(fill=tk.X, pady=2)
+        
+        # Shared archive store
+        store_frame = ttk.LabelFrame(tab, text="Shared Archive Store")
+        store_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(store_frame, text="Store Directory:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.install_store_dir = ttk.Entry(store_frame, width=40)
+        self.install_store_dir.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(store_frame, text="Browse...", command=lambda: self.browse_directory(self.install_store_dir)).grid(row=0, column=2, padx=5)
+        ttk.Button(store_frame, text="Install from Store", command=self.install_from_store).grid(row=0, column=3, padx=5)
+        
+        ttk.Label(store_frame, text="Extract Jobs:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.install_extract_jobs = ttk.Spinbox(store_frame, from_=1, to=128, width=5)
+        self.install_extract_jobs.grid(row=1, column=1, sticky=tk.W, padx=5)
+        self.install_extract_jobs.set(os.cpu_count() or 1)
+        
+        ttk.Button(store_frame, text="List Contents", command=self.list_archive_contents).grid(row=1, column=2, padx=5)
+        ttk.Button(store_frame, text="Extract Licenses...", command=self.extract_licenses).grid(row=1, column=3, padx=5)
+        
+        self.install_store_status = ttk.Label(store_frame, text="")
+        self.install_store_status.grid(row=2, column=0, columnspan=4, sticky=tk.W, padx=5)
+        
+        # Snapshots per configuration
+        snapshot_frame = ttk.LabelFrame(tab, text="Install Snapshots")
+        snapshot_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.install_snapshots = tk.BooleanVar()
+        ttk.Checkbutton(snapshot_frame, text="Keep one install directory per platform/configuration/address size",
+                        variable=self.install_snapshots).grid(row=0, column=0, columnspan=4, sticky=tk.W, padx=5)
+        
+        ttk.Label(snapshot_frame, text="Snapshot:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.install_snapshot_combo = ttk.Combobox(snapshot_frame, width=30, postcommand=self.refresh_snapshots)
+        self.install_snapshot_combo.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(snapshot_frame, text="Switch", command=self.switch_snapshot).grid(row=1, column=2, padx=5)
+        ttk.Button(snapshot_frame, text="Delete", command=self.delete_snapshot).grid(row=1, column=3, padx=5)
+        
+        self.install_snapshot_status = ttk.Label(snapshot_frame, text="")
+        self.install_snapshot_status.grid(row=2, column=0, columnspan=4, sticky=tk.W, padx=5)
+    
+    def show_install_plan(self):
+        self.collect_config_data()
+        try:
+            plan = self.install_plan()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to plan install: {str(e)}")
+            return
+        self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(tk.END, "\n".join(InstallPlanner.describe(plan)) + "\n")
+    
+    def load_archive_indexes(self):
+        # Index of the cached archive for every package in the list, built
+        # concurrently where a sidecar is missing or stale
+        cache_dir = self.config['installables']['download_dir']
+        if not cache_dir:
+            raise ValueError("Set the download directory first.")
+        found = {}
+        missing = []
+        for package in self.config['install']['packages']:
+            archive = ArchiveStore.find_archive(cache_dir, package)
+            if archive:
+                found[package] = archive
+            else:
+                missing.append(package)
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            indexes = dict(zip(found, pool.map(ArchiveIndex.load, found.values())))
+        return indexes, missing
+    
+    def list_archive_contents(self):
+        self.collect_config_data()
+        
+        def done(result, error):
+            if error:
+                messagebox.showerror("Error", f"Failed to list archives: {str(error)}")
+                return
+            indexes, missing = result
+            lines = []
+            for package, index in indexes.items():
+                members = index.members()
+                files = [m for m in members if m['type'] == "file"]
+                lines.append(f"{package}: {os.path.basename(index.archive)} - {len(files)} files, "
+                             f"{format_bytes(sum(m['size'] for m in files))}")
+                lines.extend(f"    {m['name']}" + (f" -> {m['target']}" if 'target' in m else "") for m in members)
+            lines.extend(f"{package}: no cached archive" for package in missing)
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.install_store_status.config(text=f"Listed {len(indexes)} archives")
+        
+        self.install_store_status.config(text="Indexing archives...")
+        self.run_in_background(self.load_archive_indexes, done, priority='interactive')
+    
+    def extract_licenses(self):
+        self.collect_config_data()
+        dest = filedialog.askdirectory(title="Write licenses to")
+        if not dest:
+            return
+        
+        def work():
+            indexes, missing = self.load_archive_indexes()
+            written = {}
+            for package, index in indexes.items():
+                for name, text in index.licenses().items():
+                    # Keep the member's path: LICENSES/a/LICENSE and
+                    # LICENSES/b/LICENSE must not overwrite each other
+                    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+                    target = os.path.join(dest, package, *parts)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with open(target, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    written.setdefault(package, []).append("/".join(parts))
+            return written, missing
+        
+        def done(result, error):
+            if error:
+                messagebox.showerror("Error", f"Failed to extract licenses: {str(error)}")
+                return
+            written, missing = result
+            lines = [f"{package}: {', '.join(names)}" for package, names in sorted(written.items())]
+            lines.extend(f"{package}: no cached archive" for package in missing)
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.install_store_status.config(text=f"Wrote licenses of {len(written)} packages to {dest}")
+        
+        self.install_store_status.config(text="Extracting licenses...")
+        self.run_in_background(work, done)
+    
+    def install_snapshot_manager(self):
+        install_dir = self.config['install']['install_dir']
+        if not install_dir:
+            raise ValueError("Set the install directory first.")
+        return InstallSnapshots(os.path.join(self.config['pipeline']['workdir'], install_dir))
+    
+    def build_snapshot_label(self):
+        return InstallSnapshots.label(self.config['install']['platform'], self.config['build']['configuration'],
+                                      self.config['build']['address_size'])
+    
+    def refresh_snapshots(self):
+        self.collect_config_data()
+        try:
+            snapshots = self.install_snapshot_manager()
+        except ValueError:
+            return
+        labels = snapshots.snapshots()
+        current = self.build_snapshot_label()
+        if current not in labels:
+            labels.append(current)
+        self.install_snapshot_combo['values'] = labels
+        self.install_snapshot_status.config(text=f"Active: {snapshots.active() or 'none'}")
+    
+    def switch_snapshot(self, label=None):
+        # Returns True when install_dir points at the snapshot afterwards
+        self.collect_config_data()
+        try:
+            snapshots = self.install_snapshot_manager()
+            label = label or self.install_snapshot_combo.get() or self.build_snapshot_label()
+            if snapshots.active() == label:
+                return True
+            created, adopted = snapshots.switch(label)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to switch install snapshot: {str(e)}")
+            return False
+        status = f"Active: {label}" + (" (new, empty - run install)" if created else "")
+        if adopted:
+            status += f"; previous install directory kept as {os.path.basename(adopted)}"
+        self.install_snapshot_status.config(text=status)
+        return True
+    
+    def delete_snapshot(self):
+        self.collect_config_data()
+        label = self.install_snapshot_combo.get()
+        if not label or not messagebox.askyesno("Delete Snapshot", f"Delete install snapshot {label}?"):
+            return
+        try:
+            self.install_snapshot_manager().remove(label)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to delete install snapshot: {str(e)}")
+            return
+        self.install_snapshot_combo.set("")
+        self.refresh_snapshots()
+    
+    def install_from_store(self):
+        self.collect_config_data()
+        store_dir = self.config['install']['store_dir']
+        install_dir = self.config['install']['install_dir']
+        cache_dir = self.config['installables']['download_dir']
+        packages = self.config['install']['packages']
+        if not store_dir or not install_dir or not cache_dir:
+            messagebox.showerror("Error", "Set the store directory, install directory and download directory first.")
+            return
+        
+        extract_jobs = self.config['install']['extract_jobs']
+        tracer = self.trace_recorder("install")
+        
+        def work():
+            store = ArchiveStore(store_dir)
+            found = {}
+            missing = []
+            for package in packages:
+                archive = ArchiveStore.find_archive(cache_dir, package)
+                if archive:
+                    found[package] = archive
+                else:
+                    missing.append(package)
+            timings = store.prepare(list(found.values()), max_workers=extract_jobs)
+            methods = {}
+            for package, archive in found.items():
+                started = time.time()
+                for method, count in store.install(package, archive, install_dir).items():
+                    methods[method] = methods.get(method, 0) + count
+                if tracer:
+                    tracer.add(package, "link", started, time.time(), "install", {'archive': archive})
+            return methods, missing, timings
+        
+        def done(result, error):
+            if error:
+                self.install_store_status.config(text="")
+                messagebox.showerror("Error", f"Failed to install from store: {str(error)}")
+                return
+            methods, missing, timings = result
+            if timings:
+                self.preview_text.delete(1.0, tk.END)
+                self.preview_text.insert(tk.END, ParallelExtractor.format_timings(timings))
+            summary = ", ".join(f"{count} {method}" for method, count in sorted(methods.items())) or "nothing installed"
+            self.install_store_status.config(text=f"Installed: {summary}")
+            if tracer:
+                for timing in timings:
+                    if timing.get('started'):
+                        tracer.add(os.path.basename(timing['archive']), f"extract {timing['worker']}", timing['started'],
+                                   timing['started'] + timing['seconds'], "extract", {'bytes': timing['bytes']})
+                tracer.set('autobuild_extracted_bytes', sum(t['bytes'] for t in timings))
+                tracer.set('autobuild_extracted_files', sum(t['files'] for t in timings))
+                self.write_trace(tracer)
+            if missing:
+                messagebox.showwarning("Warning", "No cached archive found for: " + ", ".join(missing))
+        
+        self.install_store_status.config(text="Installing...")
+        self.run_in_background(work, done)
     
     def add_package(self):
         new_pkg = simpledialog.askstring("Add Package", "Enter package name:")
-        if new_pkg:
+        if new_pkg and new_pkg not in self.packages_listbox.get(0, tk.END):
             self.packages_listbox.insert(tk.END, new_pkg)
     
     def remove_package(self):
@@ -402,6 +4777,105 @@ class AutobuildGUI:
         self.installables_archive = ttk.Entry(pkg_frame, width=40)
         self.installables_archive.grid(row=5, column=1, sticky=tk.W, padx=5, pady=2)
         ttk.Button(pkg_frame, text="Browse...", command=lambda: self.browse_file(self.installables_archive)).grid(row=5, column=2, padx=5, pady=2)
+        
+        # Download manager
+        dl_frame = ttk.LabelFrame(tab, text="Download Manager")
+        dl_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        ttk.Label(dl_frame, text="Download Directory:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
+        self.installables_download_dir = ttk.Entry(dl_frame, width=40)
+        self.installables_download_dir.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        self.installables_download_dir.insert(0, os.environ.get('AUTOBUILD_INSTALLABLE_CACHE', ''))
+        ttk.Button(dl_frame, text="Browse...", command=lambda: self.browse_directory(self.installables_download_dir)).grid(row=0, column=2, padx=5, pady=2)
+        
+        ttk.Label(dl_frame, text="Parallel Downloads:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
+        self.installables_download_jobs = ttk.Spinbox(dl_frame, from_=1, to=16, width=5)
+        self.installables_download_jobs.grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        self.installables_download_jobs.set(4)
+        
+        self.downloads_listbox = tk.Listbox(dl_frame, selectmode=tk.MULTIPLE, height=5)
+        self.downloads_listbox.grid(row=2, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=2)
+        self.download_queue = []
+        
+        dl_btn_frame = ttk.Frame(dl_frame)
+        dl_btn_frame.grid(row=2, column=3, sticky=tk.N, padx=5, pady=2)
+        ttk.Button(dl_btn_frame, text="Add Current", command=self.add_download).pack(fill=tk.X, pady=2)
+        ttk.Button(dl_btn_frame, text="Remove", command=self.remove_download).pack(fill=tk.X, pady=2)
+        ttk.Button(dl_btn_frame, text="Download All", command=self.start_downloads).pack(fill=tk.X, pady=2)
+        
+        self.download_status = ttk.Label(dl_frame, text="Idle")
+        self.download_status.grid(row=3, column=0, columnspan=4, sticky=tk.W, padx=5, pady=2)
+        self.download_thread = None
+    
+    def add_download(self):
+        url = self.installables_url.get().strip()
+        if not url:
+            messagebox.showerror("Error", "Enter a package URL to queue a download.")
+            return
+        self.download_queue.append({
+            'url': url,
+            'hash': self.installables_hash.get().strip(),
+            'hash_alg': self.installables_hash_alg.get(),
+            'creds': self.installables_creds.get()
+        })
+        self.downloads_listbox.insert(tk.END, url)
+    
+    def remove_download(self):
+        selected = self.downloads_listbox.curselection()
+        for idx in reversed(selected):
+            self.downloads_listbox.delete(idx)
+            del self.download_queue[idx]
+    
+    def start_downloads(self):
+        if self.download_thread and self.download_thread.is_alive():
+            return
+        dest_dir = self.installables_download_dir.get().strip()
+        if not dest_dir:
+            messagebox.showerror("Error", "Select a download directory first.")
+            return
+        if not self.download_queue:
+            messagebox.showerror("Error", "No downloads queued.")
+            return
+        
+        self.download_trace = self.trace_recorder("downloads")
+        self.download_manager = DownloadManager(dest_dir, self.installables_download_jobs.get(), self.download_trace)
+        self.download_results = []
+        items = list(self.download_queue)
+        
+        def run():
+            self.download_results = self.download_manager.download_all(items)
+        
+        self.download_thread = threading.Thread(target=run, daemon=True)
+        self.download_thread.start()
+        self.download_sample = (0.0, 0)
+        self.poll_downloads()
+    
+    def poll_downloads(self):
+        stats = self.download_manager.stats()
+        last_elapsed, last_bytes = self.download_sample
+        interval = stats['elapsed'] - last_elapsed
+        rate = (stats['bytes_done'] - last_bytes) / interval if interval > 0 else 0
+        self.download_sample = (stats['elapsed'], stats['bytes_done'])
+        self.download_status.config(text="{}/{} files, {:.1f} of {:.1f} MB, {:.2f} MB/s".format(
+            stats['files_done'], stats['files_total'],
+            stats['bytes_done'] / 1e6, stats['bytes_total'] / 1e6, rate / 1e6))
+        
+        if self.download_thread.is_alive():
+            self.root.after(500, self.poll_downloads)
+            return
+        
+        failed = [(item, error) for item, _, error in self.download_results if error]
+        average = stats['bytes_done'] / stats['elapsed'] / 1e6 if stats['elapsed'] else 0
+        self.download_status.config(text="Finished {} of {} files, {:.1f} MB at {:.2f} MB/s average".format(
+            stats['files_total'] - len(failed), stats['files_total'], stats['bytes_done'] / 1e6, average))
+        if self.download_trace:
+            self.download_trace.set('autobuild_downloaded_bytes', stats['bytes_done'])
+            self.download_trace.set('autobuild_downloaded_files', stats['files_total'] - len(failed))
+            self.download_trace.set('autobuild_download_failures', len(failed))
+            self.write_trace(self.download_trace)
+            self.download_trace = None
+        if failed:
+            messagebox.showerror("Error", "Failed downloads:\n" + "\n".join(f"{item['url']}: {error}" for item, error in failed))
     
     def create_manifest_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -474,7 +4948,7 @@ class AutobuildGUI:
     
     def add_pattern(self):
         new_pattern = simpledialog.askstring("Add Pattern", "Enter file pattern (e.g., *.dll):")
-        if new_pattern:
+        if new_pattern and new_pattern not in self.patterns_listbox.get(0, tk.END):
             self.patterns_listbox.insert(tk.END, new_pattern)
     
     def remove_pattern(self):
@@ -518,6 +4992,71 @@ class AutobuildGUI:
         ttk.Label(cmd_frame, text="Platform:").grid(row=2, column=0, sticky=tk.W, padx=5)
         self.package_platform = ttk.Combobox(cmd_frame, values=["windows", "linux", "darwin"])
         self.package_platform.grid(row=2, column=1, sticky=tk.W, padx=5)
+        
+        # Artifact cache
+        cache_frame = ttk.LabelFrame(tab, text="Artifact Cache")
+        cache_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(cache_frame, text="Backend:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.package_artifact_cache = ttk.Combobox(cache_frame, values=["", "local", "http"])
+        self.package_artifact_cache.grid(row=0, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(cache_frame, text="Directory or URL:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.package_artifact_location = ttk.Entry(cache_frame, width=40)
+        self.package_artifact_location.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cache_frame, text="Browse...", command=lambda: self.browse_directory(self.package_artifact_location)).grid(row=1, column=2, padx=5)
+        
+        # Stage packaging
+        stage_frame = ttk.LabelFrame(tab, text="Stage Packaging (recompresses only changed files)")
+        stage_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(stage_frame, text="Stage Directory:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.package_stage_dir = ttk.Entry(stage_frame, width=40)
+        self.package_stage_dir.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(stage_frame, text="Browse...", command=lambda: self.browse_directory(self.package_stage_dir)).grid(row=0, column=2, padx=5)
+        
+        ttk.Label(stage_frame, text="Mode:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.package_stage_mode = ttk.Combobox(stage_frame, values=["full", "delta"], state="readonly")
+        self.package_stage_mode.set("full")
+        self.package_stage_mode.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(stage_frame, text="Package Stage", command=self.package_stage).grid(row=1, column=2, padx=5)
+        
+        self.package_stage_status = ttk.Label(stage_frame, text="")
+        self.package_stage_status.grid(row=2, column=0, columnspan=3, sticky=tk.W, padx=5)
+    
+    def package_stage(self):
+        self.collect_config_data()
+        package_cfg = self.config['package']
+        workdir = self.config['pipeline']['workdir']
+        if not package_cfg['stage_dir'] or not package_cfg['archive_name']:
+            messagebox.showerror("Error", "Set the stage directory and the archive name first.")
+            return
+        archive = os.path.join(workdir, package_cfg['archive_name'])
+        delta = package_cfg['stage_mode'] == "delta"
+        if delta:
+            # Never overwrite the full package the delta refers to
+            suffix = next((s for s in StagePackager.SUFFIXES if archive.endswith(s)), "")
+            archive = archive[:len(archive) - len(suffix)] + "-delta" + suffix
+        packager = StagePackager(os.path.join(workdir, package_cfg['stage_dir']))
+        
+        def work():
+            started = time.monotonic()
+            stats = packager.package(archive, delta)
+            stats['seconds'] = time.monotonic() - started
+            return stats
+        
+        def done(stats, error):
+            if error:
+                self.package_stage_status.config(text="")
+                messagebox.showerror("Error", f"Failed to package stage directory: {str(error)}")
+                return
+            self.package_stage_status.config(text="{}: {} files, {} compressed, {} reused ({} of {}), {} in {}; md5 {}".format(
+                os.path.basename(stats['archive']), stats['files'], stats['compressed'], stats['reused'],
+                format_bytes(stats['reused_bytes']), format_bytes(stats['bytes']), format_bytes(stats['size']),
+                format_duration(stats['seconds']), stats['md5']))
+        
+        self.package_stage_status.config(text="Packaging...")
+        self.run_in_background(work, done)
     
     def create_print_tab(self):
         tab = ttk.Frame(self.notebook)
@@ -550,856 +5089,1528 @@ class AutobuildGUI:
         
         self.print_json = tk.BooleanVar()
         ttk.Checkbutton(cmd_frame, text="Output as JSON", variable=self.print_json).grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=5)
-    
-    def create_source_environment_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Source Environment")
-        
-        # Standard options
-        std_frame = ttk.LabelFrame(tab, text="Standard Options")
-        std_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.source_debug = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Debug", variable=self.source_debug).pack(side=tk.LEFT, padx=5)
-        
-        self.source_dry_run = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.source_dry_run).pack(side=tk.LEFT, padx=5)
-        
-        self.source_verbose = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Verbose", variable=self.source_verbose).pack(side=tk.LEFT, padx=5)
         
-        self.source_quiet = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Quiet", variable=self.source_quiet).pack(side=tk.LEFT, padx=5)
-        
-        # Command-specific options
-        cmd_frame = ttk.LabelFrame(tab, text="Source Environment Options")
-        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(cmd_frame, text="Variables File:").grid(row=0, column=0, sticky=tk.W, padx=5)
-        self.source_vars_file = ttk.Entry(cmd_frame, width=40)
-        self.source_vars_file.grid(row=0, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.source_vars_file)).grid(row=0, column=2, padx=5)
-    
-    def create_uninstall_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Uninstall")
-        
-        # Standard options
-        std_frame = ttk.LabelFrame(tab, text="Standard Options")
-        std_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.uninstall_debug = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Debug", variable=self.uninstall_debug).pack(side=tk.LEFT, padx=5)
-        
-        self.uninstall_dry_run = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.uninstall_dry_run).pack(side=tk.LEFT, padx=5)
-        
-        self.uninstall_verbose = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Verbose", variable=self.uninstall_verbose).pack(side=tk.LEFT, padx=5)
-        
-        self.uninstall_quiet = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Quiet", variable=self.uninstall_quiet).pack(side=tk.LEFT, padx=5)
-        
-        # Command-specific options
-        cmd_frame = ttk.LabelFrame(tab, text="Uninstall Options")
-        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(cmd_frame, text="Config File:").grid(row=0, column=0, sticky=tk.W, padx=5)
-        self.uninstall_config_file = ttk.Entry(cmd_frame, width=40)
-        self.uninstall_config_file.grid(row=0, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.uninstall_config_file)).grid(row=0, column=2, padx=5)
-        
-        ttk.Label(cmd_frame, text="Install Directory:").grid(row=1, column=0, sticky=tk.W, padx=5)
-        self.uninstall_dir = ttk.Entry(cmd_frame, width=40)
-        self.uninstall_dir.grid(row=1, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_directory(self.uninstall_dir)).grid(row=1, column=2, padx=5)
-        
-        ttk.Label(cmd_frame, text="Manifest File:").grid(row=2, column=0, sticky=tk.W, padx=5)
-        self.uninstall_manifest_file = ttk.Entry(cmd_frame, width=40)
-        self.uninstall_manifest_file.grid(row=2, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.uninstall_manifest_file)).grid(row=2, column=2, padx=5)
-        
-        # Packages to uninstall
-        pkg_frame = ttk.LabelFrame(tab, text="Packages to Uninstall")
-        pkg_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        self.uninstall_packages_listbox = tk.Listbox(pkg_frame, selectmode=tk.MULTIPLE, height=6)
-        self.uninstall_packages_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        scrollbar = ttk.Scrollbar(pkg_frame, orient=tk.VERTICAL, command=self.uninstall_packages_listbox.yview)
+        # JSON inspector
+        inspect_frame = ttk.LabelFrame(tab, text="JSON Inspector")
+        inspect_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        inspect_btn_frame = ttk.Frame(inspect_frame)
+        inspect_btn_frame.pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(inspect_btn_frame, text="Run Print", command=self.inspect_print_output).pack(side=tk.LEFT, padx=2)
+        ttk.Button(inspect_btn_frame, text="Open JSON...", command=self.inspect_json_file).pack(side=tk.LEFT, padx=2)
+        self.json_search = ttk.Entry(inspect_btn_frame, width=30)
+        self.json_search.pack(side=tk.LEFT, padx=5)
+        self.json_search.bind("<Return>", lambda event: self.search_json())
+        ttk.Button(inspect_btn_frame, text="Find Next", command=self.search_json).pack(side=tk.LEFT, padx=2)
+        self.json_status = ttk.Label(inspect_btn_frame, text="")
+        self.json_status.pack(side=tk.LEFT, padx=5)
+        
+        self.json_inspector = JsonInspector(inspect_frame)
+        self.json_inspector.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar = ttk.Scrollbar(inspect_frame, orient=tk.VERTICAL, command=self.json_inspector.tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.uninstall_packages_listbox.config(yscrollcommand=scrollbar.set)
-        
-        # Add some default packages
-        default_packages = [
-            "boost", "openssl", "zlib", "curl", "xml2", "fmod", "ogg", 
-            "vorbis", "openal", "colladadom", "google-breakpad", "ndofdev"
-        ]
-        for pkg in default_packages:
-            self.uninstall_packages_listbox.insert(tk.END, pkg)
-        
-        # Package management buttons
-        btn_frame = ttk.Frame(pkg_frame)
-        btn_frame.pack(side=tk.RIGHT, padx=5)
-        
-        ttk.Button(btn_frame, text="Add", command=self.add_uninstall_package).pack(fill=tk.X, pady=2)
-        ttk.Button(btn_frame, text="Remove", command=self.remove_uninstall_package).pack(fill=tk.X, pady=2)
-    
-    def add_uninstall_package(self):
-        new_pkg = simpledialog.askstring("Add Package", "Enter package name:")
-        if new_pkg:
-            self.uninstall_packages_listbox.insert(tk.END, new_pkg)
-    
-    def remove_uninstall_package(self):
-        selected = self.uninstall_packages_listbox.curselection()
-        for idx in reversed(selected):
-            self.uninstall_packages_listbox.delete(idx)
+        self.json_inspector.tree.config(yscrollcommand=scrollbar.set)
+        self.json_events = None
+        self.json_matches = []
     
-    def create_upload_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text="Upload")
-        
-        # Standard options
-        std_frame = ttk.LabelFrame(tab, text="Standard Options")
-        std_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.upload_debug = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Debug", variable=self.upload_debug).pack(side=tk.LEFT, padx=5)
-        
-        self.upload_dry_run = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.upload_dry_run).pack(side=tk.LEFT, padx=5)
-        
-        self.upload_verbose = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Verbose", variable=self.upload_verbose).pack(side=tk.LEFT, padx=5)
-        
-        self.upload_quiet = tk.BooleanVar()
-        ttk.Checkbutton(std_frame, text="Quiet", variable=self.upload_quiet).pack(side=tk.LEFT, padx=5)
-        
-        # Command-specific options
-        cmd_frame = ttk.LabelFrame(tab, text="Upload Options")
-        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(cmd_frame, text="Archive File:").grid(row=0, column=0, sticky=tk.W, padx=5)
-        self.upload_archive = ttk.Entry(cmd_frame, width=40)
-        self.upload_archive.grid(row=0, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.upload_archive)).grid(row=0, column=2, padx=5)
+    def inspect_print_output(self):
+        command = ["autobuild", "print", "--json"]
+        if self.print_config_file.get():
+            command += ["--config-file", self.print_config_file.get()]
         
-        self.upload_to_s3 = tk.BooleanVar()
-        ttk.Checkbutton(cmd_frame, text="Upload to S3", variable=self.upload_to_s3).grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=5)
-        
-        ttk.Label(cmd_frame, text="Credentials File:").grid(row=2, column=0, sticky=tk.W, padx=5)
-        self.upload_credentials = ttk.Entry(cmd_frame, width=40)
-        self.upload_credentials.grid(row=2, column=1, sticky=tk.W, padx=5)
-        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.upload_credentials)).grid(row=2, column=2, padx=5)
-    
-    def browse_file(self, entry_widget):
-        filename = filedialog.askopenfilename()
-        if filename:
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, filename)
-    
-    def browse_directory(self, entry_widget):
-        dirname = filedialog.askdirectory()
-        if dirname:
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, dirname)
-    
-    def save_config(self):
-        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
-        if filename:
-            self.collect_config_data()
-            try:
-                with open(filename, 'w') as f:
-                    json.dump(self.config, f, indent=4)
-                messagebox.showinfo("Success", "Configuration saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save configuration: {str(e)}")
-    
-    def load_config(self):
-        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
-        if filename:
-            try:
-                with open(filename, 'r') as f:
-                    self.config = json.load(f)
-                self.apply_config_data()
-                messagebox.showinfo("Success", "Configuration loaded successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load configuration: {str(e)}")
-    
-    def load_default_config(self):
-        # Try to load default config if it exists
-        default_config = "autobuild_config.json"
-        if os.path.exists(default_config):
+        def chunks():
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
             try:
-                with open(default_config, 'r') as f:
-                    self.config = json.load(f)
-                self.apply_config_data()
-            except:
-                pass  # Silently fail if default config can't be loaded
+                for block in iter(lambda: process.stdout.read1(65536), b""):
+                    yield block
+            finally:
+                process.stdout.close()
+                if process.wait():
+                    raise RuntimeError(f"autobuild print exited with status {process.returncode}")
+        
+        self.start_json_stream(chunks)
     
-    def collect_config_data(self):
-        # Build tab
-        self.config['build'] = {
-            'debug': self.build_debug.get(),
-            'dry_run': self.build_dry_run.get(),
-            'verbose': self.build_verbose.get(),
-            'quiet': self.build_quiet.get(),
-            'configuration': self.build_configuration.get(),
-            'all_configs': self.build_all_configs.get(),
-            'no_configure': self.build_no_configure.get(),
-            'build_id': self.build_id.get(),
-            'address_size': self.build_address_size.get(),
-            'additional_options': self.build_additional_options.get()
-        }
-        
-        # Configure tab
-        self.config['configure'] = {
-            'debug': self.configure_debug.get(),
-            'dry_run': self.configure_dry_run.get(),
-            'verbose': self.configure_verbose.get(),
-            'quiet': self.configure_quiet.get(),
-            'all_configs': self.configure_all_configs.get(),
-            'configuration': self.configure_configuration.get(),
-            'address_size': self.configure_address_size.get(),
-            'additional_options': self.configure_additional_options.get()
-        }
-        
-        # Edit tab
-        self.config['edit'] = {
-            'debug': self.edit_debug.get(),
-            'dry_run': self.edit_dry_run.get(),
-            'verbose': self.edit_verbose.get(),
-            'quiet': self.edit_quiet.get(),
-            'subcommand': self.edit_subcommand.get(),
-            'config_file': self.edit_config_file.get(),
-            'delete': self.edit_delete.get(),
-            'build_command': self.edit_build_command.get(),
-            'configure_command': self.edit_configure_command.get(),
-            'package_name': self.edit_package_name.get(),
-            'platform_name': self.edit_platform_name.get()
-        }
+    def inspect_json_file(self):
+        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not filename:
+            return
         
-        # Install tab
-        self.config['install'] = {
-            'debug': self.install_debug.get(),
-            'dry_run': self.install_dry_run.get(),
-            'verbose': self.install_verbose.get(),
-            'quiet': self.install_quiet.get(),
-            'config_file': self.install_config_file.get(),
-            'install_dir': self.install_dir.get(),
-            'manifest_file': self.install_manifest_file.get(),
-            'export_manifest': self.install_export_manifest.get(),
-            'list': self.install_list.get(),
-            'list_installed': self.install_list_installed.get(),
-            'list_licenses': self.install_list_licenses.get(),
-            'platform': self.install_platform.get(),
-            'packages': list(self.packages_listbox.get(0, tk.END))
-        }
+        def chunks():
+            with open(filename, 'rb') as f:
+                for block in iter(lambda: f.read(65536), b""):
+                    yield block
         
-        # Installables tab
-        self.config['installables'] = {
-            'debug': self.installables_debug.get(),
-            'dry_run': self.installables_dry_run.get(),
-            'verbose': self.installables_verbose.get(),
-            'quiet': self.installables_quiet.get(),
-            'config_file': self.installables_config_file.get(),
-            'command': self.installables_command.get(),
-            'pkg_name': self.installables_pkg_name.get(),
-            'creds': self.installables_creds.get(),
-            'url': self.installables_url.get(),
-            'hash': self.installables_hash.get(),
-            'hash_alg': self.installables_hash_alg.get(),
-            'archive': self.installables_archive.get()
-        }
+        self.start_json_stream(chunks)
+    
+    def start_json_stream(self, chunks):
+        # Parse and index on a worker thread; the Tk thread only inserts nodes
+        self.json_inspector.clear()
+        self.json_matches = []
+        self.json_events = events = queue.Queue()
+        index = self.json_inspector.index
+        
+        def run():
+            parser = JsonStreamParser()
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            try:
+                for block in chunks():
+                    batch = parser.feed(decoder.decode(block))
+                    for kind, path, value in batch:
+                        if kind == 'value':
+                            index.add(path, value)
+                        elif kind == 'open' and path:
+                            index.add(path, key_only=True)
+                    if batch:
+                        events.put(batch)
+                parser.feed(decoder.decode(b"", final=True))
+                parser.finish()
+                events.put(None)
+            except Exception as e:
+                events.put(e)
         
-        # Manifest tab
-        self.config['manifest'] = {
-            'debug': self.manifest_debug.get(),
-            'dry_run': self.manifest_dry_run.get(),
-            'verbose': self.manifest_verbose.get(),
-            'quiet': self.manifest_quiet.get(),
-            'config_file': self.manifest_config_file.get(),
-            'platform': self.manifest_platform.get(),
-            'command': self.manifest_command.get(),
-            'patterns': list(self.patterns_listbox.get(0, tk.END))
-        }
+        threading.Thread(target=run, daemon=True).start()
+        self.json_status.config(text="Loading...")
+        self.root.after(50, self.poll_json_stream, events)
+    
+    def poll_json_stream(self, events):
+        if events is not self.json_events:
+            return  # superseded by a newer load
+        deadline = time.monotonic() + 0.03
+        while time.monotonic() < deadline:
+            try:
+                batch = events.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self.json_status.config(text=f"Loaded {len(self.json_inspector.nodes) - 1} nodes")
+                return
+            if isinstance(batch, Exception):
+                self.json_status.config(text="")
+                messagebox.showerror("Error", f"Failed to load JSON: {str(batch)}")
+                return
+            for kind, path, value in batch:
+                self.json_inspector.add_event(kind, path, value)
+        self.root.after(50, self.poll_json_stream, events)
+    
+    def search_json(self):
+        query = self.json_search.get().strip()
+        if not query:
+            return
+        if not self.json_matches or self.json_matches[0] != query:
+            self.json_matches = [query, self.json_inspector.index.search(query), 0]
+        _, paths, position = self.json_matches
+        if not paths:
+            self.json_status.config(text="No matches")
+            return
+        self.json_inspector.reveal(paths[position % len(paths)])
+        self.json_status.config(text=f"Match {position % len(paths) + 1} of {len(paths)}")
+        self.json_matches[2] = position + 1
+    
+    def create_source_environment_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Source Environment")
         
-        # Package tab
-        self.config['package'] = {
-            'debug': self.package_debug.get(),
-            'dry_run': self.package_dry_run.get(),
-            'verbose': self.package_verbose.get(),
-            'quiet': self.package_quiet.get(),
-            'config_file': self.package_config_file.get(),
-            'archive_name': self.package_archive_name.get(),
-            'platform': self.package_platform.get()
-        }
+        # Standard options
+        std_frame = ttk.LabelFrame(tab, text="Standard Options")
+        std_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Print tab
-        self.config['print'] = {
-            'debug': self.print_debug.get(),
-            'dry_run': self.print_dry_run.get(),
-            'verbose': self.print_verbose.get(),
-            'quiet': self.print_quiet.get(),
-            'config_file': self.print_config_file.get(),
-            'json': self.print_json.get()
-        }
+        self.source_debug = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Debug", variable=self.source_debug).pack(side=tk.LEFT, padx=5)
         
-        # Source Environment tab
-        self.config['source_environment'] = {
-            'debug': self.source_debug.get(),
-            'dry_run': self.source_dry_run.get(),
-            'verbose': self.source_verbose.get(),
-            'quiet': self.source_quiet.get(),
-            'vars_file': self.source_vars_file.get()
-        }
+        self.source_dry_run = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.source_dry_run).pack(side=tk.LEFT, padx=5)
         
-        # Uninstall tab
-        self.config['uninstall'] = {
-            'debug': self.uninstall_debug.get(),
-            'dry_run': self.uninstall_dry_run.get(),
-            'verbose': self.uninstall_verbose.get(),
-            'quiet': self.uninstall_quiet.get(),
-            'config_file': self.uninstall_config_file.get(),
-            'install_dir': self.uninstall_dir.get(),
-            'manifest_file': self.uninstall_manifest_file.get(),
-            'packages': list(self.uninstall_packages_listbox.get(0, tk.END))
-        }
+        self.source_verbose = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Verbose", variable=self.source_verbose).pack(side=tk.LEFT, padx=5)
         
-        # Upload tab
-        self.config['upload'] = {
-            'debug': self.upload_debug.get(),
-            'dry_run': self.upload_dry_run.get(),
-            'verbose': self.upload_verbose.get(),
-            'quiet': self.upload_quiet.get(),
-            'archive': self.upload_archive.get(),
-            'to_s3': self.upload_to_s3.get(),
-            'credentials': self.upload_credentials.get()
-        }
+        self.source_quiet = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Quiet", variable=self.source_quiet).pack(side=tk.LEFT, padx=5)
+        
+        # Command-specific options
+        cmd_frame = ttk.LabelFrame(tab, text="Source Environment Options")
+        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(cmd_frame, text="Variables File:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.source_vars_file = ttk.Entry(cmd_frame, width=40)
+        self.source_vars_file.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.source_vars_file)).grid(row=0, column=2, padx=5)
     
-    def apply_config_data(self):
-        # Build tab
-        build_cfg = self.config.get('build', {})
-        self.build_debug.set(build_cfg.get('debug', False))
-        self.build_dry_run.set(build_cfg.get('dry_run', False))
-        self.build_verbose.set(build_cfg.get('verbose', False))
-        self.build_quiet.set(build_cfg.get('quiet', False))
-        self.build_configuration.set(build_cfg.get('configuration', ''))
-        self.build_all_configs.set(build_cfg.get('all_configs', False))
-        self.build_no_configure.set(build_cfg.get('no_configure', False))
-        self.build_id.delete(0, tk.END)
-        self.build_id.insert(0, build_cfg.get('build_id', ''))
-        self.build_address_size.set(build_cfg.get('address_size', ''))
-        self.build_additional_options.delete(0, tk.END)
-        self.build_additional_options.insert(0, build_cfg.get('additional_options', ''))
+    def create_uninstall_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Uninstall")
         
-        # Configure tab
-        configure_cfg = self.config.get('configure', {})
-        self.configure_debug.set(configure_cfg.get('debug', False))
-        self.configure_dry_run.set(configure_cfg.get('dry_run', False))
-        self.configure_verbose.set(configure_cfg.get('verbose', False))
-        self.configure_quiet.set(configure_cfg.get('quiet', False))
-        self.configure_all_configs.set(configure_cfg.get('all_configs', False))
-        self.configure_configuration.set(configure_cfg.get('configuration', ''))
-        self.configure_address_size.set(configure_cfg.get('address_size', ''))
-        self.configure_additional_options.delete(0, tk.END)
-        self.configure_additional_options.insert(0, configure_cfg.get('additional_options', ''))
+        # Standard options
+        std_frame = ttk.LabelFrame(tab, text="Standard Options")
+        std_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Edit tab
-        edit_cfg = self.config.get('edit', {})
-        self.edit_debug.set(edit_cfg.get('debug', False))
-        self.edit_dry_run.set(edit_cfg.get('dry_run', False))
-        self.edit_verbose.set(edit_cfg.get('verbose', False))
-        self.edit_quiet.set(edit_cfg.get('quiet', False))
-        self.edit_subcommand.set(edit_cfg.get('subcommand', 'build'))
-        self.edit_config_file.delete(0, tk.END)
-        self.edit_config_file.insert(0, edit_cfg.get('config_file', ''))
-        self.edit_delete.set(edit_cfg.get('delete', False))
-        self.edit_build_command.delete(0, tk.END)
-        self.edit_build_command.insert(0, edit_cfg.get('build_command', ''))
-        self.edit_configure_command.delete(0, tk.END)
-        self.edit_configure_command.insert(0, edit_cfg.get('configure_command', ''))
-        self.edit_package_name.delete(0, tk.END)
-        self.edit_package_name.insert(0, edit_cfg.get('package_name', ''))
-        self.edit_platform_name.set(edit_cfg.get('platform_name', ''))
+        self.uninstall_debug = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Debug", variable=self.uninstall_debug).pack(side=tk.LEFT, padx=5)
         
-        # Install tab
-        install_cfg = self.config.get('install', {})
-        self.install_debug.set(install_cfg.get('debug', False))
-        self.install_dry_run.set(install_cfg.get('dry_run', False))
-        self.install_verbose.set(install_cfg.get('verbose', False))
-        self.install_quiet.set(install_cfg.get('quiet', False))
-        self.install_config_file.delete(0, tk.END)
-        self.install_config_file.insert(0, install_cfg.get('config_file', ''))
-        self.install_dir.delete(0, tk.END)
-        self.install_dir.insert(0, install_cfg.get('install_dir', ''))
-        self.install_manifest_file.delete(0, tk.END)
-        self.install_manifest_file.insert(0, install_cfg.get('manifest_file', ''))
-        self.install_export_manifest.set(install_cfg.get('export_manifest', False))
-        self.install_list.set(install_cfg.get('list', False))
-        self.install_list_installed.set(install_cfg.get('list_installed', False))
-        self.install_list_licenses.set(install_cfg.get('list_licenses', False))
-        self.install_platform.set(install_cfg.get('platform', ''))
+        self.uninstall_dry_run = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.uninstall_dry_run).pack(side=tk.LEFT, padx=5)
         
-        # Update packages listbox
-        self.packages_listbox.delete(0, tk.END)
-        for pkg in install_cfg.get('packages', []):
-            self.packages_listbox.insert(tk.END, pkg)
+        self.uninstall_verbose = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Verbose", variable=self.uninstall_verbose).pack(side=tk.LEFT, padx=5)
         
-        # Installables tab
-        installables_cfg = self.config.get('installables', {})
-        self.installables_debug.set(installables_cfg.get('debug', False))
-        self.installables_dry_run.set(installables_cfg.get('dry_run', False))
-        self.installables_verbose.set(installables_cfg.get('verbose', False))
-        self.installables_quiet.set(installables_cfg.get('quiet', False))
-        self.installables_config_file.delete(0, tk.END)
-        self.installables_config_file.insert(0, installables_cfg.get('config_file', ''))
-        self.installables_command.set(installables_cfg.get('command', 'add'))
-        self.installables_pkg_name.delete(0, tk.END)
-        self.installables_pkg_name.insert(0, installables_cfg.get('pkg_name', ''))
-        self.installables_creds.set(installables_cfg.get('creds', ''))
-        self.installables_url.delete(0, tk.END)
-        self.installables_url.insert(0, installables_cfg.get('url', ''))
-        self.installables_hash.delete(0, tk.END)
-        self.installables_hash.insert(0, installables_cfg.get('hash', ''))
-        self.installables_hash_alg.set(installables_cfg.get('hash_alg', ''))
-        self.installables_archive.delete(0, tk.END)
-        self.installables_archive.insert(0, installables_cfg.get('archive', ''))
+        self.uninstall_quiet = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Quiet", variable=self.uninstall_quiet).pack(side=tk.LEFT, padx=5)
         
-        # Manifest tab
-        manifest_cfg = self.config.get('manifest', {})
-        self.manifest_debug.set(manifest_cfg.get('debug', False))
-        self.manifest_dry_run.set(manifest_cfg.get('dry_run', False))
-        self.manifest_verbose.set(manifest_cfg.get('verbose', False))
-        self.manifest_quiet.set(manifest_cfg.get('quiet', False))
-        self.manifest_config_file.delete(0, tk.END)
-        self.manifest_config_file.insert(0, manifest_cfg.get('config_file', ''))
-        self.manifest_platform.set(manifest_cfg.get('platform', ''))
-        self.manifest_command.set(manifest_cfg.get('command', 'add'))
+        # Command-specific options
+        cmd_frame = ttk.LabelFrame(tab, text="Uninstall Options")
+        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Update patterns listbox
-        self.patterns_listbox.delete(0, tk.END)
-        for pattern in manifest_cfg.get('patterns', []):
-            self.patterns_listbox.insert(tk.END, pattern)
+        ttk.Label(cmd_frame, text="Config File:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.uninstall_config_file = ttk.Entry(cmd_frame, width=40)
+        self.uninstall_config_file.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.uninstall_config_file)).grid(row=0, column=2, padx=5)
         
-        # Package tab
-        package_cfg = self.config.get('package', {})
-        self.package_debug.set(package_cfg.get('debug', False))
-        self.package_dry_run.set(package_cfg.get('dry_run', False))
-        self.package_verbose.set(package_cfg.get('verbose', False))
-        self.package_quiet.set(package_cfg.get('quiet', False))
-        self.package_config_file.delete(0, tk.END)
-        self.package_config_file.insert(0, package_cfg.get('config_file', ''))
-        self.package_archive_name.delete(0, tk.END)
-        self.package_archive_name.insert(0, package_cfg.get('archive_name', ''))
-        self.package_platform.set(package_cfg.get('platform', ''))
+        ttk.Label(cmd_frame, text="Install Directory:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.uninstall_dir = ttk.Entry(cmd_frame, width=40)
+        self.uninstall_dir.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_directory(self.uninstall_dir)).grid(row=1, column=2, padx=5)
         
-        # Print tab
-        print_cfg = self.config.get('print', {})
-        self.print_debug.set(print_cfg.get('debug', False))
-        self.print_dry_run.set(print_cfg.get('dry_run', False))
-        self.print_verbose.set(print_cfg.get('verbose', False))
-        self.print_quiet.set(print_cfg.get('quiet', False))
-        self.print_config_file.delete(0, tk.END)
-        self.print_config_file.insert(0, print_cfg.get('config_file', ''))
-        self.print_json.set(print_cfg.get('json', False))
+        ttk.Label(cmd_frame, text="Manifest File:").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.uninstall_manifest_file = ttk.Entry(cmd_frame, width=40)
+        self.uninstall_manifest_file.grid(row=2, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.uninstall_manifest_file)).grid(row=2, column=2, padx=5)
         
-        # Source Environment tab
-        source_cfg = self.config.get('source_environment', {})
-        self.source_debug.set(source_cfg.get('debug', False))
-        self.source_dry_run.set(source_cfg.get('dry_run', False))
-        self.source_verbose.set(source_cfg.get('verbose', False))
-        self.source_quiet.set(source_cfg.get('quiet', False))
-        self.source_vars_file.delete(0, tk.END)
-        self.source_vars_file.insert(0, source_cfg.get('vars_file', ''))
+        # Packages to uninstall
+        pkg_frame = ttk.LabelFrame(tab, text="Packages to Uninstall")
+        pkg_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Uninstall tab
-        uninstall_cfg = self.config.get('uninstall', {})
-        self.uninstall_debug.set(uninstall_cfg.get('debug', False))
-        self.uninstall_dry_run.set(uninstall_cfg.get('dry_run', False))
-        self.uninstall_verbose.set(uninstall_cfg.get('verbose', False))
-        self.uninstall_quiet.set(uninstall_cfg.get('quiet', False))
-        self.uninstall_config_file.delete(0, tk.END)
-        self.uninstall_config_file.insert(0, uninstall_cfg.get('config_file', ''))
-        self.uninstall_dir.delete(0, tk.END)
-        self.uninstall_dir.insert(0, uninstall_cfg.get('install_dir', ''))
-        self.uninstall_manifest_file.delete(0, tk.END)
-        self.uninstall_manifest_file.insert(0, uninstall_cfg.get('manifest_file', ''))
+        self.uninstall_packages_listbox = tk.Listbox(pkg_frame, selectmode=tk.MULTIPLE, height=6)
+        self.uninstall_packages_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Update uninstall packages listbox
-        self.uninstall_packages_listbox.delete(0, tk.END)
-        for pkg in uninstall_cfg.get('packages', []):
+        scrollbar = ttk.Scrollbar(pkg_frame, orient=tk.VERTICAL, command=self.uninstall_packages_listbox.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.uninstall_packages_listbox.config(yscrollcommand=scrollbar.set)
+        
+        # Add some default packages
+        default_packages = [
+            "boost", "openssl", "zlib", "curl", "xml2", "fmod", "ogg", 
+            "vorbis", "openal", "colladadom", "google-breakpad", "ndofdev"
+        ]
+        for pkg in default_packages:
             self.uninstall_packages_listbox.insert(tk.END, pkg)
         
-        # Upload tab
-        upload_cfg = self.config.get('upload', {})
-        self.upload_debug.set(upload_cfg.get('debug', False))
-        self.upload_dry_run.set(upload_cfg.get('dry_run', False))
-        self.upload_verbose.set(upload_cfg.get('verbose', False))
-        self.upload_quiet.set(upload_cfg.get('quiet', False))
-        self.upload_archive.delete(0, tk.END)
-        self.upload_archive.insert(0, upload_cfg.get('archive', ''))
-        self.upload_to_s3.set(upload_cfg.get('to_s3', False))
-        self.upload_credentials.delete(0, tk.END)
-        self.upload_credentials.insert(0, upload_cfg.get('credentials', ''))
+        # Package management buttons
+        btn_frame = ttk.Frame(pkg_frame)
+        btn_frame.pack(side=tk.RIGHT, padx=5)
+        
+        ttk.Button(btn_frame, text="Add", command=self.add_uninstall_package).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="Remove", command=self.remove_uninstall_package).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="Unlink from Store", command=self.uninstall_from_store).pack(fill=tk.X, pady=2)
     
-    def generate_batch(self):
-        self.collect_config_data()
-        batch_content = "@echo off\n"
-        batch_content += ":: Autobuild Batch File - Generated on {}\n".format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        batch_content += ":: Second Life Viewer Build Configuration\n\n"
+    def uninstall_from_store(self):
+        install_dir = self.uninstall_dir.get()
+        packages = [self.uninstall_packages_listbox.get(idx) for idx in self.uninstall_packages_listbox.curselection()]
+        if not install_dir or not packages:
+            messagebox.showerror("Error", "Set the install directory and select packages to unlink.")
+            return
+        
+        def work():
+            removed = 0
+            for package in packages:
+                if os.path.exists(os.path.join(install_dir, ".autobuild-store", package + ".json")):
+                    removed += ArchiveStore.uninstall(package, install_dir)
+            return removed
+        
+        def done(result, error):
+            if error:
+                messagebox.showerror("Error", f"Failed to unlink packages: {str(error)}")
+            else:
+                messagebox.showinfo("Success", f"Removed {result} files.")
+        
+        self.run_in_background(work, done)
+    
+    def add_uninstall_package(self):
+        new_pkg = simpledialog.askstring("Add Package", "Enter package name:")
+        if new_pkg and new_pkg not in self.uninstall_packages_listbox.get(0, tk.END):
+            self.uninstall_packages_listbox.insert(tk.END, new_pkg)
+    
+    def remove_uninstall_package(self):
+        selected = self.uninstall_packages_listbox.curselection()
+        for idx in reversed(selected):
+            self.uninstall_packages_listbox.delete(idx)
+    
+    def create_upload_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Upload")
         
-        # Add environment variables if needed
-        if self.config['installables'].get('creds'):
-            batch_content += ":: Set credentials for private packages\n"
-            if self.config['installables']['creds'] == "github":
-                batch_content += "set AUTOBUILD_GITHUB_TOKEN=your_github_token_here\n"
-            elif self.config['installables']['creds'] == "gitlab":
-                batch_content += "set AUTOBUILD_GITLAB_TOKEN=your_gitlab_token_here\n"
-            batch_content += "\n"
+        # Standard options
+        std_frame = ttk.LabelFrame(tab, text="Standard Options")
+        std_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Generate commands based on configuration
-        batch_content += self.generate_build_command()
-        batch_content += self.generate_configure_command()
-        batch_content += self.generate_edit_command()
-        batch_content += self.generate_install_command()
-        batch_content += self.generate_installables_command()
-        batch_content += self.generate_manifest_command()
-        batch_content += self.generate_package_command()
-        batch_content += self.generate_print_command()
-        batch_content += self.generate_source_environment_command()
-        batch_content += self.generate_uninstall_command()
-        batch_content += self.generate_upload_command()
+        self.upload_debug = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Debug", variable=self.upload_debug).pack(side=tk.LEFT, padx=5)
         
-        # Add pause at the end to keep window open
-        batch_content += "\npause"
+        self.upload_dry_run = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Dry Run", variable=self.upload_dry_run).pack(side=tk.LEFT, padx=5)
         
-        # Show preview
-        self.preview_text.delete(1.0, tk.END)
-        self.preview_text.insert(tk.END, batch_content)
+        self.upload_verbose = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Verbose", variable=self.upload_verbose).pack(side=tk.LEFT, padx=5)
         
-        # Ask to save file
-        if messagebox.askyesno("Save Batch File", "Would you like to save the batch file?"):
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".bat",
-                filetypes=[("Batch files", "*.bat"), ("All files", "*.*")],
-                initialfile="build_viewer.bat"
-            )
-            if filename:
-                try:
-                    with open(filename, 'w') as f:
-                        f.write(batch_content)
-                    messagebox.showinfo("Success", "Batch file saved successfully!")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to save batch file: {str(e)}")
-    
-    def generate_build_command(self):
-        cmd = ":: Build command\n"
-        cmd += "autobuild build"
+        self.upload_quiet = tk.BooleanVar()
+        ttk.Checkbutton(std_frame, text="Quiet", variable=self.upload_quiet).pack(side=tk.LEFT, padx=5)
         
-        # Add standard options
-        if self.config['build']['debug']:
-            cmd += " --debug"
-        if self.config['build']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['build']['verbose']:
-            cmd += " --verbose"
-        if self.config['build']['quiet']:
-            cmd += " --quiet"
+        # Command-specific options
+        cmd_frame = ttk.LabelFrame(tab, text="Upload Options")
+        cmd_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        # Add command-specific options
-        if self.config['build']['all_configs']:
-            cmd += " --all"
-        if self.config['build']['configuration']:
-            cmd += f" --configuration {self.config['build']['configuration']}"
-        if self.config['build']['no_configure']:
-            cmd += " --no-configure"
-        if self.config['build']['build_id']:
-            cmd += f" --id {self.config['build']['build_id']}"
-        if self.config['build']['address_size']:
-            cmd += f" --address-size {self.config['build']['address_size']}"
-        if self.config['build']['additional_options']:
-            cmd += f" -- {self.config['build']['additional_options']}"
+        ttk.Label(cmd_frame, text="Archive File:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.upload_archive = ttk.Entry(cmd_frame, width=40)
+        self.upload_archive.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.upload_archive)).grid(row=0, column=2, padx=5)
         
-        return cmd + "\n\n"
-    
-    def generate_configure_command(self):
-        cmd = ":: Configure command\n"
-        cmd += "autobuild configure"
+        self.upload_to_s3 = tk.BooleanVar()
+        ttk.Checkbutton(cmd_frame, text="Upload to S3", variable=self.upload_to_s3).grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=5)
         
-        # Add standard options
-        if self.config['configure']['debug']:
-            cmd += " --debug"
-        if self.config['configure']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['configure']['verbose']:
-            cmd += " --verbose"
-        if self.config['configure']['quiet']:
-            cmd += " --quiet"
+        ttk.Label(cmd_frame, text="Credentials File:").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.upload_credentials = ttk.Entry(cmd_frame, width=40)
+        self.upload_credentials.grid(row=2, column=1, sticky=tk.W, padx=5)
+        ttk.Button(cmd_frame, text="Browse...", command=lambda: self.browse_file(self.upload_credentials)).grid(row=2, column=2, padx=5)
         
-        # Add command-specific options
-        if self.config['configure']['all_configs']:
-            cmd += " --all"
-        if self.config['configure']['configuration']:
-            cmd += f" --configuration {self.config['configure']['configuration']}"
-        if self.config['configure']['address_size']:
-            cmd += f" --address-size {self.config['configure']['address_size']}"
-        if self.config['configure']['additional_options']:
-            cmd += f" -- {self.config['configure']['additional_options']}"
+        # Chunked upload
+        chunk_frame = ttk.LabelFrame(tab, text="Chunked Upload (only changed chunks are sent)")
+        chunk_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        return cmd + "\n\n"
+        ttk.Label(chunk_frame, text="Backend:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.upload_chunk_store = ttk.Combobox(chunk_frame, values=["local", "http"], state="readonly")
+        self.upload_chunk_store.set("local")
+        self.upload_chunk_store.grid(row=0, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(chunk_frame, text="Directory or URL:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.upload_chunk_location = ttk.Entry(chunk_frame, width=40)
+        self.upload_chunk_location.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(chunk_frame, text="Browse...", command=lambda: self.browse_directory(self.upload_chunk_location)).grid(row=1, column=2, padx=5)
+        ttk.Button(chunk_frame, text="Upload Archive", command=self.chunked_upload).grid(row=1, column=3, padx=5)
+        
+        self.upload_chunk_status = ttk.Label(chunk_frame, text="")
+        self.upload_chunk_status.grid(row=2, column=0, columnspan=4, sticky=tk.W, padx=5)
+    
+    def chunked_upload(self):
+        self.collect_config_data()
+        upload_cfg = self.config['upload']
+        archive = upload_cfg['archive']
+        if not archive or not upload_cfg['chunk_location']:
+            messagebox.showerror("Error", "Set the archive file and the chunk store location first.")
+            return
+        archive = os.path.join(self.config['pipeline']['workdir'], archive)
+        location = upload_cfg['chunk_location']
+        store = make_blob_store(upload_cfg['chunk_store'], location)
+        
+        def work():
+            started = time.monotonic()
+            stats = ChunkedUploader(store, location).upload(archive, checkpoint=self.scheduler.checkpoint)
+            stats['seconds'] = time.monotonic() - started
+            return stats
+        
+        def done(stats, error):
+            if error:
+                self.upload_chunk_status.config(text="")
+                messagebox.showerror("Error", f"Failed to upload archive: {str(error)}")
+                return
+            self.upload_chunk_status.config(text="Sent {} of {} chunks, {} of {} in {}".format(
+                stats['new_chunks'], stats['chunks'], format_bytes(stats['bytes_sent']),
+                format_bytes(stats['bytes']), format_duration(stats['seconds'])))
+        
+        self.upload_chunk_status.config(text="Uploading...")
+        self.run_in_background(work, done, priority='background')
+    
+    def run_in_background(self, work, on_done, interval=250, priority='normal', scheduler=None):
+        # Run work() through the job scheduler and hand its result to on_done()
+        # on the Tk thread
+        job = (scheduler or self.scheduler).submit(getattr(work, '__name__', "job"), work, priority)
+        
+        def poll():
+            if not job['done'].is_set():
+                self.root.after(interval, poll)
+            else:
+                on_done(job['result'], job['error'])
+        
+        self.root.after(interval, poll)
+        return job
+    
+    def create_pipeline_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text="Pipeline")
+        
+        # Steps to run
+        steps_frame = ttk.LabelFrame(tab, text="Steps to Run")
+        steps_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.pipeline_step_vars = {}
+        for idx, step in enumerate(self.STEPS):
+            var = tk.BooleanVar(value=step in self.DEFAULT_PIPELINE_STEPS)
+            ttk.Checkbutton(steps_frame, text=step.replace('_', ' ').title(), variable=var).grid(row=idx // 6, column=idx % 6, sticky=tk.W, padx=5)
+            self.pipeline_step_vars[step] = var
+        
+        # Execution
+        exec_frame = ttk.LabelFrame(tab, text="Execution")
+        exec_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(exec_frame, text="Working Directory:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.pipeline_workdir = ttk.Entry(exec_frame, width=40)
+        self.pipeline_workdir.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Button(exec_frame, text="Browse...", command=lambda: self.browse_directory(self.pipeline_workdir)).grid(row=0, column=2, padx=5)
+        
+        ttk.Label(exec_frame, text="Execution Mode:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.pipeline_execution_mode = ttk.Combobox(exec_frame, values=["subprocess", "warm interpreter"], state="readonly")
+        self.pipeline_execution_mode.set("subprocess")
+        self.pipeline_execution_mode.grid(row=1, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(exec_frame, text="Python (warm mode):").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.pipeline_python = ttk.Entry(exec_frame, width=40)
+        self.pipeline_python.grid(row=2, column=1, sticky=tk.W, padx=5)
+        ttk.Button(exec_frame, text="Browse...", command=lambda: self.browse_file(self.pipeline_python)).grid(row=2, column=2, padx=5)
+        
+        run_frame = ttk.Frame(exec_frame)
+        run_frame.grid(row=3, column=0, columnspan=3, sticky=tk.W, padx=5, pady=5)
+        ttk.Button(run_frame, text="Run Pipeline", command=self.run_pipeline).pack(side=tk.LEFT, padx=2)
+        ttk.Button(run_frame, text="Resume", command=lambda: self.run_pipeline(resume=True)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(run_frame, text="Preflight", command=self.show_preflight).pack(side=tk.LEFT, padx=2)
+        ttk.Button(run_frame, text="Cancel", command=self.cancel_pipeline).pack(side=tk.LEFT, padx=2)
+        ttk.Button(run_frame, text="Build History...", command=self.show_history).pack(side=tk.LEFT, padx=2)
+        ttk.Button(run_frame, text="Worktrees...", command=self.show_worktrees).pack(side=tk.LEFT, padx=2)
+        self.pipeline_preflight = tk.BooleanVar(value=True)
+        ttk.Checkbutton(run_frame, text="Preflight before running", variable=self.pipeline_preflight).pack(side=tk.LEFT, padx=5)
+        
+        self.pipeline_progress = ttk.Progressbar(exec_frame, maximum=100, length=400)
+        self.pipeline_progress.grid(row=4, column=0, columnspan=3, sticky=tk.W, padx=5)
+        self.pipeline_status = ttk.Label(exec_frame, text="Idle")
+        self.pipeline_status.grid(row=5, column=0, columnspan=3, sticky=tk.W, padx=5)
+        
+        # Telemetry
+        telemetry_frame = ttk.LabelFrame(tab, text="Telemetry")
+        telemetry_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.pipeline_telemetry = tk.BooleanVar()
+        ttk.Checkbutton(telemetry_frame, text="Write a Chrome trace and OpenMetrics file for every run",
+                        variable=self.pipeline_telemetry).grid(row=0, column=0, columnspan=3, sticky=tk.W, padx=5)
+        
+        ttk.Label(telemetry_frame, text="Metrics Directory:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.pipeline_metrics_dir = ttk.Entry(telemetry_frame, width=40)
+        self.pipeline_metrics_dir.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(telemetry_frame, text="Browse...", command=lambda: self.browse_directory(self.pipeline_metrics_dir)).grid(row=1, column=2, padx=5)
+        
+        # Watch mode
+        watch_frame = ttk.LabelFrame(tab, text="Watch Mode")
+        watch_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(watch_frame, text="Debounce (ms):").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.pipeline_watch_debounce = ttk.Spinbox(watch_frame, from_=50, to=10000, increment=50, width=7)
+        self.pipeline_watch_debounce.grid(row=0, column=1, sticky=tk.W, padx=5)
+        self.pipeline_watch_debounce.set(500)
+        self.watch_button = ttk.Button(watch_frame, text="Start Watching", command=self.toggle_watch)
+        self.watch_button.grid(row=0, column=2, sticky=tk.W, padx=5)
+        
+        self.pipeline_watch_status = ttk.Label(watch_frame, text="Rebuilds with --no-configure when files in the working directory change")
+        self.pipeline_watch_status.grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=5)
+        
+        # CPU calibration
+        calibration_frame = ttk.LabelFrame(tab, text="CPU Calibration")
+        calibration_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(calibration_frame, text="Probe Command:").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.pipeline_probe_command = ttk.Entry(calibration_frame, width=60)
+        self.pipeline_probe_command.grid(row=0, column=1, columnspan=2, sticky=tk.W, padx=5)
+        
+        ttk.Label(calibration_frame, text="CPU Levels:").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.pipeline_probe_levels = ttk.Entry(calibration_frame, width=20)
+        self.pipeline_probe_levels.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Button(calibration_frame, text="Calibrate", command=self.calibrate_cpu_count).grid(row=1, column=2, sticky=tk.W, padx=5)
+        
+        self.pipeline_cpu_status = ttk.Label(calibration_frame, text="")
+        self.pipeline_cpu_status.grid(row=2, column=0, columnspan=3, sticky=tk.W, padx=5)
+        self.show_cpu_count()
+        
+        # Memory governor
+        governor_frame = ttk.LabelFrame(tab, text="Memory Governor")
+        governor_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.pipeline_governor = tk.BooleanVar()
+        ttk.Checkbutton(governor_frame, text="Limit memory of running jobs", variable=self.pipeline_governor).grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=5)
+        
+        ttk.Label(governor_frame, text="Memory Ceiling (GB):").grid(row=1, column=0, sticky=tk.W, padx=5)
+        self.pipeline_memory_ceiling = ttk.Entry(governor_frame, width=10)
+        self.pipeline_memory_ceiling.grid(row=1, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(governor_frame, text="Keep Free (GB):").grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.pipeline_memory_reserve = ttk.Entry(governor_frame, width=10)
+        self.pipeline_memory_reserve.grid(row=2, column=1, sticky=tk.W, padx=5)
+        
+        self.governor_listbox = tk.Listbox(governor_frame, height=5)
+        self.governor_listbox.grid(row=3, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=5)
+        governor_frame.columnconfigure(2, weight=1)
+        governor_frame.rowconfigure(3, weight=1)
+    
+    def build_history(self):
+        if self.history is None:
+            self.history = BuildHistory()
+        return self.history
+    
+    def run_pipeline(self, resume=False):
+        if self.pipeline_runner and self.pipeline_runner.is_running():
+            return
+        self.collect_config_data()
+        steps = self.pipeline_steps(self.config['pipeline']['steps'])
+        if not steps:
+            messagebox.showerror("Error", "Select at least one pipeline step.")
+            return
+        
+        fingerprints = {step: config_fingerprint(self.config[step]) for step, _ in steps}
+        try:
+            checkpoint = Checkpoint(self.config['pipeline']['workdir'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read checkpoint: {str(e)}")
+            return
+        first = checkpoint.resume_index(steps, fingerprints) if resume else 0
+        if first == len(steps):
+            messagebox.showinfo("Resume", "All steps completed with the current configuration; nothing to resume.")
+            return
+        completed = steps[:first]
+        steps = steps[first:]
+        if self.config['install']['snapshots'] and self.config['install']['install_dir']:
+            if not self.switch_snapshot(self.build_snapshot_label()):
+                return
+        preflight = None
+        if self.config['pipeline']['preflight']:
+            preflight = Preflight(self.config, [step for step, _ in steps], self.config['pipeline']['workdir'])
+        try:
+            history = self.build_history()
+            hooks, overrides = self.pipeline_hooks(self, history, self.config['pipeline']['workdir'])
+            env = dict(os.environ, **overrides) if overrides else None
+            self.pipeline_trace = self.trace_recorder("pipeline")
+            if self.pipeline_trace:
+                hooks.insert(0, StepTracer(self.pipeline_trace, "pipeline"))
+            self.pipeline_runner = PipelineRunner(steps, fingerprints, history, cwd=self.config['pipeline']['workdir'],
+                                                  env=env, governor=self.memory_governor(), hooks=hooks,
+                                                  warm=self.warm_worker(), preflight=preflight,
+                                                  checkpoint=checkpoint)
+            checkpoint.truncate(first)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start pipeline: {str(e)}")
+            return
+        self.preview_text.delete(1.0, tk.END)
+        if completed:
+            self.preview_text.insert(tk.END, "Resuming at '{}'; up to date: {}\n".format(
+                steps[0][0], ", ".join(step for step, _ in completed)))
+        self.pipeline_runner.start()
+        self.start_pipeline_poll()
+    
+    def start_pipeline_poll(self):
+        # Only one poll_pipeline chain may run; a stale one would report the
+        # new runner's results and consume its trace
+        if self.pipeline_poll:
+            self.root.after_cancel(self.pipeline_poll)
+            self.pipeline_poll = None
+        self.poll_pipeline()
+    
+    def toggle_watch(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_button.config(text="Start Watching")
+            self.pipeline_watch_status.config(text="Not watching")
+            return
+        self.collect_config_data()
+        pipeline_cfg = self.config['pipeline']
+        root = pipeline_cfg['workdir'] or os.getcwd()
+        ignore = []
+        if self.config['install']['install_dir']:
+            install_dir = os.path.join(root, self.config['install']['install_dir'])
+            ignore += [install_dir, install_dir.rstrip("/\\") + ".snapshots"]
+        try:
+            debounce = int(pipeline_cfg['watch_debounce_ms'] or 500) / 1000.0
+        except ValueError as e:
+            messagebox.showerror("Error", f"Failed to start watching: {str(e)}")
+            return
+        self.watcher = SourceWatcher(root, ignore, debounce)
+        self.watch_pending = None
+        self.watcher.start()
+        self.watch_button.config(text="Stop Watching")
+        self.pipeline_watch_status.config(text=f"Watching {root}")
+        self.poll_watch()
+    
+    def poll_watch(self):
+        watcher = self.watcher
+        if watcher is None:
+            return
+        changed = set()
+        while True:
+            try:
+                changed |= watcher.changes.get_nowait()
+            except queue.Empty:
+                break
+        runner = self.pipeline_runner
+        running = runner is not None and runner.is_running()
+        if changed:
+            self.watch_pending = (self.watch_pending or set()) | changed
+            if running and self.watch_runner is runner:
+                # Newer edits make the build in flight pointless
+                runner.cancel()
+        if self.watch_pending and not running:
+            self.start_watch_build(self.watch_pending)
+            self.watch_pending = None
+        self.root.after(250, self.poll_watch)
+    
+    def start_watch_build(self, changed):
+        self.collect_config_data()
+        config = dict(self.config, build=dict(self.config['build'], no_configure=True))
+        commands = AutobuildCommands(config)
+        steps = commands.pipeline_steps(['build'])
+        try:
+            history = self.build_history()
+            hooks, overrides = self.pipeline_hooks(commands, history, config['pipeline']['workdir'], artifacts=False)
+            if self.pipeline_trace and self.pipeline_runner:
+                # The cancelled build still gets its trace
+                self.pipeline_trace.collect_runner(self.pipeline_runner, self.pipeline_trace.operation)
+                self.write_trace(self.pipeline_trace)
+            self.pipeline_trace = self.trace_recorder("watch")
+            if self.pipeline_trace:
+                hooks.insert(0, StepTracer(self.pipeline_trace, "watch"))
+            self.pipeline_runner = PipelineRunner(steps, {'build': config_fingerprint(config['build'])}, history,
+                                                  cwd=config['pipeline']['workdir'], env=dict(os.environ, **overrides),
+                                                  governor=self.memory_governor(), hooks=hooks, warm=self.warm_worker())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start watch build: {str(e)}")
+            return
+        self.watch_runner = self.pipeline_runner
+        self.preview_text.delete(1.0, tk.END)
+        names = sorted(os.path.relpath(path, self.watcher.root) for path in changed)
+        self.preview_text.insert(tk.END, "Changed: {}{}\n".format(", ".join(names[:10]), " ..." if len(names) > 10 else ""))
+        self.pipeline_watch_status.config(text=f"Watching {self.watcher.root} ({self.watcher.mode}); rebuilding")
+        self.pipeline_runner.start()
+        self.start_pipeline_poll()
+    
+    def calibrate_cpu_count(self):
+        if self.calibrator and self.calibrator.is_running():
+            return
+        self.collect_config_data()
+        pipeline_cfg = self.config['pipeline']
+        # Configure is repeatable, so it is the default probe
+        command = pipeline_cfg['probe_command'] or dict(self.pipeline_steps(['configure']))['configure']
+        try:
+            levels = [int(level) for level in re.split(r'[,\s]+', pipeline_cfg['probe_levels']) if level]
+            memory_limit = float(pipeline_cfg['memory_ceiling_gb']) * 1024 ** 3 if pipeline_cfg['memory_ceiling_gb'] else None
+        except ValueError as e:
+            messagebox.showerror("Error", f"Failed to start calibration: {str(e)}")
+            return
+        self.calibrator = CpuCalibrator(command, levels, pipeline_cfg['workdir'], memory_limit=memory_limit)
+        self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(tk.END, f"Calibrating with: {command}\n")
+        self.calibrator.start()
+        self.poll_calibration()
+    
+    def poll_calibration(self):
+        calibrator = self.calibrator
+        while True:
+            try:
+                self.preview_text.insert(tk.END, calibrator.output.get_nowait())
+            except queue.Empty:
+                break
+        self.preview_text.see(tk.END)
+        if calibrator.is_running():
+            done = len(calibrator.results)
+            self.pipeline_cpu_status.config(text=f"Calibrating: {done}/{len(calibrator.levels)} levels measured")
+            self.root.after(250, self.poll_calibration)
+            return
+        if calibrator.best:
+            self.cpu_counts[socket.gethostname()] = {
+                'cpu_count': calibrator.best,
+                'calibrated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'results': calibrator.results
+            }
+            self.collect_config_data()
+        self.show_cpu_count()
+    
+    def show_cpu_count(self):
+        calibrated = self.cpu_counts.get(socket.gethostname())
+        if calibrated:
+            self.pipeline_cpu_status.config(text="AUTOBUILD_CPU_COUNT={} on {} (calibrated {})".format(
+                calibrated['cpu_count'], socket.gethostname(), calibrated['calibrated']))
+        else:
+            self.pipeline_cpu_status.config(text=f"Not calibrated on {socket.gethostname()}")
+    
+    def trace_recorder(self, operation):
+        return TraceRecorder(operation) if self.pipeline_telemetry.get() else None
+    
+    def write_trace(self, recorder):
+        metrics_dir = self.pipeline_metrics_dir.get().strip() or os.path.join(STATE_DIR, "metrics")
+        try:
+            trace_file, metrics_file = recorder.write(os.path.join(STATE_DIR, "traces"), metrics_dir)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to write trace: {str(e)}")
+            return
+        self.preview_text.insert(tk.END, f"Trace: {trace_file}\nMetrics: {metrics_file}\n")
+        self.preview_text.see(tk.END)
+    
+    def pipeline_hooks(self, commands, history, workdir, artifacts=True):
+        # Runner hooks and environment overrides for one pipeline
+        hooks = []
+        env = {}
+        cpu_count = commands.cpu_count()
+        if cpu_count:
+            env['AUTOBUILD_CPU_COUNT'] = str(cpu_count)
+        package_cfg = commands.config['package']
+        if artifacts and package_cfg.get('artifact_cache') and package_cfg.get('artifact_location'):
+            store = make_blob_store(package_cfg['artifact_cache'], package_cfg['artifact_location'])
+            hooks.append(ArtifactCache(store, commands.config, workdir))
+        cache = commands.compiler_cache(history)
+        if cache:
+            cache.prepare()
+            env.update(cache.env())
+            hooks.append(cache)
+        return hooks, env
+    
+    def show_worktrees(self):
+        if self.worktree_window is not None and self.worktree_window.winfo_exists():
+            self.worktree_window.lift()
+            return
+        try:
+            self.workspace = self.workspace or Workspace()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load workspace: {str(e)}")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Worktrees")
+        window.geometry("1000x600")
+        self.worktree_window = window
+        
+        columns = ("branch", "path", "profile", "status")
+        self.worktree_tree = ttk.Treeview(window, columns=columns, height=6)
+        self.worktree_tree.heading("#0", text="Name")
+        for column in columns:
+            self.worktree_tree.heading(column, text=column.title())
+        self.worktree_tree.column("status", width=320)
+        self.worktree_tree.pack(fill=tk.X, padx=5, pady=5)
+        
+        btn_frame = ttk.Frame(window)
+        btn_frame.pack(fill=tk.X, padx=5)
+        ttk.Button(btn_frame, text="Add...", command=self.add_worktree).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Remove", command=self.remove_worktree).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Run All", command=self.run_worktrees).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Cancel All", command=self.cancel_worktrees).pack(side=tk.LEFT, padx=2)
+        
+        self.worktree_output = scrolledtext.ScrolledText(window, wrap=tk.NONE)
+        self.worktree_output.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.refresh_worktrees()
+    
+    def refresh_worktrees(self):
+        self.worktree_tree.delete(*self.worktree_tree.get_children())
+        for worktree in self.workspace.worktrees:
+            self.worktree_tree.insert("", tk.END, iid=worktree['name'], text=worktree['name'], values=(
+                Workspace.branch(worktree['path']), worktree['path'],
+                os.path.basename(worktree['profile']) or "(current)", ""))
+    
+    def add_worktree(self):
+        path = filedialog.askdirectory(title="Worktree")
+        if not path:
+            return
+        profile = filedialog.askopenfilename(title="Profile (cancel to use the current configuration)",
+                                             filetypes=[("JSON files", "*.json")])
+        try:
+            self.workspace.add(path, profile or "")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to add worktree: {str(e)}")
+            return
+        self.refresh_worktrees()
+    
+    def remove_worktree(self):
+        for name in self.worktree_tree.selection():
+            if name in self.worktree_runners and self.worktree_runners[name].is_running():
+                continue
+            self.workspace.remove(name)
+        self.refresh_worktrees()
+    
+    def run_worktrees(self):
+        if any(runner.is_running() for runner in self.worktree_runners.values()):
+            return
+        self.collect_config_data()
+        worktrees = self.workspace.worktrees
+        if not worktrees:
+            messagebox.showerror("Error", "Add at least one worktree.")
+            return
+        
+        runners = {}
+        tracer = self.trace_recorder("worktrees")
+        try:
+            history = self.build_history()
+            governor = self.memory_governor()
+            # One installable cache for all worktrees; CPUs split between them
+            cache_dir = (self.config['installables'].get('download_dir') or os.environ.get('AUTOBUILD_INSTALLABLE_CACHE')
+                         or os.path.join(STATE_DIR, "installable-cache"))
+            claimed = {}
+            for worktree in worktrees:
+                commands = AutobuildCommands(Workspace.profile_config(worktree, self.config, self.profiles))
+                # Outputs must not collide between worktrees
+                for section, key in (('install', 'install_dir'), ('package', 'archive_name')):
+                    value = commands.config[section].get(key)
+                    if not value:
+                        continue
+                    target = os.path.normcase(os.path.abspath(os.path.join(worktree['path'], value)))
+                    if target in claimed:
+                        raise ValueError(f"{worktree['name']} and {claimed[target]} share {key} {target}")
+                    claimed[target] = worktree['name']
+                steps = commands.pipeline_steps(commands.config['pipeline'].get('steps', self.DEFAULT_PIPELINE_STEPS))
+                fingerprints = {step: config_fingerprint(commands.config[step]) for step, _ in steps}
+                hooks, overrides = self.pipeline_hooks(commands, history, worktree['path'])
+                if tracer:
+                    hooks.insert(0, StepTracer(tracer, worktree['name']))
+                env = dict(os.environ, AUTOBUILD_INSTALLABLE_CACHE=cache_dir, **overrides)
+                cpu_count = int(overrides.get('AUTOBUILD_CPU_COUNT') or os.cpu_count() or 1)
+                env['AUTOBUILD_CPU_COUNT'] = str(max(1, cpu_count // len(worktrees)))
+                runners[worktree['name']] = PipelineRunner(steps, fingerprints, history, cwd=worktree['path'],
+                                                           env=env, governor=governor, hooks=hooks)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start worktree builds: {str(e)}")
+            return
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self.worktree_runners = runners
+        self.worktree_trace = tracer
+        self.worktree_output.delete(1.0, tk.END)
+        for runner in runners.values():
+            runner.start()
+        self.poll_worktrees()
+    
+    def cancel_worktrees(self):
+        for runner in self.worktree_runners.values():
+            if runner.is_running():
+                runner.cancel()
+    
+    def poll_worktrees(self):
+        visible = self.worktree_window is not None and self.worktree_window.winfo_exists()
+        lines = []
+        for name, runner in self.worktree_runners.items():
+            while True:
+                try:
+                    line = runner.output.get_nowait()
+                except queue.Empty:
+                    break
+                lines.append(f"[{name}] {line}")
+            if visible and self.worktree_tree.exists(name):
+                self.worktree_tree.set(name, "status", self.worktree_status(runner))
+        self.poll_governor()
+        if visible and lines:
+            self.worktree_output.insert(tk.END, "".join(lines))
+            self.worktree_output.see(tk.END)
+        if any(runner.is_running() for runner in self.worktree_runners.values()):
+            self.root.after(250, self.poll_worktrees)
+        elif self.worktree_trace:
+            for name, runner in self.worktree_runners.items():
+                self.worktree_trace.collect_runner(runner, name)
+            self.write_trace(self.worktree_trace)
+            self.worktree_trace = None
+    
+    @staticmethod
+    def worktree_status(runner):
+        fraction, remaining = runner.progress()
+        if runner.is_running():
+            idx = runner.current if runner.current is not None else len(runner.results)
+            status = f"{int(fraction * 100)}% {runner.steps[min(idx, len(runner.steps) - 1)][0]}"
+            if runner.waiting:
+                return status + " - waiting for memory"
+            if remaining is not None:
+                return status + f" - about {format_duration(remaining)} remaining"
+            return status
+        failed = [step for step, status, _ in runner.results if status != 0]
+        if runner.preflight_errors:
+            return "Preflight failed"
+        if runner.cancelled:
+            return "Cancelled"
+        if failed:
+            return f"Failed at {failed[0]}"
+        return "Finished" if runner.results else ""
+    
+    def show_preflight(self):
+        self.collect_config_data()
+        preflight = Preflight(self.config, self.config['pipeline']['steps'], self.config['pipeline']['workdir'])
+        
+        window = tk.Toplevel(self.root)
+        window.title("Preflight")
+        window.geometry("800x400")
+        summary = ttk.Label(window, text="Checking...")
+        summary.pack(fill=tk.X, padx=5, pady=5)
+        
+        columns = ("level", "step", "message")
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column.title())
+        tree.column("level", width=80, stretch=False)
+        tree.column("step", width=120, stretch=False)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        def done(findings, error):
+            if not window.winfo_exists():
+                return
+            if error:
+                summary.config(text=f"Preflight failed: {error}")
+                return
+            for level, step, message in findings:
+                tree.insert("", tk.END, values=(level, step or "general", message))
+            errors = sum(1 for f in findings if f[0] == 'error')
+            summary.config(text=f"{preflight.check_count} checks: {errors} errors, {len(findings) - errors} warnings")
+        
+        self.run_in_background(preflight.run, done, priority='interactive')
+    
+    def warm_worker(self):
+        # The worker survives between runs; a changed interpreter path restarts it
+        pipeline_cfg = self.config['pipeline']
+        if pipeline_cfg.get('execution_mode') != "warm interpreter":
+            return None
+        python = pipeline_cfg.get('python') or sys.executable
+        if self.warm_autobuild is None or self.warm_autobuild.python != python:
+            if self.warm_autobuild:
+                self.warm_autobuild.close()
+            self.warm_autobuild = WarmAutobuild(python)
+        self.warm_autobuild.start()
+        return self.warm_autobuild
+    
+    def memory_governor(self):
+        # One governor for every job the GUI starts, so concurrent jobs share the ceiling
+        pipeline_cfg = self.config['pipeline']
+        if not pipeline_cfg.get('governor'):
+            return None
+        ceiling = float(pipeline_cfg.get('memory_ceiling_gb') or 0) * 1024 ** 3
+        reserve = float(pipeline_cfg.get('memory_reserve_gb') or 0) * 1024 ** 3
+        if not ceiling:
+            raise ValueError("Set a memory ceiling for the governor.")
+        if self.governor is None:
+            self.governor = ResourceGovernor(ceiling, reserve)
+        else:
+            self.governor.set_limits(ceiling, reserve)
+        return self.governor
+    
+    def poll_governor(self):
+        if self.governor is None or self.governor.decision_count == self.governor_seen:
+            return
+        new_count = self.governor.decision_count - self.governor_seen
+        for stamp, message in list(self.governor.decisions)[-new_count:]:
+            self.governor_listbox.insert(tk.END, "{}  {}".format(datetime.fromtimestamp(stamp).strftime("%H:%M:%S"), message))
+        self.governor_seen = self.governor.decision_count
+        while self.governor_listbox.size() > 200:
+            self.governor_listbox.delete(0)
+        self.governor_listbox.see(tk.END)
+    
+    def cancel_pipeline(self):
+        if self.pipeline_runner and self.pipeline_runner.is_running():
+            self.pipeline_runner.cancel()
+        if self.calibrator and self.calibrator.is_running():
+            self.calibrator.cancel()
+    
+    def poll_pipeline(self):
+        self.pipeline_poll = None
+        runner = self.pipeline_runner
+        lines = []
+        while True:
+            try:
+                lines.append(runner.output.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.preview_text.insert(tk.END, "".join(lines))
+            self.preview_text.see(tk.END)
+        
+        self.poll_governor()
+        fraction, remaining = runner.progress()
+        self.pipeline_progress['value'] = fraction * 100
+        if runner.is_running():
+            idx = runner.current if runner.current is not None else len(runner.results)
+            status = f"Step {idx + 1}/{len(runner.steps)}: {runner.steps[min(idx, len(runner.steps) - 1)][0]}"
+            if runner.waiting:
+                status += " - waiting for memory"
+            elif remaining is not None:
+                status += f" - about {format_duration(remaining)} remaining"
+            else:
+                status += " - no history for an ETA yet"
+            self.pipeline_status.config(text=status)
+            self.pipeline_poll = self.root.after(250, self.poll_pipeline)
+            return
+        
+        if self.pipeline_trace:
+            self.pipeline_trace.collect_runner(runner, self.pipeline_trace.operation)
+            self.write_trace(self.pipeline_trace)
+            self.pipeline_trace = None
+        
+        total = sum(duration for _, _, duration in runner.results)
+        failed = [step for step, status, _ in runner.results if status != 0]
+        if runner.preflight_errors:
+            self.pipeline_status.config(text=f"Preflight found {len(runner.preflight_errors)} errors")
+        elif runner.cancelled:
+            self.pipeline_status.config(text=f"Cancelled after {format_duration(total)}")
+        elif failed:
+            self.pipeline_status.config(text=f"Failed at step '{failed[0]}' after {format_duration(total)}")
+        else:
+            self.pipeline_progress['value'] = 100
+            self.pipeline_status.config(text=f"Finished {len(runner.results)} steps in {format_duration(total)}")
+    
+    def show_history(self):
+        try:
+            history = self.build_history()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open build history: {str(e)}")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Build History")
+        window.geometry("800x500")
+        
+        top_frame = ttk.Frame(window)
+        top_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(top_frame, text="Step:").pack(side=tk.LEFT, padx=5)
+        step_combo = ttk.Combobox(top_frame, values=self.STEPS, state="readonly")
+        step_combo.pack(side=tk.LEFT, padx=5)
+        step_combo.set(self.STEPS[0])
+        
+        canvas = tk.Canvas(window, width=780, height=200, bg="white")
+        canvas.pack(fill=tk.X, padx=5, pady=5)
+        
+        columns = ("started", "duration", "status", "fingerprint", "host")
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column.title())
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        def refresh(*args):
+            runs = history.runs(step_combo.get())
+            tree.delete(*tree.get_children())
+            for step, fingerprint, host, started, duration, exit_status in runs:
+                tree.insert("", tk.END, values=(
+                    datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M:%S"),
+                    format_duration(duration), exit_status, (fingerprint or "")[:12], host))
+            self.draw_history_chart(canvas, list(reversed(runs)))
+        
+        step_combo.bind("<<ComboboxSelected>>", refresh)
+        refresh()
+    
+    def draw_history_chart(self, canvas, runs):
+        # Duration per run, oldest first; dashed lines mark config fingerprint changes
+        canvas.delete("all")
+        width, height, margin = int(canvas['width']), int(canvas['height']), 30
+        if not runs:
+            canvas.create_text(width // 2, height // 2, text="No runs recorded for this step")
+            return
+        longest = max(run[4] for run in runs) or 1
+        step_x = (width - 2 * margin) / max(1, len(runs) - 1)
+        points = []
+        for idx, (step, fingerprint, host, started, duration, exit_status) in enumerate(runs):
+            x = margin + idx * step_x
+            y = height - margin - (duration / longest) * (height - 2 * margin)
+            if idx and fingerprint != runs[idx - 1][1]:
+                canvas.create_line(x, margin, x, height - margin, dash=(3, 3), fill="gray")
+            points.append((x, y, exit_status))
+        for (x1, y1, _), (x2, y2, _) in zip(points, points[1:]):
+            canvas.create_line(x1, y1, x2, y2, fill="steelblue")
+        for x, y, exit_status in points:
+            color = "green" if exit_status == 0 else "red"
+            canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
+        canvas.create_line(margin, height - margin, width - margin, height - margin)
+        canvas.create_text(margin, margin - 15, text=format_duration(longest), anchor=tk.W)
+    
+    def browse_file(self, entry_widget):
+        filename = filedialog.askopenfilename()
+        if filename:
+            entry_widget.delete(0, tk.END)
+            entry_widget.insert(0, filename)
+    
+    def browse_directory(self, entry_widget):
+        dirname = filedialog.askdirectory()
+        if dirname:
+            entry_widget.delete(0, tk.END)
+            entry_widget.insert(0, dirname)
+    
+    def run_io(self, work, on_done):
+        # File I/O runs on the I/O pool so a slow mount cannot freeze the window
+        return self.run_in_background(work, on_done, interval=20, priority='interactive', scheduler=self.io_jobs)
+    
+    def save_config(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if filename:
+            self.collect_config_data()
+            config = copy.deepcopy(self.config)
+            parents = self.profile_parents
+            
+            def work():
+                # A layered profile is saved as its overrides of the inherited layers
+                profile = self.profiles.overlay(parents, config, filename) if parents else config
+                with open(filename, 'w') as f:
+                    json.dump(profile, f, indent=4)
+            
+            def done(result, error):
+                if error:
+                    messagebox.showerror("Error", f"Failed to save configuration: {str(error)}")
+                else:
+                    messagebox.showinfo("Success", "Configuration saved successfully!")
+            
+            self.run_io(work, done)
+    
+    def load_config(self):
+        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        if filename:
+            def done(result, error):
+                if error:
+                    messagebox.showerror("Error", f"Failed to load configuration: {str(error)}")
+                    return
+                self.config, self.profile_parents = result
+                self.apply_config_data()
+                messagebox.showinfo("Success", "Configuration loaded successfully!")
+            
+            self.run_io(lambda: (self.profiles.resolve(filename), self.profiles.inherits(filename)), done)
     
-    def generate_edit_command(self):
-        cmd = ":: Edit command\n"
-        cmd += f"autobuild edit {self.config['edit']['subcommand']}"
-        
-        # Add standard options
-        if self.config['edit']['debug']:
-            cmd += " --debug"
-        if self.config['edit']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['edit']['verbose']:
-            cmd += " --verbose"
-        if self.config['edit']['quiet']:
-            cmd += " --quiet"
+    def load_default_config(self):
+        # Try to load default config if it exists
+        default_config = "autobuild_config.json"
         
-        # Add command-specific options
-        if self.config['edit']['config_file']:
-            cmd += f" --config-file {self.config['edit']['config_file']}"
-        if self.config['edit']['delete']:
-            cmd += " --delete"
+        def work():
+            if os.path.exists(default_config):
+                return self.profiles.resolve(default_config), self.profiles.inherits(default_config)
         
-        # Add subcommand-specific options
-        if self.config['edit']['subcommand'] == "build" and self.config['edit']['build_command']:
-            cmd += f" {self.config['edit']['build_command']}"
-        elif self.config['edit']['subcommand'] == "configure" and self.config['edit']['configure_command']:
-            cmd += f" {self.config['edit']['configure_command']}"
-        elif self.config['edit']['subcommand'] == "package" and self.config['edit']['package_name']:
-            cmd += f" {self.config['edit']['package_name']}"
-        elif self.config['edit']['subcommand'] == "platform" and self.config['edit']['platform_name']:
-            cmd += f" {self.config['edit']['platform_name']}"
+        def done(result, error):
+            if result and not error:  # Silently fail if default config can't be loaded
+                self.config, self.profile_parents = result
+                self.apply_config_data()
         
-        return cmd + "\n\n"
+        self.run_io(work, done)
     
-    def generate_install_command(self):
-        cmd = ":: Install command\n"
-        cmd += "autobuild install"
+    def collect_config_data(self):
+        # Build tab
+        self.config['build'] = {
+            'debug': self.build_debug.get(),
+            'dry_run': self.build_dry_run.get(),
+            'verbose': self.build_verbose.get(),
+            'quiet': self.build_quiet.get(),
+            'configuration': self.build_configuration.get(),
+            'all_configs': self.build_all_configs.get(),
+            'no_configure': self.build_no_configure.get(),
+            'build_id': self.build_id.get(),
+            'address_size': self.build_address_size.get(),
+            'additional_options': self.build_additional_options.get(),
+            'compiler_cache': self.build_compiler_cache.get(),
+            'cache_dir': self.build_cache_dir.get(),
+            'cache_size': self.build_cache_size.get()
+        }
         
-        # Add standard options
-        if self.config['install']['debug']:
-            cmd += " --debug"
-        if self.config['install']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['install']['verbose']:
-            cmd += " --verbose"
-        if self.config['install']['quiet']:
-            cmd += " --quiet"
+        # Configure tab
+        self.config['configure'] = {
+            'debug': self.configure_debug.get(),
+            'dry_run': self.configure_dry_run.get(),
+            'verbose': self.configure_verbose.get(),
+            'quiet': self.configure_quiet.get(),
+            'all_configs': self.configure_all_configs.get(),
+            'configuration': self.configure_configuration.get(),
+            'address_size': self.configure_address_size.get(),
+            'additional_options': self.configure_additional_options.get()
+        }
         
-        # Add command-specific options
-        if self.config['install']['config_file']:
-            cmd += f" --config-file {self.config['install']['config_file']}"
-        if self.config['install']['install_dir']:
-            cmd += f" --install-dir {self.config['install']['install_dir']}"
-        if self.config['install']['manifest_file']:
-            cmd += f" --installed-manifest {self.config['install']['manifest_file']}"
-        if self.config['install']['export_manifest']:
-            cmd += " --export-manifest"
-        if self.config['install']['list']:
-            cmd += " --list"
-        if self.config['install']['list_installed']:
-            cmd += " --list-installed"
-        if self.config['install']['list_licenses']:
-            cmd += " --list-licenses"
-        if self.config['install']['platform']:
-            cmd += f" --platform {self.config['install']['platform']}"
+        # Edit tab
+        self.config['edit'] = {
+            'debug': self.edit_debug.get(),
+            'dry_run': self.edit_dry_run.get(),
+            'verbose': self.edit_verbose.get(),
+            'quiet': self.edit_quiet.get(),
+            'subcommand': self.edit_subcommand.get(),
+            'config_file': self.edit_config_file.get(),
+            'delete': self.edit_delete.get(),
+            'build_command': self.edit_build_command.get(),
+            'configure_command': self.edit_configure_command.get(),
+            'package_name': self.edit_package_name.get(),
+            'platform_name': self.edit_platform_name.get()
+        }
         
-        # Add packages
-        if self.config['install']['packages']:
-            cmd += " " + " ".join(self.config['install']['packages'])
+        # Install tab
+        self.config['install'] = {
+            'debug': self.install_debug.get(),
+            'dry_run': self.install_dry_run.get(),
+            'verbose': self.install_verbose.get(),
+            'quiet': self.install_quiet.get(),
+            'config_file': self.install_config_file.get(),
+            'install_dir': self.install_dir.get(),
+            'manifest_file': self.install_manifest_file.get(),
+            'export_manifest': self.install_export_manifest.get(),
+            'list': self.install_list.get(),
+            'list_installed': self.install_list_installed.get(),
+            'list_licenses': self.install_list_licenses.get(),
+            'platform': self.install_platform.get(),
+            'store_dir': self.install_store_dir.get(),
+            'extract_jobs': self.install_extract_jobs.get(),
+            'snapshots': self.install_snapshots.get(),
+            'delta': self.install_delta.get(),
+            'packages': PackageSet.of(self.packages_listbox.get(0, tk.END))
+        }
         
-        return cmd + "\n\n"
-    
-    def generate_installables_command(self):
-        cmd = ":: Installables command\n"
-        cmd += f"autobuild installables {self.config['installables']['command']}"
+        # Installables tab
+        self.config['installables'] = {
+            'debug': self.installables_debug.get(),
+            'dry_run': self.installables_dry_run.get(),
+            'verbose': self.installables_verbose.get(),
+            'quiet': self.installables_quiet.get(),
+            'config_file': self.installables_config_file.get(),
+            'command': self.installables_command.get(),
+            'pkg_name': self.installables_pkg_name.get(),
+            'creds': self.installables_creds.get(),
+            'url': self.installables_url.get(),
+            'hash': self.installables_hash.get(),
+            'hash_alg': self.installables_hash_alg.get(),
+            'archive': self.installables_archive.get(),
+            'download_dir': self.installables_download_dir.get(),
+            'download_jobs': self.installables_download_jobs.get(),
+            'downloads': list(self.download_queue)
+        }
         
-        # Add standard options
-        if self.config['installables']['debug']:
-            cmd += " --debug"
-        if self.config['installables']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['installables']['verbose']:
-            cmd += " --verbose"
-        if self.config['installables']['quiet']:
-            cmd += " --quiet"
+        # Manifest tab
+        self.config['manifest'] = {
+            'debug': self.manifest_debug.get(),
+            'dry_run': self.manifest_dry_run.get(),
+            'verbose': self.manifest_verbose.get(),
+            'quiet': self.manifest_quiet.get(),
+            'config_file': self.manifest_config_file.get(),
+            'platform': self.manifest_platform.get(),
+            'command': self.manifest_command.get(),
+            'patterns': PackageSet.of(self.patterns_listbox.get(0, tk.END))
+        }
         
-        # Add command-specific options
-        if self.config['installables']['config_file']:
-            cmd += f" --config-file {self.config['installables']['config_file']}"
-        if self.config['installables']['archive']:
-            cmd += f" --archive {self.config['installables']['archive']}"
+        # Package tab
+        self.config['package'] = {
+            'debug': self.package_debug.get(),
+            'dry_run': self.package_dry_run.get(),
+            'verbose': self.package_verbose.get(),
+            'quiet': self.package_quiet.get(),
+            'config_file': self.package_config_file.get(),
+            'archive_name': self.package_archive_name.get(),
+            'platform': self.package_platform.get(),
+            'artifact_cache': self.package_artifact_cache.get(),
+            'artifact_location': self.package_artifact_location.get(),
+            'stage_dir': self.package_stage_dir.get(),
+            'stage_mode': self.package_stage_mode.get()
+        }
         
-        # Add package name and attributes
-        if self.config['installables']['pkg_name']:
-            cmd += f" {self.config['installables']['pkg_name']}"
-            attrs = []
-            if self.config['installables']['creds']:
-                attrs.append(f"creds={self.config['installables']['creds']}")
-            if self.config['installables']['url']:
-                attrs.append(f"url={self.config['installables']['url']}")
-            if self.config['installables']['hash']:
-                attrs.append(f"hash={self.config['installables']['hash']}")
-            if self.config['installables']['hash_alg']:
-                attrs.append(f"hash_algorithm={self.config['installables']['hash_alg']}")
-            
-            if attrs:
-                cmd += " " + " ".join(attrs)
+        # Print tab
+        self.config['print'] = {
+            'debug': self.print_debug.get(),
+            'dry_run': self.print_dry_run.get(),
+            'verbose': self.print_verbose.get(),
+            'quiet': self.print_quiet.get(),
+            'config_file': self.print_config_file.get(),
+            'json': self.print_json.get()
+        }
         
-        return cmd + "\n\n"
-    
-    def generate_manifest_command(self):
-        cmd = ":: Manifest command\n"
-        cmd += f"autobuild manifest {self.config['manifest']['command']}"
+        # Source Environment tab
+        self.config['source_environment'] = {
+            'debug': self.source_debug.get(),
+            'dry_run': self.source_dry_run.get(),
+            'verbose': self.source_verbose.get(),
+            'quiet': self.source_quiet.get(),
+            'vars_file': self.source_vars_file.get()
+        }
         
-        # Add standard options
-        if self.config['manifest']['debug']:
-            cmd += " --debug"
-        if self.config['manifest']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['manifest']['verbose']:
-            cmd += " --verbose"
-        if self.config['manifest']['quiet']:
-            cmd += " --quiet"
+        # Uninstall tab
+        self.config['uninstall'] = {
+            'debug': self.uninstall_debug.get(),
+            'dry_run': self.uninstall_dry_run.get(),
+            'verbose': self.uninstall_verbose.get(),
+            'quiet': self.uninstall_quiet.get(),
+            'config_file': self.uninstall_config_file.get(),
+            'install_dir': self.uninstall_dir.get(),
+            'manifest_file': self.uninstall_manifest_file.get(),
+            'packages': PackageSet.of(self.uninstall_packages_listbox.get(0, tk.END))
+        }
         
-        # Add command-specific options
-        if self.config['manifest']['config_file']:
-            cmd += f" --config-file {self.config['manifest']['config_file']}"
-        if self.config['manifest']['platform']:
-            cmd += f" --platform {self.config['manifest']['platform']}"
+        # Upload tab
+        self.config['upload'] = {
+            'debug': self.upload_debug.get(),
+            'dry_run': self.upload_dry_run.get(),
+            'verbose': self.upload_verbose.get(),
+            'quiet': self.upload_quiet.get(),
+            'archive': self.upload_archive.get(),
+            'to_s3': self.upload_to_s3.get(),
+            'credentials': self.upload_credentials.get(),
+            'chunk_store': self.upload_chunk_store.get(),
+            'chunk_location': self.upload_chunk_location.get()
+        }
         
-        # Add patterns for add command
-        if self.config['manifest']['command'] == "add" and self.config['manifest']['patterns']:
-            cmd += " " + " ".join(self.config['manifest']['patterns'])
+        # Pipeline tab
+        self.config['pipeline'] = {
+            'steps': [step for step in self.STEPS if self.pipeline_step_vars[step].get()],
+            'workdir': self.pipeline_workdir.get(),
+            'execution_mode': self.pipeline_execution_mode.get(),
+            'python': self.pipeline_python.get(),
+            'preflight': self.pipeline_preflight.get(),
+            'watch_debounce_ms': self.pipeline_watch_debounce.get(),
+            'telemetry': self.pipeline_telemetry.get(),
+            'metrics_dir': self.pipeline_metrics_dir.get(),
+            'probe_command': self.pipeline_probe_command.get(),
+            'probe_levels': self.pipeline_probe_levels.get(),
+            'cpu_counts': self.cpu_counts,
+            'governor': self.pipeline_governor.get(),
+            'memory_ceiling_gb': self.pipeline_memory_ceiling.get(),
+            'memory_reserve_gb': self.pipeline_memory_reserve.get()
+        }
+    
+    def apply_config_data(self):
+        # Build tab
+        build_cfg = self.config.get('build', {})
+        self.build_debug.set(build_cfg.get('debug', False))
+        self.build_dry_run.set(build_cfg.get('dry_run', False))
+        self.build_verbose.set(build_cfg.get('verbose', False))
+        self.build_quiet.set(build_cfg.get('quiet', False))
+        self.build_configuration.set(build_cfg.get('configuration', ''))
+        self.build_all_configs.set(build_cfg.get('all_configs', False))
+        self.build_no_configure.set(build_cfg.get('no_configure', False))
+        self.build_id.delete(0, tk.END)
+        self.build_id.insert(0, build_cfg.get('build_id', ''))
+        self.build_address_size.set(build_cfg.get('address_size', ''))
+        self.build_additional_options.delete(0, tk.END)
+        self.build_additional_options.insert(0, build_cfg.get('additional_options', ''))
+        self.build_compiler_cache.set(build_cfg.get('compiler_cache', ''))
+        self.build_cache_dir.delete(0, tk.END)
+        self.build_cache_dir.insert(0, build_cfg.get('cache_dir', ''))
+        self.build_cache_size.delete(0, tk.END)
+        self.build_cache_size.insert(0, build_cfg.get('cache_size', ''))
         
-        return cmd + "\n\n"
-    
-    def generate_package_command(self):
-        cmd = ":: Package command\n"
-        cmd += "autobuild package"
+        # Configure tab
+        configure_cfg = self.config.get('configure', {})
+        self.configure_debug.set(configure_cfg.get('debug', False))
+        self.configure_dry_run.set(configure_cfg.get('dry_run', False))
+        self.configure_verbose.set(configure_cfg.get('verbose', False))
+        self.configure_quiet.set(configure_cfg.get('quiet', False))
+        self.configure_all_configs.set(configure_cfg.get('all_configs', False))
+        self.configure_configuration.set(configure_cfg.get('configuration', ''))
+        self.configure_address_size.set(configure_cfg.get('address_size', ''))
+        self.configure_additional_options.delete(0, tk.END)
+        self.configure_additional_options.insert(0, configure_cfg.get('additional_options', ''))
         
-        # Add standard options
-        if self.config['package']['debug']:
-            cmd += " --debug"
-        if self.config['package']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['package']['verbose']:
-            cmd += " --verbose"
-        if self.config['package']['quiet']:
-            cmd += " --quiet"
+        # Edit tab
+        edit_cfg = self.config.get('edit', {})
+        self.edit_debug.set(edit_cfg.get('debug', False))
+        self.edit_dry_run.set(edit_cfg.get('dry_run', False))
+        self.edit_verbose.set(edit_cfg.get('verbose', False))
+        self.edit_quiet.set(edit_cfg.get('quiet', False))
+        self.edit_subcommand.set(edit_cfg.get('subcommand', 'build'))
+        self.edit_config_file.delete(0, tk.END)
+        self.edit_config_file.insert(0, edit_cfg.get('config_file', ''))
+        self.edit_delete.set(edit_cfg.get('delete', False))
+        self.edit_build_command.delete(0, tk.END)
+        self.edit_build_command.insert(0, edit_cfg.get('build_command', ''))
+        self.edit_configure_command.delete(0, tk.END)
+        self.edit_configure_command.insert(0, edit_cfg.get('configure_command', ''))
+        self.edit_package_name.delete(0, tk.END)
+        self.edit_package_name.insert(0, edit_cfg.get('package_name', ''))
+        self.edit_platform_name.set(edit_cfg.get('platform_name', ''))
         
-        # Add command-specific options
-        if self.config['package']['config_file']:
-            cmd += f" --config-file {self.config['package']['config_file']}"
-        if self.config['package']['archive_name']:
-            cmd += f" --archive-name {self.config['package']['archive_name']}"
-        if self.config['package']['platform']:
-            cmd += f" --platform {self.config['package']['platform']}"
+        # Install tab
+        install_cfg = self.config.get('install', {})
+        self.install_debug.set(install_cfg.get('debug', False))
+        self.install_dry_run.set(install_cfg.get('dry_run', False))
+        self.install_verbose.set(install_cfg.get('verbose', False))
+        self.install_quiet.set(install_cfg.get('quiet', False))
+        self.install_config_file.delete(0, tk.END)
+        self.install_config_file.insert(0, install_cfg.get('config_file', ''))
+        self.install_dir.delete(0, tk.END)
+        self.install_dir.insert(0, install_cfg.get('install_dir', ''))
+        self.install_manifest_file.delete(0, tk.END)
+        self.install_manifest_file.insert(0, install_cfg.get('manifest_file', ''))
+        self.install_export_manifest.set(install_cfg.get('export_manifest', False))
+        self.install_list.set(install_cfg.get('list', False))
+        self.install_list_installed.set(install_cfg.get('list_installed', False))
+        self.install_list_licenses.set(install_cfg.get('list_licenses', False))
+        self.install_platform.set(install_cfg.get('platform', ''))
+        self.install_store_dir.delete(0, tk.END)
+        self.install_store_dir.insert(0, install_cfg.get('store_dir', ''))
+        self.install_extract_jobs.set(install_cfg.get('extract_jobs', os.cpu_count() or 1))
+        self.install_snapshots.set(install_cfg.get('snapshots', False))
+        self.install_delta.set(install_cfg.get('delta', False))
         
-        return cmd + "\n\n"
-    
-    def generate_print_command(self):
-        cmd = ":: Print command\n"
-        cmd += "autobuild print"
+        # Update packages listbox
+        self.packages_listbox.delete(0, tk.END)
+        for pkg in install_cfg.get('packages', []):
+            self.packages_listbox.insert(tk.END, pkg)
         
-        # Add standard options
-        if self.config['print']['debug']:
-            cmd += " --debug"
-        if self.config['print']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['print']['verbose']:
-            cmd += " --verbose"
-        if self.config['print']['quiet']:
-            cmd += " --quiet"
+        # Installables tab
+        installables_cfg = self.config.get('installables', {})
+        self.installables_debug.set(installables_cfg.get('debug', False))
+        self.installables_dry_run.set(installables_cfg.get('dry_run', False))
+        self.installables_verbose.set(installables_cfg.get('verbose', False))
+        self.installables_quiet.set(installables_cfg.get('quiet', False))
+        self.installables_config_file.delete(0, tk.END)
+        self.installables_config_file.insert(0, installables_cfg.get('config_file', ''))
+        self.installables_command.set(installables_cfg.get('command', 'add'))
+        self.installables_pkg_name.delete(0, tk.END)
+        self.installables_pkg_name.insert(0, installables_cfg.get('pkg_name', ''))
+        self.installables_creds.set(installables_cfg.get('creds', ''))
+        self.installables_url.delete(0, tk.END)
+        self.installables_url.insert(0, installables_cfg.get('url', ''))
+        self.installables_hash.delete(0, tk.END)
+        self.installables_hash.insert(0, installables_cfg.get('hash', ''))
+        self.installables_hash_alg.set(installables_cfg.get('hash_alg', ''))
+        self.installables_archive.delete(0, tk.END)
+        self.installables_archive.insert(0, installables_cfg.get('archive', ''))
+        self.installables_download_dir.delete(0, tk.END)
+        self.installables_download_dir.insert(0, installables_cfg.get('download_dir', os.environ.get('AUTOBUILD_INSTALLABLE_CACHE', '')))
+        self.installables_download_jobs.set(installables_cfg.get('download_jobs', 4))
         
-        # Add command-specific options
-        if self.config['print']['config_file']:
-            cmd += f" --config-file {self.config['print']['config_file']}"
-        if self.config['print']['json']:
-            cmd += " --json"
+        # Update downloads listbox
+        self.download_queue = list(installables_cfg.get('downloads', []))
+        self.downloads_listbox.delete(0, tk.END)
+        for item in self.download_queue:
+            self.downloads_listbox.insert(tk.END, item['url'])
         
-        return cmd + "\n\n"
-    
-    def generate_source_environment_command(self):
-        cmd = ":: Source Environment command\n"
-        cmd += "autobuild source_environment"
+        # Manifest tab
+        manifest_cfg = self.config.get('manifest', {})
+        self.manifest_debug.set(manifest_cfg.get('debug', False))
+        self.manifest_dry_run.set(manifest_cfg.get('dry_run', False))
+        self.manifest_verbose.set(manifest_cfg.get('verbose', False))
+        self.manifest_quiet.set(manifest_cfg.get('quiet', False))
+        self.manifest_config_file.delete(0, tk.END)
+        self.manifest_config_file.insert(0, manifest_cfg.get('config_file', ''))
+        self.manifest_platform.set(manifest_cfg.get('platform', ''))
+        self.manifest_command.set(manifest_cfg.get('command', 'add'))
         
-        # Add standard options
-        if self.config['source_environment']['debug']:
-            cmd += " --debug"
-        if self.config['source_environment']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['source_environment']['verbose']:
-            cmd += " --verbose"
-        if self.config['source_environment']['quiet']:
-            cmd += " --quiet"
+        # Update patterns listbox
+        self.patterns_listbox.delete(0, tk.END)
+        for pattern in manifest_cfg.get('patterns', []):
+            self.patterns_listbox.insert(tk.END, pattern)
         
-        # Add command-specific options
-        if self.config['source_environment']['vars_file']:
-            cmd += f" {self.config['source_environment']['vars_file']}"
+        # Package tab
+        package_cfg = self.config.get('package', {})
+        self.package_debug.set(package_cfg.get('debug', False))
+        self.package_dry_run.set(package_cfg.get('dry_run', False))
+        self.package_verbose.set(package_cfg.get('verbose', False))
+        self.package_quiet.set(package_cfg.get('quiet', False))
+        self.package_config_file.delete(0, tk.END)
+        self.package_config_file.insert(0, package_cfg.get('config_file', ''))
+        self.package_archive_name.delete(0, tk.END)
+        self.package_archive_name.insert(0, package_cfg.get('archive_name', ''))
+        self.package_platform.set(package_cfg.get('platform', ''))
+        self.package_artifact_cache.set(package_cfg.get('artifact_cache', ''))
+        self.package_artifact_location.delete(0, tk.END)
+        self.package_artifact_location.insert(0, package_cfg.get('artifact_location', ''))
+        self.package_stage_dir.delete(0, tk.END)
+        self.package_stage_dir.insert(0, package_cfg.get('stage_dir', ''))
+        self.package_stage_mode.set(package_cfg.get('stage_mode', 'full'))
         
-        return cmd + "\n\n"
-    
-    def generate_uninstall_command(self):
-        cmd = ":: Uninstall command\n"
-        cmd += "autobuild uninstall"
+        # Print tab
+        print_cfg = self.config.get('print', {})
+        self.print_debug.set(print_cfg.get('debug', False))
+        self.print_dry_run.set(print_cfg.get('dry_run', False))
+        self.print_verbose.set(print_cfg.get('verbose', False))
+        self.print_quiet.set(print_cfg.get('quiet', False))
+        self.print_config_file.delete(0, tk.END)
+        self.print_config_file.insert(0, print_cfg.get('config_file', ''))
+        self.print_json.set(print_cfg.get('json', False))
         
-        # Add standard options
-        if self.config['uninstall']['debug']:
-            cmd += " --debug"
-        if self.config['uninstall']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['uninstall']['verbose']:
-            cmd += " --verbose"
-        if self.config['uninstall']['quiet']:
-            cmd += " --quiet"
+        # Source Environment tab
+        source_cfg = self.config.get('source_environment', {})
+        self.source_debug.set(source_cfg.get('debug', False))
+        self.source_dry_run.set(source_cfg.get('dry_run', False))
+        self.source_verbose.set(source_cfg.get('verbose', False))
+        self.source_quiet.set(source_cfg.get('quiet', False))
+        self.source_vars_file.delete(0, tk.END)
+        self.source_vars_file.insert(0, source_cfg.get('vars_file', ''))
         
-        # Add command-specific options
-        if self.config['uninstall']['config_file']:
-            cmd += f" --config-file {self.config['uninstall']['config_file']}"
-        if self.config['uninstall']['install_dir']:
-            cmd += f" --install-dir {self.config['uninstall']['install_dir']}"
-        if self.config['uninstall']['manifest_file']:
-            cmd += f" --installed-manifest {self.config['uninstall']['manifest_file']}"
+        # Uninstall tab
+        uninstall_cfg = self.config.get('uninstall', {})
+        self.uninstall_debug.set(uninstall_cfg.get('debug', False))
+        self.uninstall_dry_run.set(uninstall_cfg.get('dry_run', False))
+        self.uninstall_verbose.set(uninstall_cfg.get('verbose', False))
+        self.uninstall_quiet.set(uninstall_cfg.get('quiet', False))
+        self.uninstall_config_file.delete(0, tk.END)
+        self.uninstall_config_file.insert(0, uninstall_cfg.get('config_file', ''))
+        self.uninstall_dir.delete(0, tk.END)
+        self.uninstall_dir.insert(0, uninstall_cfg.get('install_dir', ''))
+        self.uninstall_manifest_file.delete(0, tk.END)
+        self.uninstall_manifest_file.insert(0, uninstall_cfg.get('manifest_file', ''))
         
-        # Add packages
-        if self.config['uninstall']['packages']:
-            cmd += " " + " ".join(self.config['uninstall']['packages'])
+        # Update uninstall packages listbox
+        self.uninstall_packages_listbox.delete(0, tk.END)
+        for pkg in uninstall_cfg.get('packages', []):
+            self.uninstall_packages_listbox.insert(tk.END, pkg)
         
-        return cmd + "\n\n"
+        # Upload tab
+        upload_cfg = self.config.get('upload', {})
+        self.upload_debug.set(upload_cfg.get('debug', False))
+        self.upload_dry_run.set(upload_cfg.get('dry_run', False))
+        self.upload_verbose.set(upload_cfg.get('verbose', False))
+        self.upload_quiet.set(upload_cfg.get('quiet', False))
+        self.upload_archive.delete(0, tk.END)
+        self.upload_archive.insert(0, upload_cfg.get('archive', ''))
+        self.upload_to_s3.set(upload_cfg.get('to_s3', False))
+        self.upload_credentials.delete(0, tk.END)
+        self.upload_credentials.insert(0, upload_cfg.get('credentials', ''))
+        self.upload_chunk_store.set(upload_cfg.get('chunk_store', 'local'))
+        self.upload_chunk_location.delete(0, tk.END)
+        self.upload_chunk_location.insert(0, upload_cfg.get('chunk_location', ''))
+        
+        # Pipeline tab
+        pipeline_cfg = self.config.get('pipeline', {})
+        enabled_steps = pipeline_cfg.get('steps', self.DEFAULT_PIPELINE_STEPS)
+        for step, var in self.pipeline_step_vars.items():
+            var.set(step in enabled_steps)
+        self.pipeline_workdir.delete(0, tk.END)
+        self.pipeline_workdir.insert(0, pipeline_cfg.get('workdir', ''))
+        self.pipeline_execution_mode.set(pipeline_cfg.get('execution_mode', 'subprocess'))
+        self.pipeline_python.delete(0, tk.END)
+        self.pipeline_python.insert(0, pipeline_cfg.get('python', ''))
+        self.pipeline_preflight.set(pipeline_cfg.get('preflight', True))
+        self.pipeline_watch_debounce.set(pipeline_cfg.get('watch_debounce_ms', 500))
+        self.pipeline_telemetry.set(pipeline_cfg.get('telemetry', False))
+        self.pipeline_metrics_dir.delete(0, tk.END)
+        self.pipeline_metrics_dir.insert(0, pipeline_cfg.get('metrics_dir', ''))
+        self.pipeline_probe_command.delete(0, tk.END)
+        self.pipeline_probe_command.insert(0, pipeline_cfg.get('probe_command', ''))
+        self.pipeline_probe_levels.delete(0, tk.END)
+        self.pipeline_probe_levels.insert(0, pipeline_cfg.get('probe_levels', ''))
+        self.cpu_counts = pipeline_cfg.get('cpu_counts', {})
+        self.show_cpu_count()
+        self.pipeline_governor.set(pipeline_cfg.get('governor', False))
+        self.pipeline_memory_ceiling.delete(0, tk.END)
+        self.pipeline_memory_ceiling.insert(0, pipeline_cfg.get('memory_ceiling_gb', ''))
+        self.pipeline_memory_reserve.delete(0, tk.END)
+        self.pipeline_memory_reserve.insert(0, pipeline_cfg.get('memory_reserve_gb', ''))
     
-    def generate_upload_command(self):
-        cmd = ":: Upload command\n"
-        cmd += f"autobuild upload {self.config['upload']['archive']}"
-        
-        # Add standard options
-        if self.config['upload']['debug']:
-            cmd += " --debug"
-        if self.config['upload']['dry_run']:
-            cmd += " --dry-run"
-        if self.config['upload']['verbose']:
-            cmd += " --verbose"
-        if self.config['upload']['quiet']:
-            cmd += " --quiet"
+    def generate_batch(self):
+        self.collect_config_data()
+        batch_content = self.render_batch()
         
-        # Add command-specific options
-        if self.config['upload']['to_s3']:
-            cmd += " --upload-to-s3"
-        if self.config['upload']['credentials']:
-            cmd += f" --credentials {self.config['upload']['credentials']}"
+        # Show preview
+        self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(tk.END, batch_content)
         
-        return cmd + "\n\n"
+        # Ask to save file
+        if messagebox.askyesno("Save Batch File", "Would you like to save the batch file?"):
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".bat",
+                filetypes=[("Batch files", "*.bat"), ("All files", "*.*")],
+                initialfile="build_viewer.bat"
+            )
+            if filename:
+                def work():
+                    with open(filename, 'w') as f:
+                        f.write(batch_content)
+                
+                def done(result, error):
+                    if error:
+                        messagebox.showerror("Error", f"Failed to save batch file: {str(error)}")
+                    else:
+                        messagebox.showinfo("Success", "Batch file saved successfully!")
+                
+                self.run_io(work, done)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = AutobuildGUI(root)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Autobuild Configuration Tool")
+    parser.add_argument("--serve", action="store_true", help="render scripts for other tools instead of opening the GUI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--profiles", default=".", help="directory of saved configurations served by name")
+    args = parser.parse_args()
+    if args.serve:
+        try:
+            asyncio.run(ScriptServer(args.profiles).serve(args.host, args.port, args.socket))
+        except KeyboardInterrupt:
+            pass
+    else:
+        root = tk.Tk()
+        app = AutobuildGUI(root)
+        root.mainloop()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import http.server
+import threading
+
+
+class ObjectStoreHandler(http.server.BaseHTTPRequestHandler):
+    # HEAD/GET/PUT object store kept in server.objects, keyed by path
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.server.calls.append(("HEAD", self.path))
+        if self.path in self.server.objects:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(self.server.objects[self.path])))
+            self.end_headers()
+        else:
+            self.reply(404)
+    
+    def do_GET(self):
+        self.server.calls.append(("GET", self.path))
+        if self.path in self.server.objects:
+            self.reply(200, self.server.objects[self.path])
+        else:
+            self.reply(404)
+    
+    def do_PUT(self):
+        self.server.calls.append(("PUT", self.path))
+        self.server.objects[self.path] = self.rfile.read(int(self.headers['Content-Length']))
+        self.reply(201)
+
+
+def start_object_store():
+    # Returns (server, base URL); call server.shutdown() when done
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ObjectStoreHandler)
+    server.objects = {}
+    server.calls = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/store"
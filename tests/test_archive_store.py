@@ -0,0 +1,78 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AutobuildGUI
+from AutobuildGUI import ArchiveStore
+
+
+class ArchiveStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.store = ArchiveStore(os.path.join(self.tmp, "store"))
+        self.install_dir = os.path.join(self.tmp, "install")
+        self.archive = os.path.join(self.tmp, "fw-1.0-darwin64.tar.bz2")
+        # Layout of a macOS framework
+        with tarfile.open(self.archive, 'w:bz2') as tf:
+            for name, kind, value in [
+                ("Fw.framework/Versions/A/Fw", "file", b"binary"),
+                ("Fw.framework/Versions/A/Headers/fw.h", "file", b"int fw;"),
+                ("Fw.framework/Versions/Current", "symlink", "A"),
+                ("Fw.framework/Fw", "symlink", "Versions/Current/Fw"),
+                ("Fw.framework/Headers", "symlink", "Versions/Current/Headers"),
+            ]:
+                info = tarfile.TarInfo(name)
+                if kind == "file":
+                    info.size = len(value)
+                    tf.addfile(info, io.BytesIO(value))
+                else:
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = value
+                    tf.addfile(info)
+    
+    def test_install_keeps_directory_symlinks(self):
+        methods = self.store.install("fw", self.archive, self.install_dir)
+        framework = os.path.join(self.install_dir, "Fw.framework")
+        self.assertEqual(os.readlink(os.path.join(framework, "Versions", "Current")), "A")
+        self.assertEqual(os.readlink(os.path.join(framework, "Headers")), "Versions/Current/Headers")
+        with open(os.path.join(framework, "Headers", "fw.h"), 'rb') as f:
+            self.assertEqual(f.read(), b"int fw;")
+        self.assertEqual(methods['symlink'], 3)
+        with open(os.path.join(self.install_dir, ".autobuild-store", "fw.json")) as f:
+            files = json.load(f)['files']
+        self.assertIn(os.path.join("Fw.framework", "Versions", "Current"), files)
+        # Files are reached through the link, never listed under it
+        self.assertFalse(any(path.startswith(os.path.join("Fw.framework", "Headers", "")) for path in files))
+    
+    def test_reinstall_and_uninstall(self):
+        self.store.install("fw", self.archive, self.install_dir)
+        self.store.install("fw", self.archive, self.install_dir)
+        self.assertEqual(ArchiveStore.uninstall("fw", self.install_dir), 5)
+        self.assertEqual(os.listdir(self.install_dir), [".autobuild-store"])
+
+    
+    def test_cross_device_install_without_fcntl(self):
+        # Windows has no fcntl; a failed hardlink must fall through to a copy
+        src = os.path.join(self.tmp, "src")
+        with open(src, 'wb') as f:
+            f.write(b"data")
+        with mock.patch.object(AutobuildGUI, 'fcntl', None), \
+                mock.patch.object(ArchiveStore, 'link_hardlink', side_effect=OSError("cross-device link")), \
+                mock.patch.object(ArchiveStore, 'link_reflink', side_effect=AssertionError("reflink tried")):
+            method = self.store.link_file(src, os.path.join(self.tmp, "dst"))
+        self.assertIn(method, ("copy_file_range", "copy"))
+        with open(os.path.join(self.tmp, "dst"), 'rb') as f:
+            self.assertEqual(f.read(), b"data")
+
+
+if __name__ == "__main__":
+    unittest.main()
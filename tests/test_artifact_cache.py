@@ -0,0 +1,138 @@
+import copy
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AutobuildGUI
+from AutobuildGUI import ArtifactCache, HttpBlobStore, LocalBlobStore
+from object_store import start_object_store
+
+CONFIG = {
+    'build': {'debug': False, 'verbose': True, 'configuration': "Release", 'all_configs': False, 'build_id': "7",
+              'address_size': "64", 'additional_options': "", 'compiler_cache': "ccache",
+              'cache_dir': "/home/a/.ccache", 'cache_size': "5G"},
+    'configure': {'configuration': "Release", 'all_configs': False, 'address_size': "64",
+                  'additional_options': "-DFOO=1"},
+    'package': {'config_file': "", 'archive_name': "pkg.tar.bz2", 'platform': "linux64",
+                'artifact_cache': "local", 'artifact_location': "/srv/a", 'stage_dir': "", 'stage_mode': "full"},
+    'install': {'manifest_file': ""}
+}
+
+
+class BlobStoreContract:
+    def make_store(self):
+        raise NotImplementedError
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = self.make_store()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+    
+    def test_missing_objects(self):
+        self.assertFalse(self.store.exists("artifacts/none"))
+        self.assertFalse(self.store.get_file("artifacts/none", os.path.join(self.tmp, "out")))
+        self.assertIsNone(self.store.get_bytes("chunks/none"))
+    
+    def test_round_trips(self):
+        src = os.path.join(self.tmp, "pkg.tar.bz2")
+        with open(src, 'wb') as f:
+            f.write(os.urandom(300000))
+        self.store.put_file("artifacts/abc", src)
+        self.assertTrue(self.store.exists("artifacts/abc"))
+        dest = os.path.join(self.tmp, "restored.tar.bz2")
+        self.assertTrue(self.store.get_file("artifacts/abc", dest))
+        with open(src, 'rb') as a, open(dest, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.store.put_bytes("chunks/x", b"chunk")
+        self.assertEqual(self.store.get_bytes("chunks/x"), b"chunk")
+
+
+class LocalBlobStoreTest(BlobStoreContract, unittest.TestCase):
+    def make_store(self):
+        return LocalBlobStore(os.path.join(self.tmp, "store"))
+
+
+class HttpBlobStoreTest(BlobStoreContract, unittest.TestCase):
+    def make_store(self):
+        self.server, url = start_object_store()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        return HttpBlobStore(url)
+
+
+class ArtifactCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+        subprocess.run(["git", "init", "-q"], cwd=self.workdir, check=True)
+        with open(os.path.join(self.workdir, "autobuild.xml"), 'w') as f:
+            f.write("<llsd><map/></llsd>\n")
+        subprocess.run(git + ["add", "autobuild.xml"], cwd=self.workdir, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=self.workdir, check=True)
+    
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+    
+    def key(self, config):
+        return ArtifactCache(None, config, self.workdir).compute_key()
+    
+    def test_machine_local_options_do_not_change_the_key(self):
+        other = copy.deepcopy(CONFIG)
+        other['package'].update(artifact_cache="http", artifact_location="http://cache/", stage_dir="stage",
+                                stage_mode="delta", config_file="", archive_name="other.tar.bz2")
+        other['build'].update(compiler_cache="sccache", cache_dir="/tmp/s", cache_size="1G", verbose=False)
+        self.assertIsNotNone(self.key(CONFIG))
+        self.assertEqual(self.key(CONFIG), self.key(other))
+    
+    def test_output_options_change_the_key(self):
+        for section, option, value in (('build', 'configuration', "Debug"), ('configure', 'additional_options', ""),
+                                       ('package', 'platform', "windows64")):
+            other = copy.deepcopy(CONFIG)
+            other[section][option] = value
+            self.assertNotEqual(self.key(CONFIG), self.key(other), option)
+    
+    def test_config_file_contents_change_the_key(self):
+        before = self.key(CONFIG)
+        with open(os.path.join(self.workdir, "autobuild.xml"), 'a') as f:
+            f.write("\n")
+        self.assertIsNone(self.key(CONFIG))  # tracked file edited: not cacheable
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-am", "x"],
+                       cwd=self.workdir, check=True)
+        self.assertNotEqual(before, self.key(CONFIG))
+
+    
+    def test_host_platform_changes_the_key(self):
+        before = self.key(CONFIG)
+        with mock.patch.object(AutobuildGUI.sys, 'platform', "win32"):
+            self.assertNotEqual(before, self.key(CONFIG))
+        with mock.patch.object(AutobuildGUI.platform, 'machine', return_value="arm64"):
+            self.assertNotEqual(before, self.key(CONFIG))
+        for name in ArtifactCache.PLATFORM_ENV:
+            with mock.patch.dict(os.environ, {name: "x"}):
+                self.assertNotEqual(before, self.key(CONFIG), name)
+    
+    def test_upgrading_a_dependency_changes_the_key(self):
+        # No manifest_file: autobuild's default under the install dir
+        config = copy.deepcopy(CONFIG)
+        config['install'] = {'manifest_file': "", 'install_dir': "packages"}
+        manifest = os.path.join(self.workdir, "packages", "installed-packages.xml")
+        os.makedirs(os.path.dirname(manifest))
+        with open(manifest, 'w') as f:
+            f.write("<llsd><map><key>dependencies</key><map><key>zlib</key><map/></map></map></llsd>\n")
+        before = self.key(config)
+        with open(manifest, 'w') as f:
+            f.write("<llsd><map><key>dependencies</key><map><key>zlib</key><map><key>version</key>"
+                    "<string>1.3</string></map></map></map></llsd>\n")
+        self.assertNotEqual(before, self.key(config))
+
+
+if __name__ == "__main__":
+    unittest.main()
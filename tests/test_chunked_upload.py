@@ -0,0 +1,140 @@
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import ChunkedUploader, HttpBlobStore, LocalBlobStore
+from object_store import start_object_store
+
+
+class ChunkingTest(unittest.TestCase):
+    def test_chunks_cover_the_input_within_bounds(self):
+        data = random.Random(1).randbytes(12 * 1024 * 1024)
+        chunks = list(ChunkedUploader.chunks(io.BytesIO(data), buffer_size=3 * 1024 * 1024))
+        self.assertEqual(b"".join(chunks), data)
+        self.assertTrue(all(len(c) <= ChunkedUploader.MAX_SIZE for c in chunks))
+        self.assertTrue(all(len(c) >= ChunkedUploader.MIN_SIZE for c in chunks[:-1]))
+    
+    def test_insertion_only_changes_nearby_chunks(self):
+        data = random.Random(2).randbytes(12 * 1024 * 1024)
+        edited = data[:6000000] + b"inserted" + data[6000000:]
+        before = set(ChunkedUploader.chunks(io.BytesIO(data)))
+        after = list(ChunkedUploader.chunks(io.BytesIO(edited)))
+        self.assertLessEqual(len([c for c in after if c not in before]), 2)
+    
+    def test_empty_and_tiny_inputs(self):
+        self.assertEqual(list(ChunkedUploader.chunks(io.BytesIO(b""))), [])
+        self.assertEqual(list(ChunkedUploader.chunks(io.BytesIO(b"x"))), [b"x"])
+
+
+class ChunkedUploaderContract:
+    def make_store(self):
+        raise NotImplementedError
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store, self.location = self.make_store()
+        self.archive = os.path.join(self.tmp, "pkg.tar.bz2")
+        self.data = random.Random(3).randbytes(10 * 1024 * 1024)
+        self.write(self.data)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+    
+    def write(self, data):
+        with open(self.archive, 'wb') as f:
+            f.write(data)
+    
+    def uploader(self, index="index.sqlite3"):
+        uploader = ChunkedUploader(self.store, self.location, index_path=os.path.join(self.tmp, index))
+        self.addCleanup(uploader.db.close)
+        return uploader
+    
+    def restore(self, uploader, name="pkg.tar.bz2"):
+        dest = os.path.join(self.tmp, "restored")
+        uploader.restore(name, dest)
+        with open(dest, 'rb') as f:
+            return f.read()
+    
+    def test_upload_and_restore(self):
+        uploader = self.uploader()
+        stats = uploader.upload(self.archive)
+        self.assertEqual(stats['bytes'], len(self.data))
+        self.assertEqual(stats['bytes_sent'], len(self.data))
+        self.assertEqual(stats['new_chunks'], stats['chunks'])
+        self.assertEqual(self.restore(uploader), self.data)
+        manifest = json.loads(self.store.get_bytes("manifests/pkg.tar.bz2.json"))
+        self.assertEqual(manifest['size'], len(self.data))
+        self.assertEqual(sum(size for _, size in manifest['chunks']), len(self.data))
+    
+    def test_reupload_sends_nothing(self):
+        uploader = self.uploader()
+        uploader.upload(self.archive)
+        stats = uploader.upload(self.archive)
+        self.assertEqual((stats['new_chunks'], stats['bytes_sent']), (0, 0))
+    
+    def test_modified_archive_sends_only_changed_chunks(self):
+        uploader = self.uploader()
+        first = uploader.upload(self.archive)
+        edited = self.data[:4000000] + b"patched" + self.data[4000000:]
+        self.write(edited)
+        stats = uploader.upload(self.archive)
+        self.assertGreater(stats['new_chunks'], 0)
+        self.assertLessEqual(stats['new_chunks'], 2)
+        self.assertLess(stats['bytes_sent'], first['bytes_sent'] / 2)
+        self.assertEqual(self.restore(uploader), edited)
+    
+    def test_fresh_index_checks_the_store_before_sending(self):
+        self.uploader("a.sqlite3").upload(self.archive)
+        stats = self.uploader("b.sqlite3").upload(self.archive)
+        self.assertEqual(stats['bytes_sent'], 0)
+    
+    def test_restore_rejects_corrupt_chunk(self):
+        uploader = self.uploader()
+        uploader.upload(self.archive)
+        chunk = json.loads(self.store.get_bytes("manifests/pkg.tar.bz2.json"))['chunks'][0][0]
+        self.store.put_bytes("chunks/" + chunk, b"garbage")
+        with self.assertRaises(ValueError):
+            self.restore(uploader)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "restored")))
+    
+    def test_restore_missing_manifest(self):
+        with self.assertRaises(FileNotFoundError):
+            self.restore(self.uploader(), "nosuch.tar.bz2")
+    
+    def test_empty_archive(self):
+        self.write(b"")
+        uploader = self.uploader()
+        self.assertEqual(uploader.upload(self.archive)['chunks'], 0)
+        self.assertEqual(self.restore(uploader), b"")
+
+
+class LocalChunkedUploaderTest(ChunkedUploaderContract, unittest.TestCase):
+    def make_store(self):
+        root = os.path.join(self.tmp, "store")
+        return LocalBlobStore(root), root
+
+
+class HttpChunkedUploaderTest(ChunkedUploaderContract, unittest.TestCase):
+    def make_store(self):
+        self.server, url = start_object_store()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        return HttpBlobStore(url), url
+    
+    def test_known_chunks_are_not_checked_again(self):
+        uploader = self.uploader()
+        uploader.upload(self.archive)
+        self.server.calls.clear()
+        uploader.upload(self.archive)
+        self.assertEqual([method for method, _ in self.server.calls], ["PUT"])  # the manifest only
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import hashlib
+import http.server
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import DownloadManager
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    # Serves PAYLOAD at /pkg.tar.bz2 with Range support; behaviour can be
+    # changed per test through the server attributes
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('Range')))
+        if self.path == "/moved.tar.bz2":
+            self.send_response(302)
+            self.send_header('Location', "/pkg.tar.bz2")
+            self.send_header('Content-Length', "0")
+            self.end_headers()
+            return
+        if self.path == "/nowhere.tar.bz2":
+            self.send_response(302)
+            self.send_header('Content-Length', "0")
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get('Range') and server.ranges:
+            start = int(self.headers['Range'].split("=")[1].rstrip("-"))
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header('Content-Length', "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = PAYLOAD[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if server.drop_after is not None:
+            # Send part of the body, then drop the connection
+            self.wfile.write(body[:server.drop_after])
+            self.wfile.flush()
+            server.drop_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class DownloadManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        self.server.requests = []
+        self.server.ranges = True
+        self.server.drop_after = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.dest = tempfile.mkdtemp()
+        self.item = {'url': self.base + "/pkg.tar.bz2", 'hash': hashlib.md5(PAYLOAD).hexdigest()}
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.dest)
+    
+    def download(self, item=None):
+        [(_, target, error)] = DownloadManager(self.dest).download_all([item or self.item])
+        if error:
+            raise error
+        return target
+    
+    def write_part(self, data):
+        with open(os.path.join(self.dest, "pkg.tar.bz2.part"), 'wb') as f:
+            f.write(data)
+    
+    def assertDownloaded(self, target):
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), PAYLOAD)
+        self.assertFalse(os.path.exists(target + ".part"))
+    
+    def test_full_download(self):
+        self.assertDownloaded(self.download())
+        self.assertEqual(self.server.requests, [("/pkg.tar.bz2", None)])
+    
+    def test_resumes_partial_file(self):
+        self.write_part(PAYLOAD[:1000])
+        self.assertDownloaded(self.download())
+        self.assertEqual(self.server.requests, [("/pkg.tar.bz2", "bytes=1000-")])
+    
+    def test_server_ignoring_range_restarts(self):
+        self.server.ranges = False
+        self.write_part(PAYLOAD[:1000])
+        self.assertDownloaded(self.download())
+    
+    def test_416_means_partial_file_is_complete(self):
+        self.write_part(PAYLOAD)
+        self.assertDownloaded(self.download())
+        self.assertEqual(self.server.requests, [("/pkg.tar.bz2", f"bytes={len(PAYLOAD)}-")])
+    
+    def test_follows_redirect(self):
+        item = dict(self.item, url=self.base + "/moved.tar.bz2")
+        target = self.download(item)
+        self.assertEqual(os.path.basename(target), "moved.tar.bz2")
+        self.assertDownloaded(target)
+    
+    def test_redirect_without_location_fails_at_once(self):
+        item = dict(self.item, url=self.base + "/nowhere.tar.bz2")
+        with self.assertRaises(OSError):
+            self.download(item)
+        self.assertEqual(self.server.requests, [("/nowhere.tar.bz2", None)])
+    
+    def test_hash_mismatch_removes_partial_file(self):
+        item = dict(self.item, hash="0" * 32)
+        with self.assertRaises(ValueError):
+            self.download(item)
+        self.assertEqual(os.listdir(self.dest), [])
+    
+    def test_mid_stream_reset_resumes_from_disk(self):
+        self.server.drop_after = 300000
+        self.assertDownloaded(self.download())
+        self.assertEqual(self.server.requests, [("/pkg.tar.bz2", None), ("/pkg.tar.bz2", "bytes=300000-")])
+    
+    def test_mid_stream_reset_of_resumed_download(self):
+        self.write_part(PAYLOAD[:1000])
+        self.server.drop_after = 5000
+        self.assertDownloaded(self.download())
+        self.assertEqual(self.server.requests[-1], ("/pkg.tar.bz2", "bytes=6000-"))
+    
+    def test_already_downloaded_file_is_not_fetched(self):
+        with open(os.path.join(self.dest, "pkg.tar.bz2"), 'wb') as f:
+            f.write(PAYLOAD)
+        self.download()
+        self.assertEqual(self.server.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
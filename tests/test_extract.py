@@ -0,0 +1,95 @@
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import extract_archive
+
+
+class ExtractArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.dest = os.path.join(self.tmp, "dest")
+        self.outside = os.path.join(self.tmp, "outside")
+        os.makedirs(self.outside)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+    
+    def make_archive(self, members):
+        # members: (name, kind, data or link target)
+        archive = os.path.join(self.tmp, "pkg.tar.bz2")
+        with tarfile.open(archive, 'w:bz2') as tf:
+            for name, kind, value in members:
+                info = tarfile.TarInfo(name)
+                if kind == "file":
+                    info.size = len(value)
+                    tf.addfile(info, io.BytesIO(value))
+                elif kind == "symlink":
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = value
+                    tf.addfile(info)
+                elif kind == "dir":
+                    info.type = tarfile.DIRTYPE
+                    info.mode = 0o755
+                    tf.addfile(info)
+        return archive
+    
+    def test_extracts_files_and_safe_links(self):
+        archive = self.make_archive([
+            ("lib", "dir", None),
+            ("lib/libz.so.1", "file", b"z"),
+            ("lib/libz.so", "symlink", "libz.so.1"),
+            ("include", "symlink", "lib"),
+        ])
+        result = extract_archive(archive, self.dest)
+        self.assertEqual(result['files'], 1)
+        with open(os.path.join(self.dest, "include", "libz.so"), 'rb') as f:
+            self.assertEqual(f.read(), b"z")
+    
+    def test_extracts_dot_rooted_archive(self):
+        # Layout of tar -C pkg .
+        archive = self.make_archive([
+            ("./", "dir", None),
+            ("./lib", "dir", None),
+            ("./lib/libz.so.1", "file", b"z"),
+            ("./lib/libz.so", "symlink", "libz.so.1"),
+        ])
+        result = extract_archive(archive, self.dest)
+        self.assertEqual(result['files'], 1)
+        self.assertEqual(os.readlink(os.path.join(self.dest, "lib", "libz.so")), "libz.so.1")
+    
+    def test_rejects_absolute_symlink(self):
+        archive = self.make_archive([("lib", "symlink", self.outside), ("lib/passwd", "file", b"x")])
+        with self.assertRaises(ValueError):
+            extract_archive(archive, self.dest)
+        self.assertEqual(os.listdir(self.outside), [])
+    
+    def test_rejects_relative_symlink_leaving_dest(self):
+        archive = self.make_archive([("lib", "symlink", "../outside"), ("lib/passwd", "file", b"x")])
+        with self.assertRaises(ValueError):
+            extract_archive(archive, self.dest)
+        self.assertEqual(os.listdir(self.outside), [])
+    
+    def test_rejects_member_below_existing_escaping_link(self):
+        os.makedirs(self.dest)
+        os.symlink(self.outside, os.path.join(self.dest, "lib"))
+        archive = self.make_archive([("lib/passwd", "file", b"x")])
+        with self.assertRaises(ValueError):
+            extract_archive(archive, self.dest)
+        self.assertEqual(os.listdir(self.outside), [])
+    
+    def test_rejects_dot_dot_member(self):
+        archive = self.make_archive([("../outside/passwd", "file", b"x")])
+        with self.assertRaises(ValueError):
+            extract_archive(archive, self.dest)
+        self.assertEqual(os.listdir(self.outside), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import AutobuildCommands, InstallPlanner
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class InstallPlannerTest(unittest.TestCase):
+    # installed-packages.xml has the layout autobuild 3.10 writes into the
+    # install directory: metadata entries under 'dependencies'
+    def planner(self, installed="installed-packages.xml"):
+        return InstallPlanner(os.path.join(FIXTURES, "autobuild.xml"), os.path.join(FIXTURES, installed), "linux64")
+    
+    def test_plan_against_installed_manifest(self):
+        plan = self.planner().plan()
+        self.assertEqual(plan['add'], ["curl"])
+        # boost changed hash and version; openssl only its version
+        self.assertEqual(plan['upgrade'], ["boost", "openssl"])
+        self.assertEqual(plan['unchanged'], ["zlib"])
+        self.assertEqual(plan['remove'], ["oldpkg"])
+        self.assertEqual(plan['unknown'], [])
+    
+    def test_requested_packages_only(self):
+        plan = self.planner().plan(["zlib", "nosuch"])
+        self.assertEqual((plan['add'], plan['upgrade'], plan['unchanged'], plan['unknown']), ([], [], ["zlib"], ["nosuch"]))
+    
+    def test_nothing_installed_adds_everything(self):
+        plan = self.planner("missing.xml").plan()
+        self.assertEqual(plan['add'], ["boost", "curl", "openssl", "zlib"])
+        self.assertEqual(plan['remove'], [])
+    
+    def install_config(self, **options):
+        install_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, install_dir)
+        shutil.copy(os.path.join(FIXTURES, InstallPlanner.INSTALLED_FILE), install_dir)
+        config = {
+            'build': {'address_size': "64"},
+            'install': {'debug': False, 'dry_run': False, 'verbose': False, 'quiet': False, 'delta': True,
+                        'config_file': os.path.join(FIXTURES, "autobuild.xml"), 'install_dir': install_dir,
+                        'manifest_file': "", 'export_manifest': False, 'list': False, 'list_installed': False,
+                        'list_licenses': False, 'platform': "linux", 'packages': []}
+        }
+        config['install'].update(options)
+        return config
+    
+    def test_delta_install_command_uses_default_manifest_name(self):
+        command = AutobuildCommands(self.install_config()).generate_install_command()
+        self.assertIn("uninstall", command)
+        self.assertIn("oldpkg", command)
+        self.assertIn("curl", command)
+        self.assertNotIn("zlib", command)
+
+    
+    def test_listing_is_never_turned_into_a_delta_install(self):
+        for option in ('list', 'list_installed', 'list_licenses', 'export_manifest'):
+            command = AutobuildCommands(self.install_config(**{option: True})).generate_install_command()
+            self.assertNotIn("uninstall", command, option)
+            self.assertNotIn("(delta)", command, option)
+            self.assertIn("--" + option.replace("_", "-"), command)
+    
+    def test_unknown_packages_are_reported_not_installed(self):
+        command = AutobuildCommands(self.install_config(packages=["curl", "nosuch"])).generate_install_command()
+        self.assertIn(":: not in autobuild.xml, skipped: nosuch\n", command)
+        install = command.strip().splitlines()[-1]
+        self.assertTrue(install.endswith(" curl"), install)
+        self.assertNotIn("nosuch", install)
+
+
+if __name__ == "__main__":
+    unittest.main()
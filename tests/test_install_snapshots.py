@@ -0,0 +1,81 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AutobuildGUI
+from AutobuildGUI import InstallSnapshots
+
+
+class FakeWinapi:
+    # Stands in for _winapi; a symlink plays the junction
+    def __init__(self, fail=False):
+        self.fail = fail
+    
+    def CreateJunction(self, target, path):
+        if self.fail:
+            raise OSError("junctions not supported")
+        os.symlink(target, path)
+
+
+class InstallSnapshotsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.install_dir = os.path.join(self.tmp, "packages")
+        self.snapshots = InstallSnapshots(self.install_dir)
+        self.posix = mock.patch.object(AutobuildGUI, '_winapi', None)
+        self.posix.start()
+        self.addCleanup(self.posix.stop)
+    
+    def touch(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write("x")
+    
+    def test_label(self):
+        self.assertEqual(InstallSnapshots.label("windows", "Release", "32"), "windows-Release-32")
+        self.assertEqual(InstallSnapshots.label("linux", "", ""), "linux-default-64")
+        self.assertEqual(InstallSnapshots.label("linux", "Rel With/Debug", "64"), "linux-Rel_With_Debug-64")
+    
+    def test_switch_between_snapshots(self):
+        self.assertIsNone(self.snapshots.active())
+        self.assertEqual(self.snapshots.switch("linux-Release-64"), (True, None))
+        self.touch(os.path.join(self.install_dir, "lib", "libz.a"))
+        self.assertEqual(self.snapshots.switch("linux-Debug-64"), (True, None))
+        self.assertEqual(self.snapshots.active(), "linux-Debug-64")
+        self.assertEqual(os.listdir(self.install_dir), [])
+        self.assertEqual(self.snapshots.switch("linux-Release-64"), (False, None))
+        self.assertTrue(os.path.isfile(os.path.join(self.install_dir, "lib", "libz.a")))
+        self.assertEqual(self.snapshots.snapshots(), ["linux-Debug-64", "linux-Release-64"])
+        with self.assertRaises(ValueError):
+            self.snapshots.remove("linux-Release-64")
+        self.snapshots.remove("linux-Debug-64")
+        self.assertEqual(self.snapshots.snapshots(), ["linux-Release-64"])
+    
+    def test_existing_install_dir_is_kept_aside(self):
+        self.touch(os.path.join(self.install_dir, "old.txt"))
+        created, adopted = self.snapshots.switch("linux-Release-64")
+        self.assertTrue(os.path.isfile(os.path.join(adopted, "old.txt")))
+        self.assertEqual(os.listdir(self.install_dir), [])
+    
+    def test_windows_uses_a_junction(self):
+        with mock.patch.object(AutobuildGUI, '_winapi', FakeWinapi()):
+            self.snapshots.switch("windows-Release-64")
+        self.assertEqual(os.readlink(self.install_dir), os.path.join(self.snapshots.root, "windows-Release-64"))
+        self.assertEqual(self.snapshots.active(), "windows-Release-64")
+    
+    def test_windows_failure_restores_install_dir(self):
+        self.touch(os.path.join(self.install_dir, "old.txt"))
+        with mock.patch.object(AutobuildGUI, '_winapi', FakeWinapi(fail=True)):
+            with self.assertRaises(OSError):
+                self.snapshots.switch("windows-Release-64")
+        self.assertTrue(os.path.isfile(os.path.join(self.install_dir, "old.txt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
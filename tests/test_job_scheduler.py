@@ -0,0 +1,54 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import JobScheduler
+
+
+class JobSchedulerTest(unittest.TestCase):
+    def test_queued_jobs_start_by_priority(self):
+        scheduler = JobScheduler(slots=1)
+        release = threading.Event()
+        order = []
+        blocker = scheduler.submit("blocker", release.wait, 'normal')
+        jobs = [scheduler.submit(name, lambda name=name: order.append(name), priority)
+                for name, priority in (("upload", 'background'), ("install", 'normal'), ("hash", 'interactive'))]
+        release.set()
+        for job in [blocker] + jobs:
+            self.assertTrue(job['done'].wait(5))
+        self.assertEqual(order, ["hash", "install", "upload"])
+    
+    def test_interactive_job_preempts_background_job(self):
+        scheduler = JobScheduler(slots=1)
+        log = []
+        started = threading.Event()
+        
+        def upload():
+            started.set()
+            for i in range(20):
+                scheduler.checkpoint()
+                log.append("upload")
+                time.sleep(0.01)
+        
+        background = scheduler.submit("upload", upload, 'background')
+        self.assertTrue(started.wait(5))
+        interactive = scheduler.submit("hash", lambda: log.append("hash"), 'interactive')
+        self.assertTrue(interactive['done'].wait(5))
+        self.assertTrue(background['done'].wait(5))
+        # The upload stopped at a checkpoint and finished after the hash
+        self.assertLess(log.index("hash"), len(log) - 1)
+        self.assertEqual(log.count("upload"), 20)
+    
+    def test_errors_are_returned(self):
+        scheduler = JobScheduler()
+        job = scheduler.submit("fail", lambda: 1 / 0)
+        self.assertTrue(job['done'].wait(5))
+        self.assertIsInstance(job['error'], ZeroDivisionError)
+
+
+if __name__ == "__main__":
+    unittest.main()
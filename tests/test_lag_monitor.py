@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import tkinter
+import unittest
+from tkinter import commondialog
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import LagMonitor
+
+
+class LagMonitorTest(unittest.TestCase):
+    # Drives the wrapper directly; no display is needed
+    def setUp(self):
+        self.saved = [(tkinter, 'CallWrapper', tkinter.CallWrapper)]
+        self.saved.extend((owner, name, getattr(owner, name)) for owner, name in LagMonitor.MODAL_CALLS)
+        self.monitor = LagMonitor.install(threshold=0.05)
+    
+    def tearDown(self):
+        for owner, name, value in self.saved:
+            setattr(owner, name, value)
+    
+    def callback(self, func):
+        return tkinter.CallWrapper(func, None, None)
+    
+    def logged(self):
+        return [(name, elapsed) for _, name, elapsed in self.monitor.events]
+    
+    def test_slow_callback_is_logged(self):
+        def slow():
+            time.sleep(0.08)
+        
+        self.callback(slow)()
+        self.callback(lambda: None)()
+        self.assertEqual([name for name, _ in self.logged()], [slow.__qualname__])
+    
+    def test_time_in_modal_dialog_is_not_charged(self):
+        class FakeDialog(commondialog.Dialog):
+            def __init__(self):
+                pass
+        
+        # Stands in for a dialog the user keeps open; install() wraps the real one
+        commondialog.Dialog.show = self.monitor.modal(lambda dialog: time.sleep(0.2))
+        self.callback(lambda: FakeDialog().show())()
+        self.assertEqual(self.logged(), [])
+    
+    def test_nested_callbacks_are_counted_once(self):
+        def inner():
+            time.sleep(0.08)
+        
+        def outer():
+            self.monitor.modal(lambda: self.callback(inner)())()
+        
+        self.callback(outer)()
+        self.assertEqual([name for name, _ in self.logged()], [inner.__qualname__])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import copy
+import json
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import PackageSet
+
+
+class PackageSetTest(unittest.TestCase):
+    def test_deduplicates_in_order(self):
+        packages = PackageSet.of(["zlib", "boost", "zlib", "curl", "boost"])
+        self.assertEqual(list(packages), ["zlib", "boost", "curl"])
+        self.assertIn("curl", packages)
+        self.assertNotIn("openssl", packages)
+        self.assertEqual(packages, ["zlib", "boost", "curl"])
+        self.assertNotEqual(packages, ["boost", "zlib", "curl"])
+    
+    def test_equal_lists_share_one_set(self):
+        a = PackageSet.of(["zlib", "boost"])
+        b = PackageSet.of("".join(name) for name in (["z", "lib"], ["bo", "ost"]))
+        self.assertIs(a, b)
+        self.assertIs(a[0], b[0])
+        self.assertIs(PackageSet.of(a), a)
+    
+    def test_copies_are_the_set_itself(self):
+        packages = PackageSet.of(["zlib"])
+        config = {'install': {'packages': packages}}
+        self.assertIs(copy.copy(packages), packages)
+        self.assertIs(copy.deepcopy(config)['install']['packages'], packages)
+        self.assertIs(pickle.loads(pickle.dumps(packages)), packages)
+    
+    def test_json_round_trip(self):
+        config = {'install': {'packages': PackageSet.of(["zlib", "boost"])},
+                  'manifest': {'patterns': PackageSet.of(["*.dll"])}, 'other': {'packages': [1, 2]}}
+        text = json.dumps(config)
+        self.assertEqual(json.loads(text), {'install': {'packages': ["zlib", "boost"]},
+                                            'manifest': {'patterns': ["*.dll"]}, 'other': {'packages': [1, 2]}})
+        loaded = json.loads(text, object_hook=PackageSet.json_hook)
+        self.assertIs(loaded['install']['packages'], config['install']['packages'])
+        self.assertIs(loaded['manifest']['patterns'], config['manifest']['patterns'])
+        self.assertEqual(type(loaded['other']['packages']), list)
+    
+    def test_diff(self):
+        old = PackageSet.of(["zlib", "boost", "curl"])
+        new = PackageSet.of(["curl", "openssl", "zlib"])
+        self.assertEqual(new.diff(old), (["openssl"], ["boost"]))
+        self.assertEqual(new.diff(["zlib"]), (["curl", "openssl"], []))
+        self.assertEqual(new.diff(new), ((), ()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import BuildHistory, PipelineRunner, ResourceGovernor
+
+
+class SkipHook:
+    def __init__(self, skipped):
+        self.skipped = skipped
+    
+    def before_step(self, runner, step):
+        return step in self.skipped
+    
+    def after_step(self, runner, step, status, duration, run_id):
+        pass
+
+
+class PipelineRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.history = BuildHistory(os.path.join(self.tmp, "history.sqlite3"))
+    
+    def tearDown(self):
+        self.history.db.close()
+        shutil.rmtree(self.tmp)
+    
+    def run_steps(self, steps, **kwargs):
+        runner = PipelineRunner(steps, {}, self.history, cwd=self.tmp, **kwargs)
+        runner.start()
+        runner.thread.join(30)
+        return runner
+    
+    def test_runs_steps_in_order(self):
+        runner = self.run_steps([('build', "echo built"), ('package', "exit 3"), ('upload', "echo never")])
+        self.assertEqual([(step, status) for step, status, _ in runner.results], [('build', 0), ('package', 3)])
+    
+    def test_skipped_steps_release_nothing_to_the_governor(self):
+        governor = ResourceGovernor(float('inf'))
+        runner = self.run_steps([('build', "echo built"), ('package', "echo packaged")],
+                                governor=governor, hooks=[SkipHook({'build'})])
+        self.assertEqual([(step, status) for step, status, _ in runner.results], [('build', 0), ('package', 0)])
+        self.assertEqual(governor.snapshot(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import ScriptServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class ScriptServerTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir)
+        for name in ("autobuild.xml", "installed-packages.xml"):
+            shutil.copy(os.path.join(FIXTURES, name), self.workdir)
+        self.server = ScriptServer(self.workdir)
+        self.config = {'pipeline': {'workdir': self.workdir},
+                       'install': {'delta': True, 'manifest_file': "installed-packages.xml", 'platform': "linux"}}
+    
+    def render(self):
+        return asyncio.run(self.server.render({'format': 'sh', 'config': self.config}))[1]
+    
+    def test_same_config_is_served_from_cache(self):
+        self.render()
+        self.render()
+        self.assertEqual((self.server.stats['misses'], self.server.stats['hits']), (1, 1))
+    
+    def test_delta_plan_follows_installed_manifest(self):
+        self.assertIn("autobuild install --installed-manifest installed-packages.xml --platform linux curl boost openssl",
+                      self.render())
+        # With the manifest gone nothing counts as installed
+        manifest = os.path.join(self.workdir, "installed-packages.xml")
+        os.remove(manifest)
+        script = self.render()
+        self.assertEqual(self.server.stats['misses'], 2)
+        self.assertIn("--platform linux boost curl openssl zlib", script)
+        self.assertNotIn("uninstall --installed-manifest", script)
+    
+    def test_plain_install_ignores_disk_state(self):
+        self.config['install']['delta'] = False
+        self.render()
+        os.remove(os.path.join(self.workdir, "installed-packages.xml"))
+        self.render()
+        self.assertEqual(self.server.stats['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AutobuildGUI
+from AutobuildGUI import SourceWatcher
+
+
+class SourceWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.root, "src"))
+        os.makedirs(os.path.join(self.root, "build-linux64"))
+    
+    def start(self):
+        watcher = SourceWatcher(self.root, debounce=0.2, interval=0.05)
+        watcher.start()
+        self.addCleanup(watcher.stop)
+        deadline = time.monotonic() + 5
+        while watcher.mode is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.2)  # Let the first scan finish
+        return watcher
+    
+    def edit_burst(self, watcher):
+        for name in ("a.cpp", "b.cpp", "a.cpp~"):
+            with open(os.path.join(self.root, "src", name), 'w') as f:
+                f.write(name)
+        with open(os.path.join(self.root, "build-linux64", "out.o"), 'w') as f:
+            f.write("o")
+        changes = watcher.changes.get(timeout=5)
+        self.assertEqual(changes, {os.path.join(self.root, "src", "a.cpp"), os.path.join(self.root, "src", "b.cpp")})
+        with self.assertRaises(queue.Empty):
+            watcher.changes.get(timeout=0.5)
+    
+    def test_polling_elsewhere_than_linux(self):
+        with mock.patch.object(AutobuildGUI.sys, 'platform', "win32"), \
+                mock.patch.object(SourceWatcher, 'run_inotify', side_effect=TypeError("not on Windows")):
+            watcher = self.start()
+        self.assertEqual(watcher.mode, "polling")
+        self.edit_burst(watcher)
+    
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify is Linux only")
+    def test_inotify_on_linux(self):
+        watcher = self.start()
+        self.assertEqual(watcher.mode, "inotify")
+        self.edit_burst(watcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import gzip
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AutobuildGUI import StagePackager, extract_archive
+
+
+class StagePackagerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.stage = os.path.join(self.tmp, "stage")
+        self.write("bin/tool", os.urandom(200000))
+        self.write("lib/libz.so.1", b"z" * 5000)
+        self.write("include/zlib.h", b"int deflate();\n")
+        self.write("LICENSES/zlib.txt", b"zlib license\n")
+        os.symlink("libz.so.1", os.path.join(self.stage, "lib", "libz.so"))
+        self.packager = StagePackager(self.stage, os.path.join(self.tmp, "index.json"))
+    
+    def write(self, rel, data):
+        path = os.path.join(self.stage, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        # Make every rewrite visible to the size/mtime check
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    
+    def tree(self, root):
+        entries = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            for name in dirnames + filenames:
+                path = os.path.join(dirpath, name)
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                if os.path.islink(path):
+                    entries[rel] = ("link", os.readlink(path))
+                elif os.path.isdir(path):
+                    entries[rel] = ("dir",)
+                else:
+                    with open(path, 'rb') as f:
+                        entries[rel] = ("file", f.read())
+        return entries
+    
+    def read_back(self, archive):
+        # gzip checks the combined CRC and length in the trailer
+        with gzip.open(archive, 'rb') as f:
+            data = f.read()
+        self.assertEqual(len(data) % tarfile.BLOCKSIZE, 0)
+        with tarfile.open(archive, 'r:gz') as tf:
+            self.assertEqual(len(tf.getnames()), len(set(tf.getnames())))
+        dest = os.path.join(self.tmp, "out-" + os.path.basename(archive))
+        extract_archive(archive, dest)
+        return self.tree(dest)
+    
+    def test_crc32_combine(self):
+        data = os.urandom(70000)
+        for split in (0, 1, 1000, 65536, 70000):
+            combined = StagePackager.crc32_combine(zlib.crc32(data[:split]), zlib.crc32(data[split:]), len(data) - split)
+            self.assertEqual(combined, zlib.crc32(data))
+    
+    def test_full_package_round_trip(self):
+        archive = os.path.join(self.tmp, "pkg.tar.gz")
+        stats = self.packager.package(archive)
+        self.assertEqual((stats['files'], stats['compressed'], stats['reused']), (4, 4, 0))
+        self.assertEqual(self.read_back(archive), self.tree(self.stage))
+    
+    def test_repackage_reuses_unchanged_segments(self):
+        archive = os.path.join(self.tmp, "pkg.tar.gz")
+        self.packager.package(archive)
+        self.write("include/zlib.h", b"int deflate(void);\n")
+        os.remove(os.path.join(self.stage, "LICENSES", "zlib.txt"))
+        os.symlink("../lib/libz.so", os.path.join(self.stage, "bin", "libz.so"))
+        stats = self.packager.package(archive)
+        self.assertEqual((stats['files'], stats['compressed'], stats['reused']), (3, 1, 2))
+        self.assertEqual(stats['removed'], ["LICENSES/zlib.txt"])
+        self.assertEqual(self.read_back(archive), self.tree(self.stage))
+        # And again from an archive that was itself assembled from segments
+        self.write("bin/tool", os.urandom(1000))
+        stats = self.packager.package(archive)
+        self.assertEqual((stats['compressed'], stats['reused']), (1, 2))
+        self.assertEqual(self.read_back(archive), self.tree(self.stage))
+    
+    def test_delta_applies_changes_and_removals(self):
+        base = os.path.join(self.tmp, "pkg.tar.gz")
+        self.packager.package(base)
+        self.write("lib/libz.so.1", b"y" * 6000)
+        # Touched with the same contents: rehashed but left out
+        self.write("include/zlib.h", b"int deflate();\n")
+        os.remove(os.path.join(self.stage, "bin", "tool"))
+        os.symlink("libz.so.1", os.path.join(self.stage, "lib", "libz.so.1.3"))
+        delta = os.path.join(self.tmp, "pkg-delta.tar.gz")
+        stats = self.packager.package(delta, delta=True)
+        self.assertEqual((stats['rehashed'], stats['compressed']), (2, 1))
+        self.assertEqual(stats['removed'], ["bin/tool"])
+        with tarfile.open(delta, 'r:gz') as tf:
+            self.assertEqual(sorted(tf.getnames()),
+                             [StagePackager.DELTA_MANIFEST, "lib/libz.so.1", "lib/libz.so.1.3"])
+        dest = os.path.join(self.tmp, "applied")
+        manifest = StagePackager.apply_delta(base, delta, dest)
+        self.assertEqual(manifest['base'], "pkg.tar.gz")
+        self.assertEqual(self.tree(dest), self.tree(self.stage))
+    
+    def test_delta_refuses_the_wrong_base(self):
+        base = os.path.join(self.tmp, "pkg.tar.gz")
+        self.packager.package(base)
+        self.write("lib/libz.so.1", b"x")
+        delta = os.path.join(self.tmp, "pkg-delta.tar.gz")
+        self.packager.package(delta, delta=True)
+        other = os.path.join(self.tmp, "other.tar.gz")
+        with tarfile.open(other, 'w:gz'):
+            pass
+        with self.assertRaises(ValueError):
+            StagePackager.apply_delta(other, delta, os.path.join(self.tmp, "applied"))
+
+
+if __name__ == "__main__":
+    unittest.main()